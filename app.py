@@ -3,23 +3,103 @@ Main Application Module
 This module provides a Streamlit-based user interface for the CLO Generator system.
 """
 
+import io
 import os
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import time
 from utils.document_processor import DocumentProcessor
+from utils.incremental import IncrementalAnalyzer
+from utils.instrumentation import Instrumentation
 from models.clo_generator import CLOGenerator
 
+@st.cache_resource
+def get_processors():
+    """Build the document processor and CLO generator once per server process."""
+    return DocumentProcessor(), CLOGenerator()
+
+def get_incremental_analyzer():
+    """Return this session's incremental analyzer, created on first use."""
+    if "incremental_analyzer" not in st.session_state:
+        doc_processor, _ = get_processors()
+        st.session_state.incremental_analyzer = IncrementalAnalyzer(
+            doc_processor, instrumentation=Instrumentation(enabled=True))
+    return st.session_state.incremental_analyzer
+
+def analyze_content(course_content):
+    """
+    Run the text analysis stages on the course content.
+
+    The analysis is incremental: only the paragraphs that changed since the
+    last analysis in this session are preprocessed, tokenized and counted, so
+    editing a few lines of a long syllabus is cheap, and reruns with unchanged
+    text reuse every paragraph.
+
+    Args:
+        course_content (str): Raw course content
+
+    Returns:
+        dict: Text statistics, extracted keywords, paragraph reuse counts and
+            the time taken by each stage
+    """
+    analyzer = get_incremental_analyzer()
+    analysis = analyzer.analyze(course_content, top_n=30)
+    analysis['stage_timings'] = analyzer.instrumentation.stage_totals(analyzer.instrumentation.drain())
+    return analysis
+
+@st.cache_data(show_spinner=False)
+def generate_clos(keywords, num_clos):
+    """Generate CLOs, cached so moving the skills slider does not regenerate them."""
+    _, clo_generator = get_processors()
+    return clo_generator.generate_clos(keywords, num_clos=num_clos)
+
+@st.cache_data(show_spinner=False)
+def extract_skills(keywords, clos, num_skills):
+    """Extract skills, cached by keywords, CLOs and the requested number of skills."""
+    _, clo_generator = get_processors()
+    return clo_generator.extract_skills(keywords, clos, num_skills=num_skills)
+
+@st.cache_data(show_spinner=False)
+def render_domain_chart(domain_counts):
+    """
+    Render the educational domain distribution chart as a PNG image.
+
+    Cached by the domain counts, so reruns with the same CLOs skip matplotlib.
+
+    Args:
+        domain_counts (dict): Number of CLOs per domain
+
+    Returns:
+        bytes: PNG image data
+    """
+    # Imported on first use, so the app starts without loading matplotlib
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    colors = ['#4e79a7', '#f28e2c', '#e15759']
+    bars = ax.bar(domain_counts.keys(), domain_counts.values(), color=colors[:len(domain_counts)])
+
+    # Add value labels on top of bars
+    for bar in bars:
+        height = bar.get_height()
+        if height > 0:
+            ax.text(bar.get_x() + bar.get_width()/2., height + 0.1, str(int(height)),
+                    ha='center', va='bottom')
+
+    ax.set_xlabel("Educational Domain")
+    ax.set_ylabel("Count")
+    ax.set_title("Distribution of Educational Domains in CLOs")
+    plt.xticks(rotation=0)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
 def main():
     """Main function to run the Streamlit application."""
     st.title("CLO Generator")
     st.write("Enter course content to generate Course Learning Outcomes (CLOs) and skill sets")
 
-    # Initialize processors
-    doc_processor = DocumentProcessor()
-    clo_generator = CLOGenerator()
-
     # Add information about CLOs
     with st.expander("About Course Learning Outcomes (CLOs)"):
         st.markdown("""
@@ -38,44 +118,44 @@ def main():
     course_content = st.text_area("Enter Course Content", height=300,
                                  placeholder="Enter your course content here. Include topics, concepts, and skills that students should learn.")
 
+    # Remember the submitted content so slider changes do not need another click
     if st.button("Generate CLOs and Skills") and course_content:
-        # Process the text
-        with st.spinner("Processing text..."):
-            # Preprocess the text
-            preprocessed_text = doc_processor.preprocess_text(course_content)
+        st.session_state.submitted_content = course_content
 
-            # Tokenize the text
-            sentences, words = doc_processor.tokenize_text(preprocessed_text)
+    submitted_content = st.session_state.get("submitted_content")
+    if submitted_content:
+        # Times this rerun's generation stages (cached stages take next to no time)
+        instrumentation = Instrumentation(enabled=True)
 
-            # Extract keywords
-            keywords = doc_processor.extract_keywords(words, top_n=30)
-
-            # Add a small delay to show the spinner
-            time.sleep(1)
+        # Process the text
+        with st.spinner("Processing text..."):
+            analysis = analyze_content(submitted_content)
+        keywords = analysis['keywords']
 
         # Display text statistics
         st.subheader("Text Analysis")
         stats_col1, stats_col2 = st.columns(2)
 
         with stats_col1:
-            st.metric("Total Words", len(words))
-            st.metric("Unique Words", len(set(words)))
+            st.metric("Total Words", analysis['total_words'])
+            st.metric("Unique Words", analysis['unique_words'])
 
         with stats_col2:
-            st.metric("Total Sentences", len(sentences))
+            st.metric("Total Sentences", analysis['total_sentences'])
             st.metric("Keywords Extracted", len(keywords))
 
         # Display extracted keywords
         st.subheader("Key Concepts Identified")
         st.write(", ".join(keywords))
 
-        # Generate CLOs
-        with st.spinner("Generating CLOs..."):
-            num_clos = st.slider("Number of CLOs to generate", 3, 10, 5)
-            clos = clo_generator.generate_clos(keywords, num_clos=num_clos)
+        # The sliders only feed the cached generation steps below, so moving
+        # them never re-runs the text analysis
+        num_clos = st.slider("Number of CLOs to generate", 3, 10, 5)
+        num_skills = st.slider("Number of skills to extract", 5, 15, 10)
 
-            # Add a small delay to show the spinner
-            time.sleep(1)
+        # Generate CLOs
+        with st.spinner("Generating CLOs..."), instrumentation.stage('generate_clos'):
+            clos = generate_clos(keywords, num_clos)
 
         # Display generated CLOs
         st.subheader("Generated Course Learning Outcomes (CLOs)")
@@ -92,12 +172,8 @@ def main():
             """, unsafe_allow_html=True)
 
         # Generate skill sets
-        with st.spinner("Extracting skill sets..."):
-            num_skills = st.slider("Number of skills to extract", 5, 15, 10)
-            skills = clo_generator.extract_skills(keywords, clos, num_skills=num_skills)
-
-            # Add a small delay to show the spinner
-            time.sleep(1)
+        with st.spinner("Extracting skill sets..."), instrumentation.stage('extract_skills'):
+            skills = extract_skills(keywords, clos, num_skills)
 
         # Display extracted skills
         st.subheader("Extracted Skill Sets")
@@ -113,52 +189,41 @@ def main():
             domain = clo['domain']
             domain_counts[domain] = domain_counts.get(domain, 0) + 1
 
-        fig, ax = plt.subplots(figsize=(10, 6))
-        colors = ['#4e79a7', '#f28e2c', '#e15759']
-        bars = ax.bar(domain_counts.keys(), domain_counts.values(), color=colors[:len(domain_counts)])
+        st.image(render_domain_chart(domain_counts))
 
-        # Add value labels on top of bars
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                ax.text(bar.get_x() + bar.get_width()/2., height + 0.1, str(int(height)),
-                        ha='center', va='bottom')
-
-        ax.set_xlabel("Educational Domain")
-        ax.set_ylabel("Count")
-        ax.set_title("Distribution of Educational Domains in CLOs")
-        plt.xticks(rotation=0)
-        st.pyplot(fig)
+        # Show where the time went and how much of the content had to be re-analyzed
+        with st.expander("Stage Timings"):
+            paragraphs = analysis['paragraphs']
+            st.write(f"Paragraphs re-analyzed: {paragraphs['analyzed']} of {paragraphs['paragraphs']}")
+            timings = {**analysis['stage_timings'], **instrumentation.stage_totals()}
+            for stage, seconds in timings.items():
+                st.write(f"{stage}: {seconds * 1000:.1f} ms")
 
         # Export options
         st.subheader("Export Results")
 
         if st.button("Export to CSV"):
+            import csv
+
             # Create a filename based on course title or timestamp
             filename_base = course_title.strip() if course_title else f"course_content_{int(time.time())}"
             filename_base = "".join(c if c.isalnum() else "_" for c in filename_base)
 
-            # Prepare CLO data for export
-            clo_data = []
-            for i, clo in enumerate(clos):
-                clo_data.append({
-                    "CLO Number": f"CLO {i+1}",
-                    "CLO Statement": clo['clo'],
-                    "Action Verb": clo['action_verb'].capitalize(),
-                    "Domain": clo['domain'].capitalize(),
-                    "Keywords": ", ".join(clo['keywords'])
-                })
-
-            # Create DataFrame and export
-            clo_df = pd.DataFrame(clo_data)
+            # Write the CLOs row by row
             clo_csv_path = os.path.join("output", f"{filename_base}_CLOs.csv")
-            clo_df.to_csv(clo_csv_path, index=False)
-
-            # Prepare skill data for export
-            skill_data = [{"Skill": skill} for skill in skills]
-            skill_df = pd.DataFrame(skill_data)
+            with open(clo_csv_path, "w", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file, lineterminator="\n")
+                writer.writerow(["CLO Number", "CLO Statement", "Action Verb", "Domain", "Keywords"])
+                for i, clo in enumerate(clos):
+                    writer.writerow([f"CLO {i+1}", clo['clo'], clo['action_verb'].capitalize(),
+                                     clo['domain'].capitalize(), ", ".join(clo['keywords'])])
+
+            # Write the skills
             skill_csv_path = os.path.join("output", f"{filename_base}_Skills.csv")
-            skill_df.to_csv(skill_csv_path, index=False)
+            with open(skill_csv_path, "w", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file, lineterminator="\n")
+                writer.writerow(["Skill"])
+                writer.writerows([skill] for skill in skills)
 
             st.success(f"Results exported to CSV files in the output directory")
 
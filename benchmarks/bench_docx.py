@@ -0,0 +1,179 @@
+"""
+Benchmark for DOCX text extraction.
+Compares the streaming zip/XML-target reader in utils.docx_reader with the
+python-docx object model on large generated documents with many tables, and
+checks that the streaming reader returns every paragraph python-docx sees (plus
+the table cells, which python-docx's document.paragraphs leaves out).
+
+Usage:
+    python benchmarks/bench_docx.py --sizes 1MB 20MB --tables-per-section 2
+"""
+
+import os
+import sys
+import time
+import zipfile
+import argparse
+import tracemalloc
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from syllabus_corpus import TOPICS, format_size, iter_syllabus_paragraphs, parse_size
+from utils.docx_reader import iter_docx_paragraphs
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+_RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def _paragraph_xml(text):
+    """Return the WordprocessingML for a one-run paragraph."""
+    return f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def _schedule_table_xml(section, rows=12):
+    """Return the WordprocessingML for a weekly schedule table."""
+    cells = ["Week", "Topic", "Reading", "Assessment"]
+    xml = ['<w:tbl>']
+    for row in range(rows + 1):
+        if row:
+            topic = TOPICS[(section + row) % len(TOPICS)]
+            cells = [f"Week {row}", topic.title(), f"Chapter {row} on {topic}", f"Quiz {row}"]
+        xml.append('<w:tr>' + ''.join(f'<w:tc>{_paragraph_xml(cell)}</w:tc>' for cell in cells) + '</w:tr>')
+    xml.append('</w:tbl>')
+    return ''.join(xml)
+
+
+def write_docx_with_tables(path, size_bytes, tables_per_section):
+    """
+    Write a DOCX syllabus with schedule tables after every section heading.
+
+    The package is written directly with zipfile, so very large documents can be
+    generated quickly.
+
+    Args:
+        path (str): Output path
+        size_bytes (int): Amount of paragraph text, in bytes
+        tables_per_section (int): Number of schedule tables after each section heading
+
+    Returns:
+        int: Number of tables written
+    """
+    tables = 0
+    section = 0
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _RELATIONSHIPS)
+        with archive.open('word/document.xml', 'w') as document:
+            document.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                           b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                           b'<w:body>')
+            for paragraph in iter_syllabus_paragraphs(size_bytes):
+                document.write(_paragraph_xml(paragraph).encode('utf-8'))
+                # Headings are the short paragraphs; each gets its schedule tables
+                if len(paragraph) < 40:
+                    for _ in range(tables_per_section):
+                        document.write(_schedule_table_xml(section).encode('utf-8'))
+                        tables += 1
+                    section += 1
+            document.write(b'</w:body></w:document>')
+    return tables
+
+
+def extract_python_docx(file_path):
+    """The previous extraction path: python-docx body paragraphs, no tables."""
+    import docx
+
+    doc = docx.Document(file_path)
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text
+
+
+def extract_python_docx_tables(file_path):
+    """python-docx with table cells included, for a like-for-like comparison."""
+    import docx
+
+    doc = docx.Document(file_path)
+    lines = [paragraph.text for paragraph in doc.paragraphs]
+    for table in doc.tables:
+        for row in table.rows:
+            lines.extend(cell.text for cell in row.cells)
+    return "\n".join(lines) + "\n"
+
+
+def extract_streaming(file_path):
+    """The streaming zip/XML-target path."""
+    return "".join(paragraph + "\n" for paragraph in iter_docx_paragraphs(file_path))
+
+
+def measure(func, file_path):
+    """Return (seconds, peak traced bytes, result), timing and tracing in separate runs."""
+    start = time.perf_counter()
+    result = func(file_path)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        func(file_path)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return seconds, peak, result
+
+
+def is_subsequence(lines, other_lines):
+    """Return True if lines appear in other_lines in the same order."""
+    remaining = iter(other_lines)
+    return all(line in remaining for line in lines)
+
+
+def main():
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Benchmark streaming DOCX extraction against python-docx")
+    parser.add_argument("--sizes", nargs="+", default=["1MB", "10MB"], help="Paragraph text sizes, e.g. 1MB 20MB")
+    parser.add_argument("--tables-per-section", type=int, default=2, help="Schedule tables after each heading")
+    parser.add_argument("--corpus-dir", default="bench_corpus", help="Directory for the generated documents")
+    args = parser.parse_args()
+
+    os.makedirs(args.corpus_dir, exist_ok=True)
+    print(f"{'document':>28} {'backend':>20} {'seconds':>9} {'peak MB':>9} {'chars':>11}")
+    for size in args.sizes:
+        size_bytes = parse_size(size)
+        path = os.path.join(args.corpus_dir, f"syllabus_tables_{format_size(size_bytes)}.docx")
+        tables = write_docx_with_tables(path, size_bytes, args.tables_per_section)
+        name = f"{os.path.basename(path)} ({tables} tables)"
+
+        results = {}
+        for backend, func in (("python-docx", extract_python_docx),
+                              ("python-docx+tables", extract_python_docx_tables),
+                              ("streaming", extract_streaming)):
+            seconds, peak, text = measure(func, path)
+            results[backend] = text
+            print(f"{name:>28} {backend:>20} {seconds:>9.3f} {peak / 1e6:>9.1f} {len(text):>11}")
+
+        # Every body paragraph python-docx sees must come out of the streaming reader, in order
+        if not is_subsequence(results["python-docx"].splitlines(), results["streaming"].splitlines()):
+            print(f"MISMATCH: streaming output of {path} is missing python-docx paragraphs")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
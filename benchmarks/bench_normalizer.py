@@ -0,0 +1,86 @@
+"""
+Benchmark for the single-pass text normalizer.
+Compares utils.text_normalizer.normalize_text against the original multi-pass
+preprocessing on large synthetic inputs and checks that the outputs are identical.
+
+Usage:
+    python benchmarks/bench_normalizer.py --sizes 1 10 50
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.text_normalizer import normalize_text
+
+SAMPLE_WORDS = [
+    'Machine', 'learning', 'students', 'course', 'Week', 'regression', 'analysis,',
+    'data-driven', 'models.', 'CS-101', '(2024)', 'evaluation;', 'neural', 'networks:',
+    'assignment_3', 'Lab', '#4', 'probability', 'statistics!', 'design?'
+]
+
+# Typographic characters found in syllabi exported from word processors
+UNICODE_WORDS = ['students\u2019', '\u201cdesign\u201d', 'week\u2013by\u2013week', '\u2022', 'caf\u00e9', 'na\u00efve']
+
+
+def reference_preprocess(text):
+    """The original four-pass preprocessing, kept here as the correctness oracle."""
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', ' ', text)
+    text = re.sub(r'\d+', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def make_text(size_mb, unicode_ratio, seed=0):
+    """Generate roughly size_mb megabytes of syllabus-like text."""
+    rng = random.Random(seed)
+    vocabulary = SAMPLE_WORDS + UNICODE_WORDS if unicode_ratio else SAMPLE_WORDS
+    weights = ([1.0] * len(SAMPLE_WORDS) + [unicode_ratio] * len(UNICODE_WORDS)
+               if unicode_ratio else None)
+    # Build one paragraph and repeat it, so generation time stays negligible
+    paragraph = []
+    for i in range(20000):
+        paragraph.append(rng.choices(vocabulary, weights=weights)[0])
+        paragraph.append('\n' if i % 15 == 14 else ' ')
+    paragraph = ''.join(paragraph)
+    repeats = max(1, int(size_mb * 1_000_000 / len(paragraph)))
+    return paragraph * repeats
+
+
+def time_call(func, text, repeat):
+    """Return the best wall-clock time of func(text) over several runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Benchmark the single-pass text normalizer")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 10, 50], help="Input sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'input':>22} {'reference (s)':>14} {'normalizer (s)':>15} {'speedup':>8}")
+    for size_mb in args.sizes:
+        for label, unicode_ratio in (('ascii', 0), ('typographic', 0.05)):
+            text = make_text(size_mb, unicode_ratio)
+            reference_time, expected = time_call(reference_preprocess, text, args.repeat)
+            normalizer_time, actual = time_call(normalize_text, text, args.repeat)
+            if actual != expected:
+                raise AssertionError(f"normalizer output differs from reference on {label} input")
+            print(f"{size_mb:>9g} MB {label:>11} {reference_time:>14.3f} {normalizer_time:>15.3f} "
+                  f"{reference_time / normalizer_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
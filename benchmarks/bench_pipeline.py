@@ -0,0 +1,203 @@
+"""
+Stage-level benchmark for the CLO pipeline.
+Generates synthetic TXT/DOCX/PDF syllabi and measures the wall-clock time and
+peak traced memory of each stage separately: extract_text_from_file,
+preprocess_text, tokenize_text, extract_keywords, generate_clos and
+extract_skills. Results are written as JSON; with --baseline, every stage is
+compared against an earlier run and the exit status is 1 if any stage got slower
+(or used more memory) by more than the threshold.
+
+Usage:
+    python benchmarks/bench_pipeline.py --sizes 10KB 1MB --output bench.json
+    python benchmarks/bench_pipeline.py --sizes 10KB 1MB --baseline bench.json --threshold 0.2
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from syllabus_corpus import FORMATS, generate_corpus, parse_size
+from pipeline import PIPELINE_VERSION
+from utils.document_processor import DocumentProcessor
+from models.clo_generator import CLOGenerator
+
+STAGES = ('extract_text_from_file', 'preprocess_text', 'tokenize_text',
+          'extract_keywords', 'generate_clos', 'extract_skills')
+
+# Stages faster than this are too noisy to flag as timing regressions
+MIN_SECONDS = 0.005
+
+# Peak memory below this is too small to flag as a memory regression
+MIN_BYTES = 1024 * 1024
+
+
+def run_stages(doc_processor, clo_generator, file_path, measure):
+    """
+    Run every pipeline stage once, measuring each with measure(stage, func).
+
+    Args:
+        doc_processor (DocumentProcessor): Document processor to benchmark
+        clo_generator (CLOGenerator): CLO generator to benchmark
+        file_path (str): Document to process
+        measure (callable): Called as measure(stage, func); returns func's result
+    """
+    text = measure('extract_text_from_file', lambda: doc_processor.extract_text_from_file(file_path))
+    preprocessed_text = measure('preprocess_text', lambda: doc_processor.preprocess_text(text))
+    sentences, words = measure('tokenize_text',
+                               lambda: doc_processor.tokenize_text(preprocessed_text, raw_text=text))
+    keywords = measure('extract_keywords', lambda: doc_processor.extract_keywords(words, top_n=30))
+    clos = measure('generate_clos', lambda: clo_generator.generate_clos(keywords, num_clos=5, seed=0))
+    measure('extract_skills', lambda: clo_generator.extract_skills(keywords, clos, num_skills=10))
+
+
+def benchmark_document(doc_processor, clo_generator, file_path, repeat):
+    """
+    Time and memory-profile each stage on one document.
+
+    Timings are the best of repeat runs without tracing; peak memory comes from
+    a separate traced run, since tracemalloc slows allocation-heavy code down.
+
+    Args:
+        doc_processor (DocumentProcessor): Document processor to benchmark
+        clo_generator (CLOGenerator): CLO generator to benchmark
+        file_path (str): Document to process
+        repeat (int): Number of timed runs
+
+    Returns:
+        dict: Stage -> {'seconds': best wall-clock time, 'peak_bytes': peak traced memory}
+    """
+    results = {stage: {'seconds': float('inf'), 'peak_bytes': 0} for stage in STAGES}
+
+    def timed(stage, func):
+        start = time.perf_counter()
+        value = func()
+        results[stage]['seconds'] = min(results[stage]['seconds'], time.perf_counter() - start)
+        return value
+
+    def traced(stage, func):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        value = func()
+        _, peak = tracemalloc.get_traced_memory()
+        results[stage]['peak_bytes'] = peak - baseline
+        return value
+
+    for _ in range(repeat):
+        run_stages(doc_processor, clo_generator, file_path, timed)
+
+    tracemalloc.start()
+    try:
+        run_stages(doc_processor, clo_generator, file_path, traced)
+    finally:
+        tracemalloc.stop()
+
+    return results
+
+
+def compare(current, baseline, threshold):
+    """
+    Compare a benchmark run against a baseline run.
+
+    Args:
+        current (dict): Benchmark results
+        baseline (dict): Earlier benchmark results
+        threshold (float): Allowed relative increase, e.g. 0.2 for 20%
+
+    Returns:
+        list: One dict per stage measured in both runs, with the ratios and a
+            'regression' flag
+    """
+    baseline_documents = {document['name']: document for document in baseline['documents']}
+    comparisons = []
+    for document in current['documents']:
+        previous = baseline_documents.get(document['name'])
+        if previous is None:
+            continue
+        for stage, now in document['stages'].items():
+            before = previous['stages'].get(stage)
+            if before is None:
+                continue
+            time_ratio = now['seconds'] / before['seconds'] if before['seconds'] else 1.0
+            memory_ratio = now['peak_bytes'] / before['peak_bytes'] if before['peak_bytes'] else 1.0
+            slower = time_ratio > 1 + threshold and now['seconds'] >= MIN_SECONDS
+            larger = memory_ratio > 1 + threshold and now['peak_bytes'] >= MIN_BYTES
+            comparisons.append({
+                'document': document['name'],
+                'stage': stage,
+                'time_ratio': round(time_ratio, 3),
+                'memory_ratio': round(memory_ratio, 3),
+                'regression': slower or larger
+            })
+    return comparisons
+
+
+def main():
+    """Run the benchmark, write the JSON results and compare against a baseline."""
+    parser = argparse.ArgumentParser(description="Benchmark each CLO pipeline stage on synthetic syllabi")
+    parser.add_argument("--sizes", nargs="+", default=["10KB", "1MB"], help="Document text sizes, e.g. 10KB 1MB 100MB")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS), help="Document formats")
+    parser.add_argument("--corpus-dir", default="bench_corpus", help="Directory for the generated syllabi (reused across runs)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per document (best is reported)")
+    parser.add_argument("--output", "-o", help="Write the JSON results to this file (default: stdout)")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown before a stage is flagged")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.corpus_dir, [parse_size(size) for size in args.sizes], args.formats)
+    doc_processor = DocumentProcessor()
+    clo_generator = CLOGenerator()
+
+    # Warm up the lazily imported PDF backend, so its one-off import cost is not
+    # attributed to the first PDF's stages (DOCX files need only the standard library)
+    if any(file_format == 'pdf' for _, file_format, _ in corpus):
+        import PyPDF2
+    doc_processor.process_text("Warm up the pipeline.")
+    clo_generator.generate_clos(['warm', 'up'], num_clos=1, seed=0)
+
+    documents = []
+    for path, file_format, size_bytes in corpus:
+        print(f"Benchmarking {path}...", file=sys.stderr)
+        documents.append({
+            'name': os.path.basename(path),
+            'format': file_format,
+            'text_bytes': size_bytes,
+            'file_bytes': os.path.getsize(path),
+            'stages': benchmark_document(doc_processor, clo_generator, path, args.repeat)
+        })
+
+    results = {
+        'pipeline_version': PIPELINE_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'documents': documents
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            comparisons = compare(results, json.load(file), args.threshold)
+        results['comparison'] = {'baseline': args.baseline, 'threshold': args.threshold, 'stages': comparisons}
+        regressions = [entry for entry in comparisons if entry['regression']]
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    for entry in regressions:
+        print(f"REGRESSION {entry['document']} {entry['stage']}: time x{entry['time_ratio']}, "
+              f"memory x{entry['memory_ratio']}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
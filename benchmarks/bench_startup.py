@@ -0,0 +1,77 @@
+"""
+Cold-start benchmark for the command-line entry point.
+Measures the wall-clock time of fresh interpreter runs of `python main.py --help`
+and of processing a small .txt file, which is dominated by import cost.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+SAMPLE_CONTENT = """Introduction to Machine Learning
+
+Students will learn supervised learning, including classification and regression,
+and unsupervised learning, including clustering and dimensionality reduction.
+Assessment covers model selection, evaluation techniques and data preprocessing.
+"""
+
+
+def time_command(command, runs):
+    """Run a command several times in a fresh interpreter and return the timings."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(command, cwd=REPO_ROOT, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE, text=True)
+        timings.append(time.perf_counter() - start)
+        if completed.returncode != 0:
+            raise RuntimeError(f"{' '.join(command)} failed:\n{completed.stderr}")
+    return timings
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description="Measure CLI cold-start time")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs per command")
+    parser.add_argument("--importtime", action="store_true",
+                        help="Also print the slowest imports for the small-file run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        sample_path = os.path.join(temp_dir, "sample.txt")
+        with open(sample_path, "w", encoding="utf-8") as f:
+            f.write(SAMPLE_CONTENT)
+        output_dir = os.path.join(temp_dir, "output")
+
+        commands = {
+            "main.py --help": [sys.executable, "main.py", "--help"],
+            "main.py sample.txt": [sys.executable, "main.py", sample_path, "--output", output_dir]
+        }
+
+        print(f"{'command':<22} {'min (s)':>8} {'median (s)':>11}")
+        for label, command in commands.items():
+            timings = time_command(command, args.runs)
+            print(f"{label:<22} {min(timings):>8.3f} {statistics.median(timings):>11.3f}")
+
+        if args.importtime:
+            completed = subprocess.run([sys.executable, "-X", "importtime"] + commands["main.py sample.txt"][1:],
+                                       cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+            rows = [line for line in completed.stderr.splitlines()
+                    if line.startswith("import time:") and line.split("|")[1].strip().isdigit()]
+            rows.sort(key=lambda line: int(line.split("|")[1]), reverse=True)
+            print("\nSlowest imports (cumulative microseconds):")
+            for line in rows[:10]:
+                print("  " + line.split(":", 1)[1].strip())
+
+
+if __name__ == "__main__":
+    main()
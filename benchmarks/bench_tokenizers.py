@@ -0,0 +1,73 @@
+"""
+Benchmark for the tokenizer backends.
+Times word tokenization (on preprocessed text) and sentence segmentation (on raw
+text) for each backend in utils.tokenizers on large synthetic inputs.
+
+Usage:
+    python benchmarks/bench_tokenizers.py --sizes 1 5
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.text_normalizer import normalize_text
+from utils.tokenizers import TOKENIZERS, get_tokenizer
+
+SENTENCES = [
+    "Students will analyze regression models and evaluate their assumptions.",
+    "Week 3 covers neural networks, backpropagation and gradient descent!",
+    "Can learners design a data pipeline for a real-world problem?",
+    "Assessment includes two projects (40%) and a final exam (60%).",
+    "The course introduces probability, statistics and machine learning."
+]
+
+
+def make_text(size_mb, seed=0):
+    """Generate roughly size_mb megabytes of raw syllabus-like text."""
+    rng = random.Random(seed)
+    paragraph = " ".join(rng.choice(SENTENCES) for _ in range(2000)) + "\n\n"
+    return paragraph * max(1, int(size_mb * 1_000_000 / len(paragraph)))
+
+
+def best_time(func, text, repeat):
+    """Return the best wall-clock time and the result of func(text)."""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Benchmark the tokenizer backends")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 5], help="Input sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    backends = {}
+    for name in TOKENIZERS:
+        try:
+            backends[name] = get_tokenizer(name)
+        except LookupError as e:
+            print(f"Skipping the {name} backend: {e}\n")
+
+    print(f"{'input':>8} {'backend':>8} {'words (s)':>10} {'#words':>10} {'sentences (s)':>14} {'#sentences':>11}")
+    for size_mb in args.sizes:
+        raw_text = make_text(size_mb)
+        preprocessed_text = normalize_text(raw_text)
+        for name, backend in backends.items():
+            word_time, words = best_time(backend.tokenize_words, preprocessed_text, args.repeat)
+            sentence_time, sentences = best_time(backend.tokenize_sentences, raw_text, args.repeat)
+            print(f"{size_mb:>5g} MB {name:>8} {word_time:>10.3f} {len(words):>10} "
+                  f"{sentence_time:>14.3f} {len(sentences):>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Synthetic syllabus corpus generator for the benchmarks.
+Writes reproducible TXT, DOCX and PDF syllabi of a given size, so pipeline
+stages can be measured on inputs from a few kilobytes to hundreds of megabytes.
+
+Usage:
+    python benchmarks/syllabus_corpus.py --sizes 10KB 1MB 100MB --formats txt docx pdf
+"""
+
+import os
+import random
+import argparse
+
+SIZE_UNITS = {'KB': 1000, 'MB': 1000 ** 2, 'GB': 1000 ** 3}
+
+FORMATS = ('txt', 'docx', 'pdf')
+
+HEADINGS = [
+    "Course Description", "Learning Objectives", "Weekly Schedule", "Assessment",
+    "Required Readings", "Laboratory Sessions", "Course Policies"
+]
+
+TOPICS = [
+    "machine learning", "linear regression", "neural networks", "gradient descent",
+    "probability theory", "data structures", "software design", "statistical inference",
+    "database systems", "cross validation", "feature engineering", "computer networks",
+    "operating systems", "algorithm analysis", "numerical methods", "information security"
+]
+
+SENTENCE_TEMPLATES = [
+    "Students will {verb} the core ideas of {topic} and relate them to {other}.",
+    "Week {week} covers {topic}, with worked examples drawn from {other}.",
+    "The laboratory on {topic} asks learners to {verb} a small project using {other}.",
+    "Assessment includes a quiz on {topic} ({percent}%) and a report on {other}.",
+    "Readings on {topic} prepare students to {verb} problems in {other}.",
+    "By the end of the unit, learners can {verb} how {topic} supports {other}."
+]
+
+VERBS = [
+    "analyze", "apply", "design", "evaluate", "explain", "implement", "compare",
+    "describe", "develop", "assess", "break down", "set up"
+]
+
+# Characters of a PDF text string that must be escaped
+_PDF_ESCAPES = str.maketrans({'\\': '\\\\', '(': '\\(', ')': '\\)'})
+
+# Text lines per PDF page
+_PDF_LINES_PER_PAGE = 45
+
+
+def parse_size(value):
+    """
+    Parse a size such as '10KB', '1.5MB' or '2048' (bytes).
+
+    Args:
+        value (str): Size with an optional KB/MB/GB suffix
+
+    Returns:
+        int: Size in bytes
+    """
+    text = value.strip().upper()
+    for unit, factor in SIZE_UNITS.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+
+def format_size(size_bytes):
+    """Format a byte count as the shortest exact KB/MB/GB label, e.g. '10KB'."""
+    for unit, factor in reversed(SIZE_UNITS.items()):
+        if size_bytes >= factor and size_bytes % factor == 0:
+            return f"{size_bytes // factor}{unit}"
+    return f"{size_bytes}B"
+
+
+def iter_syllabus_paragraphs(size_bytes, seed=0):
+    """
+    Generate syllabus-like paragraphs until roughly size_bytes of text.
+
+    Args:
+        size_bytes (int): Target amount of text, in UTF-8 bytes
+        seed (int): Random seed, so the same size always gives the same text
+
+    Yields:
+        str: Paragraphs, section headings included
+    """
+    rng = random.Random(seed)
+    written = 0
+    section = 0
+    while written < size_bytes:
+        heading = f"{HEADINGS[section % len(HEADINGS)]} {section // len(HEADINGS) + 1}"
+        section += 1
+        written += len(heading) + 1
+        yield heading
+
+        for _ in range(rng.randint(3, 8)):
+            sentences = []
+            for _ in range(rng.randint(3, 6)):
+                topic, other = rng.sample(TOPICS, 2)
+                sentences.append(rng.choice(SENTENCE_TEMPLATES).format(
+                    verb=rng.choice(VERBS), topic=topic, other=other,
+                    week=rng.randint(1, 15), percent=rng.choice((10, 15, 20, 25))
+                ))
+            paragraph = " ".join(sentences)
+            written += len(paragraph) + 1
+            yield paragraph
+            if written >= size_bytes:
+                return
+
+
+def write_txt(path, paragraphs):
+    """Write paragraphs to a UTF-8 text file, one per line."""
+    with open(path, 'w', encoding='utf-8') as file:
+        for paragraph in paragraphs:
+            file.write(paragraph + "\n")
+
+
+def write_docx(path, paragraphs):
+    """Write paragraphs to a DOCX document with python-docx."""
+    import docx
+
+    document = docx.Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    document.save(path)
+
+
+def _wrap(paragraph, width=90):
+    """Split a paragraph into lines of at most width characters."""
+    lines, line = [], ""
+    for word in paragraph.split():
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def write_pdf(path, paragraphs):
+    """
+    Write paragraphs to a minimal, valid PDF with one Helvetica text stream per page.
+
+    The file is written object by object, so memory stays flat for very large
+    documents; only the object offsets are kept for the cross-reference table.
+    """
+    lines = (line for paragraph in paragraphs for line in _wrap(paragraph) + [""])
+
+    # Objects 1-3 (catalog, page tree, font) are written last but numbered first;
+    # page and content objects are numbered in pairs from 4 upwards
+    offsets = {}
+    with open(path, 'wb') as file:
+        file.write(b"%PDF-1.4\n")
+
+        def write_object(number, body):
+            offsets[number] = file.tell()
+            file.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+        page_numbers = []
+        next_number = 4
+        page_lines = []
+        for line in lines:
+            page_lines.append(line)
+            if len(page_lines) < _PDF_LINES_PER_PAGE:
+                continue
+            page_numbers.append(next_number)
+            _write_pdf_page(write_object, next_number, page_lines)
+            next_number += 2
+            page_lines = []
+        if page_lines or not page_numbers:
+            page_numbers.append(next_number)
+            _write_pdf_page(write_object, next_number, page_lines)
+
+        kids = " ".join(f"{number} 0 R" for number in page_numbers)
+        write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        write_object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_numbers)} >>".encode('ascii'))
+        write_object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+        xref_offset = file.tell()
+        size = max(offsets) + 1
+        file.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for number in range(1, size):
+            file.write(b"%010d 00000 n \n" % offsets[number])
+        file.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_offset))
+
+
+def _write_pdf_page(write_object, number, page_lines):
+    """Write one page object and its content stream (object numbers number, number+1)."""
+    commands = ["BT /F1 10 Tf 14 TL 50 750 Td"]
+    for line in page_lines:
+        text = line.encode('latin-1', 'replace').decode('latin-1').translate(_PDF_ESCAPES)
+        commands.append(f"({text}) Tj T*")
+    commands.append("ET")
+    stream = "\n".join(commands).encode('latin-1')
+
+    write_object(number, (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                          f"/Resources << /Font << /F1 3 0 R >> >> /Contents {number + 1} 0 R >>").encode('ascii'))
+    write_object(number + 1, b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+
+WRITERS = {
+    'txt': write_txt,
+    'docx': write_docx,
+    'pdf': write_pdf
+}
+
+
+def generate_corpus(output_dir, sizes, formats=FORMATS, seed=0, overwrite=False):
+    """
+    Generate one syllabus per size and format.
+
+    Existing files are reused unless overwrite is set, since the text for a
+    given size and seed never changes.
+
+    Args:
+        output_dir (str): Directory for the generated files
+        sizes (list): Text sizes in bytes
+        formats (tuple): Formats to write, keys of WRITERS
+        seed (int): Random seed for the text
+        overwrite (bool): Regenerate files that already exist
+
+    Returns:
+        list: (path, format, size in bytes) for every generated syllabus
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    corpus = []
+    for size_bytes in sizes:
+        for file_format in formats:
+            if file_format not in WRITERS:
+                raise ValueError(f"Unsupported format: {file_format} (choose from {', '.join(WRITERS)})")
+            path = os.path.join(output_dir, f"syllabus_{format_size(size_bytes)}.{file_format}")
+            if overwrite or not os.path.exists(path):
+                WRITERS[file_format](path, iter_syllabus_paragraphs(size_bytes, seed=seed))
+            corpus.append((path, file_format, size_bytes))
+    return corpus
+
+
+def main():
+    """Generate a synthetic syllabus corpus."""
+    parser = argparse.ArgumentParser(description="Generate synthetic TXT/DOCX/PDF syllabi")
+    parser.add_argument("--output", "-o", default="bench_corpus", help="Directory for the generated files")
+    parser.add_argument("--sizes", nargs="+", default=["10KB", "1MB"], help="Text sizes, e.g. 10KB 1MB 100MB")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS), help="Formats to write")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the text")
+    parser.add_argument("--overwrite", action="store_true", help="Regenerate files that already exist")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.output, [parse_size(size) for size in args.sizes], args.formats,
+                             seed=args.seed, overwrite=args.overwrite)
+    for path, _, _ in corpus:
+        print(f"{path}: {os.path.getsize(path) / 1000:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
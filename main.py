@@ -3,91 +3,513 @@ Main entry point for the CLO Generator system.
 """
 
 import os
+import time
+import shutil
 import argparse
-from utils.document_processor import DocumentProcessor
-from models.clo_generator import CLOGenerator
+import contextlib
+from pipeline import (PIPELINE_VERSION, CLOPipeline, ProgressReporter, collect_documents, process_batch,
+                      rank_corpus_keywords, read_manifest)
+from utils.file_index import FileIndex, missing_roots
+from utils.instrumentation import Instrumentation, write_trace
+from utils.resources import ensure_nltk_resources
+from utils.result_cache import ResultCache
+from utils.result_sink import open_sink
 
-def process_document(file_path, output_dir, num_clos=5, num_skills=10):
+def print_results(clos, skills):
     """
-    Process a document to generate CLOs and skill sets.
-    
+    Print the generated CLOs and skill sets.
+
     Args:
-        file_path (str): Path to the document file
-        output_dir (str): Directory to save the output
-        num_clos (int): Number of CLOs to generate
-        num_skills (int): Number of skills to extract
+        clos (list): Generated CLOs
+        skills (list): Extracted skills
     """
-    # Initialize processors
-    doc_processor = DocumentProcessor()
-    clo_generator = CLOGenerator()
-    
-    # Extract text from the document
-    print(f"Processing document: {file_path}")
-    text = doc_processor.extract_text_from_file(file_path)
-    
-    # Preprocess the text
-    print("Preprocessing text...")
-    preprocessed_text = doc_processor.preprocess_text(text)
-    
-    # Tokenize the text
-    print("Tokenizing text...")
-    sentences, words = doc_processor.tokenize_text(preprocessed_text)
-    
-    # Extract keywords
-    print("Extracting keywords...")
-    keywords = doc_processor.extract_keywords(words, top_n=30)
-    
-    # Generate CLOs
-    print(f"Generating {num_clos} CLOs...")
-    clos = clo_generator.generate_clos(keywords, num_clos=num_clos)
-    
-    # Extract skill sets
-    print(f"Extracting {num_skills} skills...")
-    skills = clo_generator.extract_skills(keywords, clos, num_skills=num_skills)
-    
-    # Print results
     print("\n=== Generated Course Learning Outcomes (CLOs) ===")
     for i, clo in enumerate(clos):
         print(f"CLO {i+1}: {clo['clo']}")
-        print(f"Taxonomy Level: {clo['taxonomy_level'].capitalize()} | Action Verb: {clo['action_verb'].capitalize()}")
+        print(f"Domain: {clo['domain'].capitalize()} | Action Verb: {clo['action_verb'].capitalize()}")
         print()
-    
+
     print("\n=== Extracted Skill Sets ===")
     for i, skill in enumerate(skills):
         print(f"- {skill}")
-    
+
+def print_content_scan(content_scan, limit=10):
+    """
+    Print the action verbs and domain phrases found in the content.
+
+    Args:
+        content_scan (dict): Result of CLOGenerator.scan_content
+        limit (int): Maximum number of entries to print per list
+    """
+    for title, found in (("Action verbs in content", content_scan['action_verbs']),
+                         ("Domain phrases in content", content_scan['domain_phrases'])):
+        if found:
+            entries = ', '.join(f"{phrase} ({count})" for phrase, count in list(found.items())[:limit])
+            print(f"{title}: {entries}")
+
+def load_domain_phrases(path):
+    """
+    Load a domain vocabulary file, one phrase per line.
+
+    Args:
+        path (str): Path to the vocabulary file
+
+    Returns:
+        list: Phrases, without blank lines and '#' comments
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        return [line.strip() for line in file if line.strip() and not line.strip().startswith('#')]
+
+def save_results(clos, skills, output_dir):
+    """
+    Save the generated CLOs and skill sets to text files.
+
+    Args:
+        clos (list): Generated CLOs
+        skills (list): Extracted skills
+        output_dir (str): Directory to save the output
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Save CLOs
+    clo_file_path = os.path.join(output_dir, "generated_clos.txt")
+    with open(clo_file_path, "w", encoding="utf-8") as f:
+        f.write("=== Generated Course Learning Outcomes (CLOs) ===\n\n")
+        for i, clo in enumerate(clos):
+            f.write(f"CLO {i+1}: {clo['clo']}\n")
+            f.write(f"Domain: {clo['domain'].capitalize()} | Action Verb: {clo['action_verb'].capitalize()}\n\n")
+
+    # Save skills
+    skill_file_path = os.path.join(output_dir, "extracted_skills.txt")
+    with open(skill_file_path, "w", encoding="utf-8") as f:
+        f.write("=== Extracted Skill Sets ===\n\n")
+        for skill in skills:
+            f.write(f"- {skill}\n")
+
+def print_cache_stats(stats, previous=None):
+    """
+    Print result cache hit/miss counts per stage.
+
+    Args:
+        stats (dict): Cache statistics from ResultCache.stats()
+        previous (dict): Statistics taken before the run, to report only this run's lookups
+    """
+    previous_stages = previous['stages'] if previous else {}
+    print(f"\nCache: {stats['entries']} entries, {stats['bytes'] / (1024 * 1024):.1f} MB")
+    for stage, counts in sorted(stats['stages'].items()):
+        before = previous_stages.get(stage, {'hits': 0, 'misses': 0})
+        hits = counts['hits'] - before['hits']
+        misses = counts['misses'] - before['misses']
+        if hits or misses:
+            print(f"  {stage}: {hits} hits, {misses} misses")
+
+def print_stage_timings(events):
+    """
+    Print the time spent in each pipeline stage.
+
+    Args:
+        events (list): Trace events recorded by the Instrumentation
+    """
+    print("\n=== Stage Timings ===")
+    for stage, seconds in Instrumentation().stage_totals(events).items():
+        print(f"{stage:<20} {seconds * 1000:>10.1f} ms")
+    for event in events:
+        if event['event'] == 'document' and event['counters']:
+            print("Counters: " + ", ".join(f"{name}={value}" for name, value in event['counters'].items()))
+
+def process_document(file_path, output_dir, num_clos=5, num_skills=10, trace_file=None, sink=None,
+                     **pipeline_options):
+    """
+    Process a document to generate CLOs and skill sets.
+
+    Args:
+        file_path (str): Path to the document file
+        output_dir (str): Directory to save the output
+        num_clos (int): Number of CLOs to generate
+        num_skills (int): Number of skills to extract
+        trace_file: Open file for the JSON lines trace, when profiling
+        sink (JSONLSink or ParquetSink): Receives the result as a structured record
+        **pipeline_options: Keyword arguments for the CLOPipeline
+    """
+    pipeline = CLOPipeline(**pipeline_options)
+    previous = pipeline.cache.stats() if pipeline.cache else None
+    result = pipeline.process_file(file_path, num_clos=num_clos, num_skills=num_skills, verbose=True)
+
+    if 'near_duplicate_of' in result:
+        print(f"\nReused the results of near-duplicate {result['near_duplicate_of']} "
+              f"(similarity {result['similarity']:.2f})")
+    if 'content_scan' in result:
+        print()
+        print_content_scan(result['content_scan'])
+    print_results(result['clos'], result['skills'])
+
+    # With only a sink, the stages are timed for its records but not printed
+    if trace_file and 'trace' in result:
+        print_stage_timings(result['trace'])
+        write_trace(result['trace'], trace_file)
+
     # Save results to files
     if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Save CLOs
-        clo_file_path = os.path.join(output_dir, "generated_clos.txt")
-        with open(clo_file_path, "w", encoding="utf-8") as f:
-            f.write("=== Generated Course Learning Outcomes (CLOs) ===\n\n")
-            for i, clo in enumerate(clos):
-                f.write(f"CLO {i+1}: {clo['clo']}\n")
-                f.write(f"Taxonomy Level: {clo['taxonomy_level'].capitalize()} | Action Verb: {clo['action_verb'].capitalize()}\n\n")
-        
-        # Save skills
-        skill_file_path = os.path.join(output_dir, "extracted_skills.txt")
-        with open(skill_file_path, "w", encoding="utf-8") as f:
-            f.write("=== Extracted Skill Sets ===\n\n")
-            for skill in skills:
-                f.write(f"- {skill}\n")
-        
+        save_results(result['clos'], result['skills'], output_dir)
         print(f"\nResults saved to {output_dir}")
+    if sink:
+        sink.write(result)
+        print(f"Result record written to {sink.path}")
+
+    if pipeline.cache:
+        print_cache_stats(pipeline.cache.stats(), previous)
+
+def process_corpus(file_paths, output_dir, num_clos=5, num_skills=10, workers=None, corpus_tfidf=False,
+                   trace_file=None, sink=None, **pipeline_options):
+    """
+    Process a corpus of documents across a pool of worker processes.
+
+    Each document's results are saved to its own subdirectory of output_dir,
+    named after the document.
+
+    Args:
+        file_paths (list): Paths of the documents to process
+        output_dir (str): Directory to save the output
+        num_clos (int): Number of CLOs to generate per document
+        num_skills (int): Number of skills to extract per document
+        workers (int): Number of worker processes (defaults to the CPU count)
+        corpus_tfidf (bool): Rank each document's keywords by TF-IDF across the whole
+            corpus, in a counting pass before the documents are processed
+        trace_file: Open file for the JSON lines trace, when profiling
+        sink (JSONLSink or ParquetSink): Receives one structured record per document,
+            failures included, as results arrive
+        **pipeline_options: Keyword arguments for each worker's CLOPipeline
+    """
+    # Give every document a unique output directory, even if file names repeat
+    output_names = {}
+    used_names = set()
+    for path in file_paths:
+        base = os.path.splitext(os.path.basename(path))[0]
+        name, suffix = base, 1
+        while name in used_names:
+            suffix += 1
+            name = f"{base}_{suffix}"
+        used_names.add(name)
+        output_names[path] = name
+
+    cache = None
+    if pipeline_options.get('cache_dir'):
+        cache = ResultCache(pipeline_options['cache_dir'], version=PIPELINE_VERSION)
+        previous = cache.stats()
+
+    corpus_keywords = None
+    if corpus_tfidf:
+        print(f"Ranking keywords across {len(file_paths)} documents with TF-IDF...")
+        corpus_keywords = rank_corpus_keywords(file_paths, workers=workers, **pipeline_options)
+
+    print(f"Processing {len(file_paths)} documents with {workers or os.cpu_count()} workers...")
+    progress = ProgressReporter(len(file_paths))
+
+    for result in process_batch(file_paths, num_clos=num_clos, num_skills=num_skills, workers=workers,
+                                corpus_keywords=corpus_keywords, **pipeline_options):
+        if output_dir and 'error' not in result:
+            save_results(result['clos'], result['skills'],
+                         os.path.join(output_dir, output_names[result['file_path']]))
+        if trace_file and 'trace' in result:
+            write_trace(result['trace'], trace_file)
+        if sink:
+            sink.write(result)
+        progress.update(result)
+
+    progress.summary()
+    if output_dir:
+        print(f"Results saved to {output_dir}")
+    if sink:
+        print(f"{sink.records} result records written to {sink.path}")
+
+    if cache:
+        print_cache_stats(cache.stats(), previous)
+        cache.close()
+
+def sync_documents(index, inputs, output_dir, num_clos=5, num_skills=10, workers=None, manifest=None,
+                   settle=0.0, quiet=False, params_key=None, trace_file=None, sink=None, **pipeline_options):
+    """
+    Bring the results up to date with the documents on disk, in one pass.
+
+    Only new or changed documents are processed. Each document keeps the same
+    output subdirectory across passes. Results of documents deleted from under
+    the inputs are removed, unless an input itself is missing.
+
+    Args:
+        index (FileIndex): Index of the documents processed so far
+        inputs (list): Files, directories or glob patterns to watch
+        output_dir (str): Directory to save the output
+        num_clos (int): Number of CLOs to generate per document
+        num_skills (int): Number of skills to extract per document
+        workers (int): Number of worker processes (defaults to the CPU count)
+        manifest (str): Optional file listing one document path per line
+        settle (float): Seconds a document must stay unmodified before it is processed
+        quiet (bool): Print nothing when the pass finds no changes
+        params_key (str): Key of the pipeline version and result parameters, from
+            CLOPipeline.params_key; documents processed with another key are reprocessed
+        trace_file: Open file for the JSON lines trace, when profiling
+        sink (JSONLSink or ParquetSink): Receives one structured record per processed document
+        **pipeline_options: Keyword arguments for each worker's CLOPipeline
+
+    Returns:
+        ScanResult: What the pass found
+    """
+    roots = list(inputs) + (read_manifest(manifest) if manifest else [])
+    missing = missing_roots(inputs)
+    if missing:
+        # An unmounted or mistyped input would otherwise look like every document was deleted
+        print(f"Input not found, not removing any results: {', '.join(missing)}")
+        roots = []
+    scan = index.scan(collect_documents(inputs, manifest=manifest), settle=settle, roots=roots,
+                      params_key=params_key)
+
+    for path, output_name in scan.deleted:
+        if output_dir:
+            shutil.rmtree(os.path.join(output_dir, output_name), ignore_errors=True)
+        index.forget(path)
+        print(f"Removed results of deleted document {path}")
+
+    if scan.changed:
+        states = {state.path: state for state in scan.changed}
+        output_names = {}
+        reserved = set()
+        for path in states:
+            output_names[path] = index.output_name(path, reserved=reserved)
+            reserved.add(output_names[path])
+
+        print(f"Processing {len(states)} new or changed documents...")
+        progress = ProgressReporter(len(states))
+        for result in process_batch(list(states), num_clos=num_clos, num_skills=num_skills,
+                                    workers=workers, **pipeline_options):
+            path = result['file_path']
+            if output_dir and 'error' not in result:
+                save_results(result['clos'], result['skills'], os.path.join(output_dir, output_names[path]))
+            if trace_file and 'trace' in result:
+                write_trace(result['trace'], trace_file)
+            if sink:
+                sink.write(result)
+            # Recorded only once handled, so an interrupted pass is resumed by the next one
+            index.record(states[path], output_names[path], params_key=params_key, error=result.get('error'))
+            progress.update(result)
+        progress.summary()
+
+    if not quiet or scan.changed or scan.deleted or scan.settling:
+        print(f"Scan: {len(scan.changed)} processed, {len(scan.deleted)} deleted, "
+              f"{len(scan.settling)} settling, {scan.unchanged} unchanged")
+    return scan
+
+def watch_documents(index, inputs, output_dir, interval=10.0, **sync_options):
+    """
+    Keep the results in sync with the documents on disk until interrupted.
+
+    Changes that arrive between two passes are handled together in the next one.
+
+    Args:
+        index (FileIndex): Index of the documents processed so far
+        inputs (list): Files, directories or glob patterns to watch
+        output_dir (str): Directory to save the output
+        interval (float): Seconds between passes
+        **sync_options: Keyword arguments for sync_documents
+    """
+    print(f"Watching {', '.join(inputs)} every {interval:g}s (Ctrl+C to stop)")
+    try:
+        while True:
+            scan = sync_documents(index, inputs, output_dir, quiet=True, **sync_options)
+            # Come back sooner for documents that were still being written
+            time.sleep(min(interval, sync_options.get('settle', 0.0)) if scan.settling else interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+@contextlib.contextmanager
+def cprofiled(stats_path, top=25):
+    """
+    Run the enclosed block under cProfile.
+
+    In batch mode only the parent process is profiled; use --profile for the
+    per-stage timings of the workers.
+
+    Args:
+        stats_path (str): File to save the profile stats to (readable with pstats)
+        top (int): Number of functions to print, by cumulative time
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(stats_path)
+        print(f"\nProfile saved to {stats_path}")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(top)
 
 def main():
     """Main function to run the CLO Generator from the command line."""
     parser = argparse.ArgumentParser(description="Generate CLOs and skill sets from course content")
-    parser.add_argument("file_path", help="Path to the document file")
-    parser.add_argument("--output", "-o", help="Directory to save the output", default="output")
+    parser.add_argument("inputs", nargs="*", help="Document file(s), directories or glob patterns")
+    parser.add_argument("--manifest", "-m", help="File listing one document path per line")
+    parser.add_argument("--output", "-o",
+                        help="Directory to save the text reports (default: output, or none with --sink)")
+    parser.add_argument("--sink", help="Write one structured record per document to this .jsonl or .parquet file")
     parser.add_argument("--clos", "-c", type=int, help="Number of CLOs to generate", default=5)
     parser.add_argument("--skills", "-s", type=int, help="Number of skills to extract", default=10)
-    
+    parser.add_argument("--workers", "-w", type=int, help="Number of worker processes for batch mode (default: CPU count)")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible CLOs")
+    parser.add_argument("--pdf-workers", type=int, help="Worker processes for extracting large PDFs by page range")
+    parser.add_argument("--count-workers", type=int,
+                        help="Worker processes for counting the keywords of very large documents shard by shard")
+    parser.add_argument("--max-pages", type=int, help="Maximum number of PDF pages to extract per document")
+    parser.add_argument("--tokenizer", choices=["regex", "nltk"], default="regex",
+                        help="Tokenizer backend (regex is fast; nltk uses Punkt and Treebank)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream text straight into the keyword counter (memory grows with vocabulary, not document size)")
+    parser.add_argument("--memory-budget", type=int, default=64,
+                        help="With --stream, approximate memory in MB for the chunks of a TXT file")
+    parser.add_argument("--cluster", action="store_true",
+                        help="Group keywords for each CLO by co-occurrence instead of by rank")
+    parser.add_argument("--keyphrases", action="store_true",
+                        help="Extract multi-word keyphrases (e.g. 'machine learning') instead of single keywords")
+    parser.add_argument("--corpus-tfidf", action="store_true",
+                        help="In batch mode, rank keywords by TF-IDF across all documents, so terms shared by "
+                             "most documents stop dominating")
+    parser.add_argument("--ground-verbs", action="store_true",
+                        help="Prefer the action verbs the course content already uses")
+    parser.add_argument("--domain-phrases", help="File of domain phrases (one per line) to look for in the content")
+    parser.add_argument("--rerank-model", metavar="PATH",
+                        help="Local sentence-embedding model directory for re-ranking keywords by meaning")
+    parser.add_argument("--near-duplicates", type=float, nargs="?", const=0.9, metavar="THRESHOLD",
+                        help="Reuse the results of an already processed document whose shingles overlap at least "
+                             "THRESHOLD (Jaccard similarity, default 0.9); needs --cache-dir")
+    parser.add_argument("--sync", action="store_true",
+                        help="Process only documents that are new or changed since the last --sync/--watch run")
+    parser.add_argument("--watch", type=float, nargs="?", const=10.0, metavar="SECONDS",
+                        help="Keep syncing the inputs every SECONDS (default 10) until interrupted")
+    parser.add_argument("--index", default=".clo_index.sqlite3",
+                        help="Index of processed documents used by --sync and --watch")
+    parser.add_argument("--settle", type=float, default=2.0,
+                        help="With --sync/--watch, seconds a document must stay unmodified before it is processed")
+    parser.add_argument("--cache-dir", help="Directory for the persistent result cache (disabled by default)")
+    parser.add_argument("--cache-size", type=int, default=512, help="Size cap in MB for the result cache (and for the --near-duplicates index)")
+    parser.add_argument("--profile", metavar="TRACE",
+                        help="Record per-stage timings and counters and write them to TRACE as JSON lines")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="With --profile, also record each stage's peak memory (tracemalloc, slower)")
+    parser.add_argument("--cprofile", metavar="STATS",
+                        help="Run under cProfile, save the stats to STATS and print the top functions")
+    parser.add_argument("--download-resources", action="store_true",
+                        help="Download the required NLTK data (needs network access) before processing")
+
     args = parser.parse_args()
-    
-    process_document(args.file_path, args.output, args.clos, args.skills)
+
+    # A single plain file keeps the original single-document behaviour
+    single_file = len(args.inputs) == 1 and not args.manifest and os.path.isfile(args.inputs[0])
+
+    if args.stream and args.cluster:
+        parser.error("--cluster needs the token stream and cannot be combined with --stream")
+    if args.keyphrases and args.cluster:
+        parser.error("--cluster counts single words and cannot be combined with --keyphrases")
+    if args.stream and (args.ground_verbs or args.domain_phrases):
+        parser.error("--ground-verbs needs the token stream and cannot be combined with --stream")
+    if args.stream and args.rerank_model:
+        parser.error("--rerank-model needs the document text and cannot be combined with --stream")
+    if args.near_duplicates is not None:
+        if args.stream:
+            parser.error("--near-duplicates needs the token stream and cannot be combined with --stream")
+        if not args.cache_dir:
+            parser.error("--near-duplicates stores its index in the cache and needs --cache-dir")
+        if not 0.0 < args.near_duplicates <= 1.0:
+            parser.error("--near-duplicates threshold must be between 0 and 1")
+    if args.corpus_tfidf:
+        if args.stream or args.keyphrases:
+            parser.error("--corpus-tfidf ranks single words from the token stream and cannot be combined "
+                         "with --stream or --keyphrases")
+        if args.rerank_model or args.near_duplicates is not None:
+            parser.error("--corpus-tfidf replaces the per-document keyword ranking and cannot be combined "
+                         "with --rerank-model or --near-duplicates")
+        if args.sync or args.watch is not None:
+            parser.error("--corpus-tfidf ranks keywords across a whole batch and cannot be combined "
+                         "with --sync or --watch")
+        if single_file:
+            parser.error("--corpus-tfidf ranks keywords across a whole batch and needs a directory, "
+                         "glob pattern, manifest or several documents, not a single file")
+    if args.rerank_model and not os.path.isdir(args.rerank_model):
+        parser.error(f"embedding model directory not found: {args.rerank_model}")
+
+    if args.download_resources:
+        ensure_nltk_resources(download=True)
+        print("NLTK resources are installed")
+        if not args.inputs and not args.manifest:
+            return
+
+    pipeline_options = {
+        'seed': args.seed,
+        'processor_options': {
+            'pdf_workers': args.pdf_workers,
+            'count_workers': args.count_workers,
+            'max_pages': args.max_pages,
+            'tokenizer': args.tokenizer,
+            'memory_budget': args.memory_budget * 1024 * 1024
+        },
+        'cache_dir': args.cache_dir,
+        'cache_max_bytes': args.cache_size * 1024 * 1024,
+        'streaming': args.stream,
+        'clustering': args.cluster,
+        'verb_grounding': args.ground_verbs or bool(args.domain_phrases),
+        'domain_phrases': load_domain_phrases(args.domain_phrases) if args.domain_phrases else None,
+        'keyphrases': args.keyphrases,
+        'rerank_model': args.rerank_model,
+        'near_duplicate_threshold': args.near_duplicates,
+        # Sink records carry per-stage timings, so a sink turns stage timing on too
+        'instrumentation': Instrumentation(enabled=bool(args.profile or args.sink),
+                                           trace_memory=bool(args.profile) and args.profile_memory)
+    }
+
+    if not args.inputs and not args.manifest:
+        parser.error("at least one document, directory, glob pattern or --manifest is required")
+
+    # With a sink, per-document text reports are only written when asked for
+    output_dir = args.output if args.output or args.sink else "output"
+
+    params_key = None
+    if args.sync or args.watch is not None:
+        # Documents processed by another pipeline version or with other options are processed again
+        params_key = CLOPipeline(**pipeline_options).params_key(args.clos, args.skills)
+
+    with contextlib.ExitStack() as stack:
+        if args.profile:
+            pipeline_options['trace_file'] = stack.enter_context(open(args.profile, 'w', encoding='utf-8'))
+        if args.cprofile:
+            stack.enter_context(cprofiled(args.cprofile))
+        if args.sink:
+            try:
+                pipeline_options['sink'] = stack.enter_context(open_sink(args.sink))
+            except (ValueError, ImportError) as e:
+                parser.error(str(e))
+
+        if args.sync or args.watch is not None:
+            index = FileIndex(args.index)
+            stack.callback(index.close)
+            sync_options = dict(pipeline_options, num_clos=args.clos, num_skills=args.skills,
+                                workers=args.workers, manifest=args.manifest, settle=args.settle,
+                                params_key=params_key)
+            if args.watch is not None:
+                watch_documents(index, args.inputs, output_dir, interval=args.watch, **sync_options)
+            else:
+                sync_documents(index, args.inputs, output_dir, **sync_options)
+            return
+
+        if single_file:
+            process_document(args.inputs[0], output_dir, args.clos, args.skills, **pipeline_options)
+            return
+
+        file_paths = collect_documents(args.inputs, manifest=args.manifest)
+        if not file_paths:
+            parser.error("no supported documents found")
+
+        process_corpus(file_paths, output_dir, args.clos, args.skills, workers=args.workers,
+                       corpus_tfidf=args.corpus_tfidf, **pipeline_options)
 
 if __name__ == "__main__":
     main()
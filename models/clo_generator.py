@@ -4,41 +4,168 @@ This module uses NLP techniques to generate Course Learning Outcomes (CLOs) from
 """
 
 import re
+import zlib
 import random
+from utils.phrase_matcher import PhraseMatcher
+from utils.text_normalizer import normalize_text
+
+# CLO templates, built once at import time instead of on every call
+CLO_TEMPLATES = (
+    "Upon successful completion of this course, students will be able to {verb} {main_keyword} and related concepts such as {supporting_keywords}.",
+    "After completing this course, students will be able to {verb} {main_keyword} including {supporting_keywords}.",
+    "Students will be able to {verb} {main_keyword} and {supporting_keywords} upon completion of this course.",
+    "Upon successful completion of this course, students will be able to {verb} the principles of {main_keyword} in relation to {supporting_keywords}.",
+    "After completing this course, students will be able to {verb} how {main_keyword} relates to {supporting_keywords}.",
+    "Students will be able to {verb} the concepts of {main_keyword} and {supporting_keywords} upon completion of this course.",
+    "Upon successful completion of this course, students will be able to {verb} {main_keyword} techniques to solve problems related to {supporting_keywords}.",
+    "After completing this course, students will be able to {verb} {main_keyword} in various contexts involving {supporting_keywords}.",
+    "Students will be able to {verb} {main_keyword} principles to address challenges in {supporting_keywords}.",
+    "Upon successful completion of this course, students will be able to {verb} {main_keyword} systems in terms of {supporting_keywords}.",
+    "After completing this course, students will be able to {verb} the relationships between {main_keyword} and {supporting_keywords}.",
+    "Students will be able to {verb} {main_keyword} components and their connections to {supporting_keywords}."
+)
+
+# Bound format methods of the templates, so rendering skips the attribute lookup
+_TEMPLATE_FORMATTERS = tuple(template.format for template in CLO_TEMPLATES)
+
+# Most educational content falls into the cognitive domain
+DOMAIN_WEIGHTS = (0.9, 0.05, 0.05)
+
+# Action verbs indexed by Bloom's taxonomy level, each verb under one level only
+BLOOM_VERBS = {
+    'remember': (
+        'define', 'describe', 'identify', 'know', 'label', 'list', 'match', 'name',
+        'outline', 'recall', 'recognize', 'select', 'state', 'memorize', 'repeat',
+        'record', 'relate', 'reproduce', 'retrieve'
+    ),
+    'understand': (
+        'comprehend', 'convert', 'defend', 'distinguish', 'estimate', 'explain', 'extend',
+        'generalize', 'give examples', 'infer', 'interpret', 'paraphrase', 'predict',
+        'rewrite', 'summarize', 'translate', 'classify', 'discuss', 'illustrate', 'report',
+        'express', 'locate'
+    ),
+    'apply': (
+        'apply', 'change', 'compute', 'construct', 'demonstrate', 'discover', 'manipulate',
+        'modify', 'operate', 'prepare', 'produce', 'show', 'solve', 'use', 'implement',
+        'execute', 'complete', 'examine', 'experiment', 'calculate', 'practice'
+    ),
+    'analyze': (
+        'analyze', 'break down', 'compare', 'contrast', 'diagram', 'deconstruct',
+        'differentiate', 'discriminate', 'separate', 'categorize', 'criticize', 'question',
+        'test', 'inspect', 'debate'
+    ),
+    'evaluate': (
+        'appraise', 'argue', 'assess', 'attach', 'choose', 'evaluate', 'judge', 'rate',
+        'support', 'value', 'critique', 'justify', 'measure', 'recommend', 'review', 'score',
+        'coordinate', 'prioritize', 'monitor', 'verify'
+    ),
+    'create': (
+        'assemble', 'create', 'design', 'develop', 'formulate', 'generate', 'hypothesize',
+        'invent', 'make', 'originate', 'plan', 'write', 'compose', 'devise', 'forecast',
+        'organize', 'propose', 'set up', 'synthesize', 'compile', 'author', 'investigate'
+    )
+}
+
+# Past and -ing forms of verbs that the regular suffix rules in _verb_forms get wrong
+_IRREGULAR_FORMS = {
+    'break': ('broke', 'broken', 'breaking'),
+    'choose': ('chose', 'chosen', 'choosing'),
+    'diagram': ('diagrammed', 'diagramming'),
+    'forecast': ('forecasting',),
+    'give': ('gave', 'given', 'giving'),
+    'infer': ('inferred', 'inferring'),
+    'know': ('knew', 'known', 'knowing'),
+    'label': ('labeled', 'labelled', 'labeling', 'labelling'),
+    'make': ('made', 'making'),
+    'plan': ('planned', 'planning'),
+    'rewrite': ('rewrote', 'rewritten', 'rewriting'),
+    'set': ('setting',),
+    'show': ('showed', 'shown', 'showing'),
+    'write': ('wrote', 'written', 'writing')
+}
+
+# Verbs that are common nouns as well ('a test plan', 'the design')
+_NOUN_VERBS = frozenset((
+    'list', 'test', 'design', 'plan', 'use', 'value', 'record', 'report', 'change',
+    'review', 'score', 'support', 'measure', 'match', 'name', 'state', 'question',
+    'experiment', 'practice', 'diagram', 'rate', 'forecast', 'debate', 'outline',
+    'label', 'contrast', 'author', 'show'
+))
+
+# Words after which the base form of a noun verb is a verb ('able to design', 'will test')
+_VERB_CONTEXT = ('to', 'will', 'can', 'could', 'should', 'must', 'may', 'might', 'shall', 'would')
+
+# Number of keywords grouped into each CLO
+KEYWORDS_PER_CLO = 5
+
+# Weyl sequence increment of the SplitMix64 generator
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def _splitmix64(values):
+    """Apply the SplitMix64 finalizer to an array of uint64 values."""
+    import numpy as np
+
+    with np.errstate(over='ignore'):
+        z = values + np.uint64(_GOLDEN_GAMMA)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _third_person(head):
+    """Return the third-person singular of a one-word verb."""
+    if head.endswith(('s', 'x', 'z', 'ch', 'sh')):
+        return head + 'es'
+    if head.endswith('y') and head[-2:-1] not in 'aeiou':
+        return head[:-1] + 'ies'
+    return head + 's'
+
+
+def _verb_forms(verb):
+    """
+    Return the phrases that count as a use of a (possibly multi-word) verb.
+
+    Regular inflections are built with suffix rules, and _IRREGULAR_FORMS covers
+    the verbs those rules get wrong. The base form of a verb in _NOUN_VERBS only
+    counts after a verb context word ('to design'), and its -s form not at all,
+    since 'designs' is far more often a plural noun. A noun right after 'to'
+    ('introduction to design') is still counted as a verb.
+    """
+    head, _, rest = verb.partition(' ')
+    forms = set()
+    if head in _IRREGULAR_FORMS:
+        forms.update(_IRREGULAR_FORMS[head])
+    elif head.endswith('e'):
+        forms.update((head + 'd', head[:-1] + 'ing'))
+    elif head.endswith('y') and head[-2:-1] not in 'aeiou':
+        forms.update((head[:-1] + 'ied', head + 'ing'))
+    else:
+        forms.update((head + 'ed', head + 'ing'))
+
+    if head in _NOUN_VERBS:
+        forms.update(f"{context} {head}" for context in _VERB_CONTEXT)
+    else:
+        forms.update((head, _third_person(head)))
+    return [f"{form} {rest}" if rest else form for form in sorted(forms)]
 
 class CLOGenerator:
     """Class for generating CLOs from course content."""
 
-    def __init__(self):
-        """Initialize the CLO generator with action verbs."""
-        # Define action verbs for CLOs
-        self.action_verbs = [
-            # Knowledge and Understanding
-            'define', 'describe', 'identify', 'know', 'label', 'list', 'match', 'name',
-            'outline', 'recall', 'recognize', 'select', 'state', 'memorize', 'repeat',
-            'record', 'relate', 'reproduce', 'retrieve', 'comprehend', 'convert', 'defend',
-            'distinguish', 'estimate', 'explain', 'extend', 'generalize', 'give examples',
-            'infer', 'interpret', 'paraphrase', 'predict', 'rewrite', 'summarize', 'translate',
-            'classify', 'discuss', 'illustrate', 'recognize', 'report', 'express', 'locate',
-
-            # Application and Analysis
-            'apply', 'change', 'compute', 'construct', 'demonstrate', 'discover', 'manipulate',
-            'modify', 'operate', 'predict', 'prepare', 'produce', 'relate', 'show', 'solve',
-            'use', 'implement', 'execute', 'complete', 'examine', 'classify', 'experiment',
-            'calculate', 'illustrate', 'practice', 'analyze', 'break down', 'compare', 'contrast',
-            'diagram', 'deconstruct', 'differentiate', 'discriminate', 'distinguish', 'identify',
-            'illustrate', 'infer', 'outline', 'relate', 'select', 'separate', 'categorize',
-            'criticize', 'experiment', 'question', 'test', 'examine', 'inspect', 'debate',
-
-            # Evaluation and Creation
-            'appraise', 'argue', 'assess', 'attach', 'choose', 'compare', 'defend', 'estimate',
-            'evaluate', 'judge', 'predict', 'rate', 'select', 'support', 'value', 'critique',
-            'justify', 'measure', 'recommend', 'review', 'score', 'coordinate', 'prioritize',
-            'monitor', 'verify', 'assemble', 'construct', 'create', 'design', 'develop',
-            'formulate', 'generate', 'hypothesize', 'invent', 'make', 'originate', 'plan',
-            'produce', 'write', 'compose', 'devise', 'forecast', 'organize', 'propose',
-            'set up', 'synthesize', 'compile', 'author', 'investigate'
-        ]
+    def __init__(self, domain_phrases=None):
+        """
+        Initialize the CLO generator with action verbs.
+
+        Args:
+            domain_phrases (list): Optional domain vocabulary reported by scan_content
+        """
+        # Action verbs, each listed once, in Bloom level order
+        self.action_verbs = [verb for verbs in BLOOM_VERBS.values() for verb in verbs]
+        self.verb_levels = {verb: level for level, verbs in BLOOM_VERBS.items() for verb in verbs}
+
+        # Multi-word domain phrases to look for in the content, e.g. 'machine learning'
+        self.domain_phrases = tuple(domain_phrases or ())
+        self._phrase_matcher = None
 
         # Educational domains
         self.domains = ['cognitive', 'affective', 'psychomotor']
@@ -50,10 +177,7 @@ class CLOGenerator:
         Returns:
             str: Educational domain
         """
-        # Most educational content falls into the cognitive domain
-        domain_weights = [0.9, 0.05, 0.05]  # Higher weight for cognitive domain
-
-        return random.choices(self.domains, weights=domain_weights, k=1)[0]
+        return random.choices(self.domains, weights=DOMAIN_WEIGHTS, k=1)[0]
 
     def _get_clo_template(self):
         """
@@ -62,74 +186,219 @@ class CLOGenerator:
         Returns:
             str: CLO template
         """
-        templates = [
-            "Upon successful completion of this course, students will be able to {verb} {main_keyword} and related concepts such as {supporting_keywords}.",
-            "After completing this course, students will be able to {verb} {main_keyword} including {supporting_keywords}.",
-            "Students will be able to {verb} {main_keyword} and {supporting_keywords} upon completion of this course.",
-            "Upon successful completion of this course, students will be able to {verb} the principles of {main_keyword} in relation to {supporting_keywords}.",
-            "After completing this course, students will be able to {verb} how {main_keyword} relates to {supporting_keywords}.",
-            "Students will be able to {verb} the concepts of {main_keyword} and {supporting_keywords} upon completion of this course.",
-            "Upon successful completion of this course, students will be able to {verb} {main_keyword} techniques to solve problems related to {supporting_keywords}.",
-            "After completing this course, students will be able to {verb} {main_keyword} in various contexts involving {supporting_keywords}.",
-            "Students will be able to {verb} {main_keyword} principles to address challenges in {supporting_keywords}.",
-            "Upon successful completion of this course, students will be able to {verb} {main_keyword} systems in terms of {supporting_keywords}.",
-            "After completing this course, students will be able to {verb} the relationships between {main_keyword} and {supporting_keywords}.",
-            "Students will be able to {verb} {main_keyword} components and their connections to {supporting_keywords}."
-        ]
+        return random.choice(CLO_TEMPLATES)
+
+    def _select_action_verb(self, preferred_verbs=None):
+        """Select a random action verb, from the preferred verbs when there are any."""
+        return random.choice(preferred_verbs or self.action_verbs)
+
+    def _get_phrase_matcher(self):
+        """Compile the verb and domain phrase automaton on first use."""
+        if self._phrase_matcher is None:
+            matcher = PhraseMatcher()
+            for verb in self.action_verbs:
+                for form in _verb_forms(verb):
+                    matcher.add(form, verb, 'verb')
+            for phrase in self.domain_phrases:
+                matcher.add(normalize_text(phrase), phrase, 'phrase')
+            matcher.compile()
+            self._phrase_matcher = matcher
+        return self._phrase_matcher
+
+    def scan_content(self, tokens):
+        """
+        Find the action verbs and domain phrases the content already uses.
+
+        All verbs (including inflected and multi-word forms such as 'breaking down')
+        and domain phrases are matched in one linear pass over the tokens.
 
-        return random.choice(templates)
+        Args:
+            tokens (iterable): Preprocessed tokens, with stopwords kept so phrases
+                like 'set up' stay intact
 
-    def _select_action_verb(self):
-        """Select a random action verb."""
-        return random.choice(self.action_verbs)
+        Returns:
+            dict: 'action_verbs' and 'domain_phrases', each mapping the phrase to its
+                number of occurrences, most frequent first
+        """
+        counts = self._get_phrase_matcher().count(tokens)
+        found = {'verb': {}, 'phrase': {}}
+        for (phrase, label), count in counts.most_common():
+            found[label][phrase] = count
+        return {'action_verbs': found['verb'], 'domain_phrases': found['phrase']}
 
-    def generate_clos(self, keywords, num_clos=5):
+    def verbs_by_level(self, verbs):
+        """
+        Group action verbs by their Bloom's taxonomy level.
+
+        Args:
+            verbs (iterable): Action verbs, e.g. from scan_content
+
+        Returns:
+            dict: Bloom level -> verbs at that level, in the given order
+        """
+        levels = {level: [] for level in BLOOM_VERBS}
+        for verb in verbs:
+            levels[self.verb_levels[verb]].append(verb)
+        return levels
+
+    def _group_keywords(self, keywords, num_clos):
+        """
+        Group keywords into related concepts, one group per CLO.
+
+        Args:
+            keywords (list): List of keywords extracted from the course content
+            num_clos (int): Number of CLOs to generate
+
+        Returns:
+            list: Keyword groups
+        """
+        # Consecutive slices by rank; KeywordClusterer groups by co-occurrence instead
+        return [keywords[i:i+KEYWORDS_PER_CLO]
+                for i in range(0, min(len(keywords), num_clos*KEYWORDS_PER_CLO), KEYWORDS_PER_CLO)]
+
+    def _render_clo(self, formatter, action_verb, domain, keyword_group):
+        """Render one CLO from a template formatter and its drawn verb and domain."""
+        main_keyword = keyword_group[0]
+        supporting_keywords = ', '.join(keyword_group[1:]) if len(keyword_group) > 1 else "related concepts"
+
+        return {
+            'clo': formatter(
+                verb=action_verb,
+                main_keyword=main_keyword,
+                supporting_keywords=supporting_keywords
+            ),
+            'action_verb': action_verb,
+            'domain': domain,
+            'keywords': keyword_group
+        }
+
+    def generate_clos(self, keywords, num_clos=5, seed=None, keyword_groups=None, preferred_verbs=None):
         """
         Generate Course Learning Outcomes (CLOs) based on the extracted keywords.
 
         Args:
             keywords (list): List of keywords extracted from the course content
             num_clos (int): Number of CLOs to generate
+            seed (int): Seed for reproducible output (None uses the global random module)
+            keyword_groups (list): Precomputed groups of related keywords, e.g. from
+                KeywordClusterer.group_keywords (defaults to consecutive slices)
+            preferred_verbs (list): Action verbs to choose from, e.g. the verbs found by
+                scan_content (defaults to all action verbs)
 
         Returns:
             list: Generated CLOs
         """
+        if seed is not None:
+            groups = None if keyword_groups is None else [keyword_groups]
+            verbs = None if preferred_verbs is None else [preferred_verbs]
+            return self.generate_clos_batch([keywords], num_clos=num_clos, seed=seed,
+                                            keyword_groups=groups, preferred_verbs=verbs)[0]
+
         clos = []
 
         # Group keywords into related concepts
-        # In a real implementation, this would use more sophisticated clustering
-        keyword_groups = [keywords[i:i+5] for i in range(0, min(len(keywords), num_clos*5), 5)]
+        if keyword_groups is None:
+            keyword_groups = self._group_keywords(keywords, num_clos)
+        keyword_groups = keyword_groups[:num_clos]
 
-        for i, keyword_group in enumerate(keyword_groups[:num_clos]):
+        for keyword_group in keyword_groups:
             # Select an action verb
-            action_verb = self._select_action_verb()
+            action_verb = self._select_action_verb(preferred_verbs)
 
             # Get a CLO template
             template = self._get_clo_template()
 
-            # Create a CLO
-            main_keyword = keyword_group[0]
-            supporting_keywords = ', '.join(keyword_group[1:]) if len(keyword_group) > 1 else "related concepts"
-
-            # Format the CLO using the template
-            clo = template.format(
-                verb=action_verb,
-                main_keyword=main_keyword,
-                supporting_keywords=supporting_keywords
-            )
-
             # Determine the domain (mostly cognitive for academic content)
             domain = self._get_domain()
 
-            clos.append({
-                'clo': clo,
-                'action_verb': action_verb,
-                'domain': domain,
-                'keywords': keyword_group
-            })
+            clos.append(self._render_clo(template.format, action_verb, domain, keyword_group))
 
         return clos
 
+    def generate_clos_batch(self, keyword_lists, num_clos=5, seed=0, keyword_groups=None,
+                            preferred_verbs=None):
+        """
+        Generate CLOs for many documents in one call, reproducibly.
+
+        Every document gets its own random stream, seeded from the batch seed and
+        a checksum of the document's keywords, so identical keywords and seed
+        always give identical CLOs wherever the document sits in the batch. The
+        streams are counter-based (SplitMix64), which lets all verbs, templates
+        and domains for the whole batch be drawn with a few vectorized NumPy
+        operations, and keeps output stable across NumPy versions.
+
+        Args:
+            keyword_lists (list): One list of keywords per document
+            num_clos (int): Number of CLOs to generate per document
+            seed (int): Batch seed
+            keyword_groups (list): Optional precomputed keyword groups per document
+            preferred_verbs (list): Optional action verbs to choose from per document
+                (an empty list falls back to all action verbs)
+
+        Returns:
+            list: One list of generated CLOs per document
+
+        Raises:
+            ValueError: If keyword_groups or preferred_verbs does not have one entry
+                per document
+        """
+        import numpy as np
+
+        if keyword_groups is not None and len(keyword_groups) != len(keyword_lists):
+            raise ValueError(f"Got keyword groups for {len(keyword_groups)} documents, "
+                             f"but keywords for {len(keyword_lists)}")
+        if preferred_verbs is not None and len(preferred_verbs) != len(keyword_lists):
+            raise ValueError(f"Got preferred verbs for {len(preferred_verbs)} documents, "
+                             f"but keywords for {len(keyword_lists)}")
+
+        if keyword_groups is None:
+            groups_per_document = [self._group_keywords(keywords, num_clos) for keywords in keyword_lists]
+        else:
+            groups_per_document = [groups[:num_clos] for groups in keyword_groups]
+        counts = np.fromiter((len(groups) for groups in groups_per_document), dtype=np.int64,
+                             count=len(groups_per_document))
+        document_keys = np.fromiter(
+            (zlib.crc32('\x1f'.join(keywords).encode('utf-8')) for keywords in keyword_lists),
+            dtype=np.uint64, count=len(keyword_lists)
+        )
+
+        # One slot per CLO: its document's seed and its position within the document
+        batch_seed = _splitmix64(np.full(1, seed & 0xFFFFFFFFFFFFFFFF, dtype=np.uint64))
+        document_seeds = _splitmix64(document_keys ^ batch_seed)
+        slot_seeds = np.repeat(document_seeds, counts)
+        document_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        slot_index = (np.arange(counts.sum()) - document_starts).astype(np.uint64)
+
+        def draw(field, size):
+            # Independent uniform draw per slot and field, scaled to [0, size)
+            with np.errstate(over='ignore'):
+                bits = _splitmix64(slot_seeds + (slot_index * np.uint64(3) + np.uint64(field)) * np.uint64(_GOLDEN_GAMMA))
+            return ((bits >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53)) * size)
+
+        # Each document draws verbs from its own pool
+        verb_pools = [verbs or self.action_verbs for verbs in (preferred_verbs or [None] * len(keyword_lists))]
+        pool_sizes = np.repeat(np.fromiter((len(pool) for pool in verb_pools), dtype=np.float64,
+                                           count=len(verb_pools)), counts)
+        verb_ids = draw(0, pool_sizes).astype(np.int64).tolist()
+        template_ids = draw(1, len(_TEMPLATE_FORMATTERS)).astype(np.int64).tolist()
+        domain_thresholds = np.cumsum(DOMAIN_WEIGHTS) / sum(DOMAIN_WEIGHTS)
+        domain_ids = np.searchsorted(domain_thresholds, draw(2, 1.0), side='right').tolist()
+
+        # Render from the precompiled template tables
+        domains = self.domains
+        render = self._render_clo
+        batch = []
+        slot = 0
+        for document_groups, action_verbs in zip(groups_per_document, verb_pools):
+            clos = []
+            for keyword_group in document_groups:
+                clos.append(render(_TEMPLATE_FORMATTERS[template_ids[slot]], action_verbs[verb_ids[slot]],
+                                   domains[domain_ids[slot]], keyword_group))
+                slot += 1
+            batch.append(clos)
+
+        return batch
+
     def extract_skills(self, keywords, clos, num_skills=10):
         """
         Extract relevant skills based on the keywords and generated CLOs.
@@ -0,0 +1,129 @@
+"""
+Keyword Clustering Module
+This module groups related keywords by how often they appear near each other in
+the course content, so each CLO covers a coherent set of concepts.
+"""
+
+import warnings
+
+
+class KeywordClusterer:
+    """Class for clustering keywords on a sparse windowed co-occurrence matrix."""
+
+    def __init__(self, window=5, random_state=0):
+        """
+        Initialize the keyword clusterer.
+
+        Args:
+            window (int): Two keywords co-occur if they are at most this many tokens apart
+            random_state (int): Seed for the spectral clustering, for reproducible groups
+        """
+        self.window = window
+        self.random_state = random_state
+
+    def cooccurrence_matrix(self, words, keywords):
+        """
+        Count windowed co-occurrences between keywords in a single pass over the tokens.
+
+        Args:
+            words (list): Filtered token stream of the document
+            keywords (list): Keywords to build the matrix for
+
+        Returns:
+            scipy.sparse.csr_matrix: Symmetric keywords x keywords co-occurrence counts
+        """
+        import numpy as np
+        from scipy import sparse
+
+        index = {keyword: i for i, keyword in enumerate(keywords)}
+        token_ids = np.fromiter((index.get(word, -1) for word in words), dtype=np.int64, count=len(words))
+
+        # Only keyword positions matter; gaps between them are measured in the original stream
+        positions = np.flatnonzero(token_ids >= 0)
+        ids = token_ids[positions]
+
+        rows, columns = [], []
+        for offset in range(1, self.window + 1):
+            if offset >= len(ids):
+                break
+            # Pairs of keyword occurrences 'offset' keyword-positions apart that fall in the window
+            near = (positions[offset:] - positions[:-offset]) <= self.window
+            left, right = ids[:-offset][near], ids[offset:][near]
+            distinct = left != right
+            rows.append(left[distinct])
+            columns.append(right[distinct])
+
+        size = len(keywords)
+        if not rows:
+            return sparse.csr_matrix((size, size))
+
+        rows = np.concatenate(rows)
+        columns = np.concatenate(columns)
+        counts = sparse.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(size, size))
+        return (counts + counts.T).tocsr()
+
+    def group_keywords(self, keywords, words, num_groups, group_size=5):
+        """
+        Group keywords into clusters of related terms.
+
+        A cluster larger than group_size keeps its best keywords and passes the
+        rest, best first, to the group with room they co-occur with most, so
+        every candidate ends up in exactly one group.
+
+        Args:
+            keywords (list): Keywords, best first
+            words (list): Filtered token stream of the document
+            num_groups (int): Number of groups to form
+            group_size (int): Maximum number of keywords per group
+
+        Returns:
+            list: Keyword groups ordered by their best keyword, each ordered by rank
+        """
+        candidates = keywords[:num_groups * group_size]
+        num_groups = min(num_groups, len(candidates))
+        if num_groups < 2 or len(candidates) <= num_groups:
+            return [candidates[i:i+group_size] for i in range(0, len(candidates), group_size)]
+
+        cooccurrence = self.cooccurrence_matrix(words, candidates)
+        labels = self._cluster(cooccurrence, num_groups)
+
+        clusters = {}
+        for rank, label in enumerate(labels):
+            clusters.setdefault(label, []).append(rank)
+
+        # Move the overflow of full clusters to the open group it co-occurs with most
+        # (the first one on ties); groups hold candidate ranks until the end
+        groups = [ranks[:group_size] for ranks in clusters.values()]
+        overflow = sorted(rank for ranks in clusters.values() for rank in ranks[group_size:])
+        if overflow:
+            cooccurrence = cooccurrence.toarray()
+        for rank in overflow:
+            open_groups = [group for group in groups if len(group) < group_size]
+            if open_groups:
+                max(open_groups, key=lambda group: cooccurrence[rank, group].sum()).append(rank)
+            else:
+                groups.append([rank])
+
+        # Each group ordered by rank, and the groups by their best keyword
+        ordered = sorted(sorted(group) for group in groups)
+        return [[candidates[rank] for rank in group] for group in ordered]
+
+    def _cluster(self, cooccurrence, num_groups):
+        """Spectral clustering on the normalized co-occurrence affinity matrix."""
+        import numpy as np
+        from scipy import sparse
+        from sklearn.cluster import SpectralClustering
+
+        # Association strength: co-occurrences relative to each keyword's overall
+        # co-occurrence volume, so frequent keywords do not absorb every cluster.
+        # Self-loops keep isolated keywords from having zero degree.
+        degree = np.asarray(cooccurrence.sum(axis=1)).ravel()
+        scale = sparse.diags(1.0 / np.sqrt(np.maximum(degree, 1.0)))
+        affinity = (scale @ cooccurrence @ scale + sparse.identity(cooccurrence.shape[0])).tocsr()
+
+        model = SpectralClustering(n_clusters=num_groups, affinity='precomputed',
+                                   assign_labels='cluster_qr', random_state=self.random_state)
+        with warnings.catch_warnings():
+            # Keywords that never co-occur leave the graph disconnected, which is expected
+            warnings.simplefilter('ignore', UserWarning)
+            return model.fit_predict(affinity).tolist()
@@ -0,0 +1,295 @@
+"""
+Keyword Re-ranker Module
+This module re-ranks candidate keywords by their semantic centrality to the
+document, using a sentence-embedding model loaded from a local directory.
+
+Frequency alone favours generic words that happen to be repeated; a keyword
+whose embedding is close to the embedding of the document as a whole is more
+likely to name what the course is about. Candidates and document chunks are
+embedded on the CPU with mean pooling over the attention mask, in batches sized
+by a token budget so that short keywords are packed densely and long chunks do
+not blow up memory. The model is loaded once per process and never touches the
+network; term embeddings can be cached on disk with an EmbeddingCache.
+"""
+
+import os
+import hashlib
+
+import numpy as np
+from utils.instrumentation import Instrumentation
+
+# Padded tokens per model call; batches of short keywords hold more texts
+DEFAULT_MAX_BATCH_TOKENS = 8192
+
+# Longest input, in model tokens; longer texts are truncated
+DEFAULT_MAX_LENGTH = 128
+
+# Words per document chunk, and the most chunks embedded per document
+DEFAULT_CHUNK_WORDS = 96
+DEFAULT_MAX_CHUNKS = 32
+
+# Loaded (tokenizer, model, framework) per model directory, shared by every
+# re-ranker in the process
+_MODELS = {}
+
+
+def model_fingerprint(model_path):
+    """
+    Identify a model directory by the names, sizes and modification times of its files.
+
+    The fingerprint changes whenever the model files are replaced, so cached
+    embeddings of an older model are never reused.
+
+    Args:
+        model_path (str): Model directory
+
+    Returns:
+        str: Hex digest identifying the model files
+
+    Raises:
+        ValueError: If the directory does not exist
+    """
+    if not os.path.isdir(model_path):
+        raise ValueError(f"Embedding model directory not found: {model_path}")
+
+    digest = hashlib.sha256()
+    for directory, subdirectories, file_names in os.walk(model_path):
+        subdirectories.sort()
+        for file_name in sorted(file_names):
+            path = os.path.join(directory, file_name)
+            stat = os.stat(path)
+            digest.update(f"{os.path.relpath(path, model_path)}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_model(model_path):
+    """
+    Load a tokenizer and encoder model from a local directory, once per process.
+
+    PyTorch is used when it is installed; otherwise the TensorFlow model class
+    is used, which needs transformers<5 (later releases dropped TensorFlow).
+
+    Args:
+        model_path (str): Directory with the saved tokenizer and model
+
+    Returns:
+        tuple: (tokenizer, model, framework), framework being 'pt' or 'tf'
+
+    Raises:
+        ImportError: If transformers, or both PyTorch and TensorFlow support, are missing
+    """
+    key = os.path.abspath(model_path)
+    loaded = _MODELS.get(key)
+    if loaded is not None:
+        return loaded
+
+    try:
+        from transformers import AutoTokenizer
+    except ImportError as e:
+        raise ImportError("Keyword re-ranking needs transformers (pip install transformers)") from e
+
+    tokenizer = AutoTokenizer.from_pretrained(key, local_files_only=True)
+    try:
+        import torch
+    except ImportError:
+        torch = None
+
+    if torch is not None:
+        from transformers import AutoModel
+        model = AutoModel.from_pretrained(key, local_files_only=True)
+        model.eval()
+        framework = 'pt'
+    else:
+        try:
+            from transformers import TFAutoModel
+        except ImportError as e:
+            raise ImportError("Keyword re-ranking needs PyTorch (pip install torch), "
+                              "or TensorFlow with transformers<5") from e
+        model = TFAutoModel.from_pretrained(key, local_files_only=True)
+        framework = 'tf'
+
+    loaded = _MODELS[key] = (tokenizer, model, framework)
+    return loaded
+
+
+def plan_batches(lengths, max_batch_tokens=DEFAULT_MAX_BATCH_TOKENS):
+    """
+    Group texts into batches whose padded size stays within a token budget.
+
+    Texts are taken longest first, so each batch is padded to the length of its
+    first text and similar lengths end up together.
+
+    Args:
+        lengths (list): Token count of each text
+        max_batch_tokens (int): Largest batch size times padded length
+
+    Returns:
+        list: Batches, each a list of text indices
+    """
+    batches = []
+    batch = []
+    for index in sorted(range(len(lengths)), key=lambda i: -lengths[i]):
+        if batch and (len(batch) + 1) * lengths[batch[0]] > max_batch_tokens:
+            batches.append(batch)
+            batch = []
+        batch.append(index)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def mean_pool(hidden_states, attention_mask):
+    """
+    Average token embeddings over the attention mask and normalize the result.
+
+    Args:
+        hidden_states (numpy.ndarray): Token embeddings, (batch, tokens, dimensions)
+        attention_mask (numpy.ndarray): 1 for real tokens and 0 for padding, (batch, tokens)
+
+    Returns:
+        numpy.ndarray: Unit-length text embeddings, (batch, dimensions)
+    """
+    mask = attention_mask[:, :, None].astype(np.float32)
+    summed = (hidden_states * mask).sum(axis=1)
+    vectors = summed / np.maximum(mask.sum(axis=1), 1.0)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+class KeywordReranker:
+    """Class for re-ranking keywords by embedding similarity to their document."""
+
+    def __init__(self, model_path, cache=None, max_batch_tokens=DEFAULT_MAX_BATCH_TOKENS,
+                 max_length=DEFAULT_MAX_LENGTH, chunk_words=DEFAULT_CHUNK_WORDS,
+                 max_chunks=DEFAULT_MAX_CHUNKS, instrumentation=None):
+        """
+        Initialize the re-ranker; the model itself is loaded on first use.
+
+        Args:
+            model_path (str): Local directory with a saved tokenizer and encoder model
+            cache (EmbeddingCache): On-disk cache of term embeddings (None disables it)
+            max_batch_tokens (int): Padded tokens per model call
+            max_length (int): Longest input in model tokens
+            chunk_words (int): Words per document chunk
+            max_chunks (int): Most chunks embedded per document, spread evenly over it
+            instrumentation (Instrumentation): Counts the embeddings computed and cached
+
+        Raises:
+            ValueError: If the model directory does not exist
+        """
+        self.model_path = model_path
+        self.model_id = model_fingerprint(model_path)
+        self.cache = cache
+        self.max_batch_tokens = max_batch_tokens
+        self.max_length = max_length
+        self.chunk_words = chunk_words
+        self.max_chunks = max_chunks
+        self.instrumentation = instrumentation or Instrumentation()
+
+    def _run_model(self, model, framework, input_ids, attention_mask):
+        """Return the last hidden states of one padded batch as a NumPy array."""
+        if framework == 'pt':
+            import torch
+            with torch.inference_mode():
+                output = model(input_ids=torch.from_numpy(input_ids),
+                               attention_mask=torch.from_numpy(attention_mask))
+            return output[0].float().numpy()
+        output = model(input_ids=input_ids, attention_mask=attention_mask, training=False)
+        return output[0].numpy()
+
+    def encode(self, texts):
+        """
+        Embed texts with the model, bypassing the cache.
+
+        Args:
+            texts (list): Texts to embed
+
+        Returns:
+            numpy.ndarray: Unit-length embeddings, one row per text
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        tokenizer, model, framework = load_model(self.model_path)
+        token_ids = tokenizer(list(texts), truncation=True, max_length=self.max_length)['input_ids']
+        pad_id = tokenizer.pad_token_id or 0
+
+        embeddings = None
+        batches = plan_batches([len(ids) for ids in token_ids], self.max_batch_tokens)
+        for batch in batches:
+            width = len(token_ids[batch[0]])
+            input_ids = np.full((len(batch), width), pad_id, dtype=np.int64)
+            attention_mask = np.zeros((len(batch), width), dtype=np.int64)
+            for row, index in enumerate(batch):
+                ids = token_ids[index]
+                input_ids[row, :len(ids)] = ids
+                attention_mask[row, :len(ids)] = 1
+
+            vectors = mean_pool(self._run_model(model, framework, input_ids, attention_mask), attention_mask)
+            if embeddings is None:
+                embeddings = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            embeddings[batch] = vectors
+
+        self.instrumentation.count('embedding_batches', len(batches))
+        return embeddings
+
+    def embed_terms(self, terms):
+        """
+        Embed keywords, reusing and filling the embedding cache.
+
+        Args:
+            terms (list): Distinct keywords
+
+        Returns:
+            numpy.ndarray: Unit-length embeddings, one row per term
+        """
+        cached = self.cache.get_many(self.model_id, terms) if self.cache is not None else {}
+        missing = [term for term in terms if term not in cached]
+        if missing:
+            computed = dict(zip(missing, self.encode(missing)))
+            if self.cache is not None:
+                self.cache.put_many(self.model_id, computed)
+            cached.update(computed)
+
+        self.instrumentation.count('embeddings_cached', len(terms) - len(missing))
+        self.instrumentation.count('embeddings_computed', len(missing))
+        return np.stack([cached[term] for term in terms])
+
+    def document_chunks(self, text):
+        """
+        Split a document into word windows, keeping at most max_chunks spread evenly over it.
+
+        Args:
+            text (str): Document text
+
+        Returns:
+            list: Chunk texts in document order
+        """
+        words = text.split()
+        starts = range(0, len(words), self.chunk_words)
+        if len(starts) > self.max_chunks:
+            starts = [starts[i] for i in np.linspace(0, len(starts) - 1, self.max_chunks).round().astype(int)]
+        return [" ".join(words[start:start + self.chunk_words]) for start in starts]
+
+    def rerank(self, keywords, text):
+        """
+        Order keywords by cosine similarity to the centroid of the document's chunks.
+
+        Keywords with equal similarity keep their original (frequency) order.
+
+        Args:
+            keywords (list): Distinct candidate keywords, most frequent first
+            text (str): Document text
+
+        Returns:
+            list: The same keywords, most central first
+        """
+        keywords = list(keywords)
+        chunks = self.document_chunks(text)
+        if len(keywords) < 2 or not chunks:
+            return keywords
+
+        centroid = self.encode(chunks).mean(axis=0)
+        centroid /= max(np.linalg.norm(centroid), 1e-12)
+        scores = self.embed_terms(keywords) @ centroid
+        return [keywords[i] for i in np.argsort(-scores, kind='stable')]
@@ -0,0 +1,691 @@
+"""
+Pipeline Module
+This module runs the full document-to-CLO pipeline, either for a single document
+or for a whole corpus spread across a pool of worker processes.
+"""
+
+import os
+import glob
+import json
+import time
+import hashlib
+import itertools
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from utils.document_processor import DocumentProcessor
+from utils.instrumentation import Instrumentation
+from utils.result_cache import DEFAULT_MAX_BYTES, ResultCache, file_digest, text_digest
+from models.clo_generator import KEYWORDS_PER_CLO, CLOGenerator
+from models.keyword_clustering import KeywordClusterer
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt')
+
+# Documents submitted per batch worker at a time; finished results are handed
+# back before more are submitted, so memory stays flat however large the batch
+DOCUMENTS_IN_FLIGHT_PER_WORKER = 4
+
+# Candidates extracted per keyword kept when keywords are re-ranked by embedding
+RERANK_CANDIDATES_PER_KEYWORD = 3
+
+# Documents added to the corpus TF-IDF matrix at a time
+TFIDF_FIT_BLOCK = 256
+
+# Distinct tokens a processor's vocabulary may hold before it is cleared; counting
+# a document allocates arrays of the vocabulary's size, so a long-lived worker
+# must not keep every token it has ever seen
+MAX_VOCABULARY_SIZE = 1 << 18
+
+# Part of every cache key; bump whenever a stage's output changes so stale
+# cached results are ignored
+PIPELINE_VERSION = 5
+
+
+class CLOPipeline:
+    """Class for running the CLO pipeline with reusable processors."""
+
+    def __init__(self, top_n=30, seed=None, processor_options=None, cache_dir=None,
+                 cache_max_bytes=DEFAULT_MAX_BYTES, streaming=False, clustering=False,
+                 verb_grounding=False, domain_phrases=None, keyphrases=False, rerank_model=None,
+                 near_duplicate_threshold=None, instrumentation=None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            top_n (int): Number of keywords to extract per document
+            seed (int): Random seed for reproducible CLOs (None for random output)
+            processor_options (dict): Keyword arguments for the DocumentProcessor
+            cache_dir (str): Directory for the persistent result cache (None disables caching)
+            cache_max_bytes (int): Size cap for the result cache, and for the near-duplicate index
+            streaming (bool): Count keywords chunk by chunk straight from the extractor,
+                so memory grows with the vocabulary instead of the document length
+            clustering (bool): Group keywords for each CLO by co-occurrence instead of rank
+            verb_grounding (bool): Scan the content for action verbs and domain phrases, and
+                prefer the verbs the author already uses
+            domain_phrases (list): Multi-word domain phrases to report from the content scan
+            keyphrases (bool): Extract multi-word keyphrases ("machine learning") instead of
+                single keywords
+            rerank_model (str): Local directory of a sentence-embedding model; when given,
+                more candidates are extracted and the top_n closest in meaning to the
+                document are kept (term embeddings are cached under cache_dir)
+            near_duplicate_threshold (float): Reuse the result of an already processed
+                document whose estimated Jaccard similarity is at least this (indexed
+                under cache_dir and capped at cache_max_bytes; None disables near-duplicate
+                detection)
+            instrumentation (Instrumentation): Records stage timings and counters (disabled
+                by default)
+
+        Raises:
+            ValueError: If clustering, verb grounding, re-ranking or near-duplicate
+                detection is combined with streaming, which keeps no token stream or
+                text, if clustering is combined with keyphrases, which never occur in
+                the single-word stream it counts, if near-duplicate detection has no
+                cache_dir, or if the re-ranking model directory does not exist
+        """
+        if streaming and clustering:
+            raise ValueError("Keyword clustering needs the token stream and cannot be combined with streaming")
+        if keyphrases and clustering:
+            raise ValueError("Keyword clustering counts single words and cannot be combined with keyphrases")
+        if streaming and verb_grounding:
+            raise ValueError("Verb grounding needs the token stream and cannot be combined with streaming")
+        if streaming and rerank_model:
+            raise ValueError("Keyword re-ranking needs the document text and cannot be combined with streaming")
+        if near_duplicate_threshold is not None:
+            if streaming:
+                raise ValueError("Near-duplicate detection needs the token stream and cannot be combined with streaming")
+            if not cache_dir:
+                raise ValueError("Near-duplicate detection stores its index in the cache directory, which is not set")
+
+        self.top_n = top_n
+        self.seed = seed
+        self.streaming = streaming
+        self.clusterer = KeywordClusterer() if clustering else None
+        self.verb_grounding = verb_grounding
+        self.keyphrases = keyphrases
+        self.domain_phrases = list(domain_phrases or [])
+        self.instrumentation = instrumentation or Instrumentation()
+        self.processor_options = processor_options or {}
+        self.doc_processor = DocumentProcessor(instrumentation=self.instrumentation, **self.processor_options)
+        self.clo_generator = CLOGenerator(domain_phrases=self.domain_phrases)
+        self.cache = None
+        if cache_dir:
+            self.cache = ResultCache(cache_dir, max_bytes=cache_max_bytes, version=PIPELINE_VERSION)
+        self.reranker = None
+        if rerank_model:
+            # Imported here, since the re-ranker loads NumPy
+            from models.keyword_reranker import KeywordReranker
+            from utils.embedding_cache import EmbeddingCache
+
+            self.reranker = KeywordReranker(rerank_model,
+                                            cache=EmbeddingCache(cache_dir) if cache_dir else None,
+                                            instrumentation=self.instrumentation)
+        self.near_duplicates = None
+        if near_duplicate_threshold is not None:
+            # Imported here, since the index loads NumPy
+            from utils.near_duplicates import NearDuplicateIndex
+
+            self.near_duplicates = NearDuplicateIndex(cache_dir, threshold=near_duplicate_threshold,
+                                                      max_bytes=cache_max_bytes)
+        # Keywords extracted by frequency, before any re-ranking cuts them to top_n
+        self.candidate_n = top_n * RERANK_CANDIDATES_PER_KEYWORD if self.reranker else top_n
+
+    def _cached(self, digest, stage, compute, **params):
+        """Return a stage's output from the cache, computing and storing it on a miss."""
+        if self.cache is None:
+            return compute()
+
+        key = self.cache.make_key(digest, stage, **params)
+        value = self.cache.get(key, stage)
+        if value is None:
+            value = compute()
+            self.cache.put(key, stage, value)
+        return value
+
+    def process_file(self, file_path, num_clos=5, num_skills=10, verbose=False, corpus_keywords=None):
+        """
+        Run every pipeline stage on a single document.
+
+        With a cache configured, each stage is looked up by the document's content
+        hash first, so unchanged documents are never reprocessed.
+
+        Args:
+            file_path (str): Path to the document file
+            num_clos (int): Number of CLOs to generate
+            num_skills (int): Number of skills to extract
+            verbose (bool): Print a message as each stage starts
+            corpus_keywords (list): Keywords ranked across a corpus (see rank_corpus_keywords),
+                used instead of the document's own frequency ranking
+
+        Returns:
+            dict: Keywords, CLOs, skills and processing seconds for the document, plus
+                the content scan when verb grounding is enabled and the trace events
+                when instrumented
+        """
+        instrumentation = self.instrumentation
+        start = time.perf_counter()
+        with instrumentation.document(file_path):
+            with instrumentation.stage('file_digest'):
+                digest = file_digest(file_path) if self.cache is not None else None
+
+            result = self._cached(
+                digest, 'result',
+                lambda: self._run_stages(file_path, digest, num_clos, num_skills, verbose,
+                                         corpus_keywords=corpus_keywords),
+                **self._result_params(num_clos, num_skills, corpus_keywords)
+            )
+        result['file_path'] = file_path
+        result['seconds'] = time.perf_counter() - start
+        if instrumentation.enabled:
+            result['trace'] = instrumentation.drain()
+        return result
+
+    def process_text(self, text, num_clos=5, num_skills=10):
+        """
+        Run the pipeline stages on raw text instead of a document file.
+
+        Args:
+            text (str): Raw course content
+            num_clos (int): Number of CLOs to generate
+            num_skills (int): Number of skills to extract
+
+        Returns:
+            dict: Keywords, CLOs and skills for the text, as for process_file
+        """
+        instrumentation = self.instrumentation
+        with instrumentation.document(None):
+            digest = text_digest(text) if self.cache is not None else None
+            result = self._cached(
+                digest, 'result',
+                lambda: self._run_stages(None, digest, num_clos, num_skills, False, text=text),
+                **self._result_params(num_clos, num_skills)
+            )
+        if instrumentation.enabled:
+            result['trace'] = instrumentation.drain()
+        return result
+
+    def term_counts(self, file_path):
+        """
+        Count the keyword candidates of a document, for ranking keywords across a corpus.
+
+        Args:
+            file_path (str): Path to the document file
+
+        Returns:
+            collections.Counter: Frequency of each filtered word long enough to be a keyword
+        """
+        digest = file_digest(file_path) if self.cache is not None else None
+        words = self._filtered_words(self._extract_text(file_path, digest, False), digest, False)
+        min_length = self.doc_processor.vocabulary.min_length
+        return Counter(word for word in words if len(word) >= min_length)
+
+    def _result_params(self, num_clos, num_skills, corpus_keywords=None):
+        """Parameters that, with the content digest, identify a cached final result."""
+        params = {
+            'top_n': self.top_n, 'num_clos': num_clos, 'num_skills': num_skills, 'seed': self.seed,
+            'clustering': self.clusterer is not None, 'verb_grounding': self.verb_grounding,
+            'domain_phrases': self.domain_phrases, 'keyphrases': self.keyphrases,
+            'processor_options': self.processor_options,
+            'rerank_model': self.reranker.model_id if self.reranker else None,
+            'near_duplicate_threshold': self.near_duplicates.threshold if self.near_duplicates is not None else None
+        }
+        if corpus_keywords is not None:
+            params['corpus_keywords'] = list(corpus_keywords)
+        return params
+
+    def params_key(self, num_clos, num_skills):
+        """Digest of the pipeline version and result parameters, shared by every document."""
+        material = json.dumps([PIPELINE_VERSION, self._result_params(num_clos, num_skills)], sort_keys=True)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _extract_text(self, file_path, digest, verbose):
+        """Extract the text of a document, reusing the cached text."""
+        if verbose:
+            print(f"Processing document: {file_path}")
+        with self.instrumentation.stage('extract_text'):
+            return self._cached(digest, 'text',
+                                lambda: self.doc_processor.extract_text_from_file(file_path),
+                                processor_options=self.processor_options)
+
+    def _preprocess_text(self, text, verbose):
+        """Normalize the text before tokenization."""
+        if verbose:
+            print("Preprocessing text...")
+        with self.instrumentation.stage('preprocess_text'):
+            return self.doc_processor.preprocess_text(text)
+
+    def _filtered_words(self, text, digest, verbose):
+        """Tokenize the text into filtered words, reusing the cached word list."""
+        instrumentation = self.instrumentation
+
+        def filtered_words():
+            preprocessed = self._preprocess_text(text, verbose)
+
+            # Tokenize the text
+            if verbose:
+                print("Tokenizing text...")
+            # Only the words are needed, so the text is never split into sentences
+            with instrumentation.stage('tokenize_text'):
+                return self.doc_processor.tokenize_words(preprocessed)
+
+        words = self._cached(digest, 'words', filtered_words, processor_options=self.processor_options)
+        instrumentation.count('tokens', len(words))
+        return words
+
+    def _extract_keywords(self, text, digest, verbose, words=None):
+        """Extract the keywords of the text, from the filtered words if they are already known."""
+        options = self.processor_options
+        instrumentation = self.instrumentation
+
+        def keywords_from_ids():
+            # Large texts are normalized, tokenized and counted shard by shard across workers
+            if self.doc_processor.counts_in_parallel(text):
+                if verbose:
+                    print("Counting keywords across worker processes...")
+                with instrumentation.stage('parallel_count'):
+                    return self.doc_processor.extract_keywords_parallel(text, top_n=self.candidate_n)
+
+            preprocessed = self._preprocess_text(text, verbose)
+
+            # Token IDs are only meaningful with this process's vocabulary, so they
+            # are counted straight away rather than cached
+            if verbose:
+                print("Tokenizing text...")
+            with instrumentation.stage('tokenize_text'):
+                token_ids = self.doc_processor.tokenize_ids(preprocessed)
+            instrumentation.count('tokens', len(self.doc_processor.vocabulary.content_ids(token_ids)))
+
+            if verbose:
+                print("Extracting keywords...")
+            with instrumentation.stage('extract_keywords'):
+                keywords = self.doc_processor.extract_keywords_from_ids(token_ids, top_n=self.candidate_n)
+
+            # The IDs are not used past this document, so the vocabulary can start afresh
+            vocabulary = self.doc_processor.vocabulary
+            if len(vocabulary) > MAX_VOCABULARY_SIZE:
+                vocabulary.clear()
+            return keywords
+
+        if self.keyphrases or words is not None:
+            if verbose:
+                print("Extracting keywords...")
+            if self.keyphrases:
+                # Phrases are bounded by stopwords, so they come from the unfiltered tokens
+                extract = lambda: self.doc_processor.extract_keyphrases(
+                    self.doc_processor.tokenizer.tokenize_words(self.doc_processor.preprocess_text(text)),
+                    top_n=self.candidate_n
+                )
+            else:
+                extract = lambda: self.doc_processor.extract_keywords(words, top_n=self.candidate_n)
+            with instrumentation.stage('extract_keywords'):
+                return self._cached(digest, 'keywords', extract, top_n=self.candidate_n,
+                                    keyphrases=self.keyphrases, processor_options=options)
+
+        # Count vocabulary IDs with bincount instead of a Counter of strings
+        return self._cached(digest, 'keywords', keywords_from_ids, top_n=self.candidate_n,
+                            keyphrases=self.keyphrases, processor_options=options)
+
+    def _run_stages(self, file_path, digest, num_clos, num_skills, verbose, text=None, corpus_keywords=None):
+        """Run the individual pipeline stages, reusing any cached intermediate results."""
+        options = self.processor_options
+        instrumentation = self.instrumentation
+
+        words = None
+        signature = None
+        if corpus_keywords is not None:
+            # Keywords ranked across the corpus replace the document's own ranking
+            keywords = list(corpus_keywords)
+            if text is None and (self.verb_grounding or self.clusterer is not None):
+                text = self._extract_text(file_path, digest, verbose)
+            if self.clusterer is not None:
+                words = self._filtered_words(text, digest, verbose)
+        # Text that is already in memory gains nothing from streaming
+        elif self.streaming and text is None:
+            # Stream text through normalization, tokenization and counting in one pass
+            if verbose:
+                print(f"Streaming keywords from document: {file_path}")
+            if self.keyphrases:
+                stream = self.doc_processor.stream_keyphrases
+            else:
+                stream = self.doc_processor.stream_keywords
+            with instrumentation.stage('stream_keywords'):
+                keywords = self._cached(digest, 'keywords', lambda: stream(file_path, top_n=self.top_n),
+                                        top_n=self.top_n, keyphrases=self.keyphrases, processor_options=options)
+        else:
+            # Extract text from the document, unless the text was passed in directly
+            if text is None:
+                text = self._extract_text(file_path, digest, verbose)
+            instrumentation.count('characters', len(text))
+
+            # Only keyword clustering and near-duplicate detection need the filtered words themselves
+            if self.clusterer is not None or self.near_duplicates is not None:
+                words = self._filtered_words(text, digest, verbose)
+
+            # Reuse the result of an indexed document with nearly the same words
+            if self.near_duplicates is not None:
+                with instrumentation.stage('find_near_duplicate'):
+                    signature = self.near_duplicates.minhasher.signature(words)
+                    params_key = self.params_key(num_clos, num_skills)
+                    match = self.near_duplicates.find(signature, params_key) if signature is not None else None
+                if match is not None:
+                    original_path, similarity, result = match
+                    instrumentation.count('near_duplicates')
+                    result['near_duplicate_of'] = original_path
+                    result['similarity'] = similarity
+                    return result
+
+            keywords = self._extract_keywords(text, digest, verbose, words=words)
+
+        # Keep the candidates closest in meaning to the document as a whole
+        if self.reranker is not None and corpus_keywords is None:
+            if verbose:
+                print("Re-ranking keywords...")
+            with instrumentation.stage('rerank_keywords'):
+                keywords = self._cached(
+                    digest, 'reranked_keywords',
+                    lambda: self.reranker.rerank(keywords, text)[:self.top_n],
+                    top_n=self.top_n, candidates=self.candidate_n, keyphrases=self.keyphrases,
+                    rerank_model=self.reranker.model_id, processor_options=options
+                )
+        instrumentation.count('keywords', len(keywords))
+
+        # Find the action verbs and domain phrases the author already uses
+        content_scan = None
+        preferred_verbs = None
+        if self.verb_grounding:
+            if verbose:
+                print("Scanning content for action verbs and domain phrases...")
+            with instrumentation.stage('scan_content'):
+                content_scan = self._cached(
+                    digest, 'content_scan',
+                    lambda: self.clo_generator.scan_content(self.doc_processor.preprocess_text(text).split()),
+                    domain_phrases=self.domain_phrases, processor_options=options
+                )
+            preferred_verbs = list(content_scan['action_verbs'])
+
+        # Group related keywords for each CLO
+        keyword_groups = None
+        if self.clusterer is not None:
+            if verbose:
+                print("Clustering keywords...")
+            with instrumentation.stage('cluster_keywords'):
+                keyword_groups = self.clusterer.group_keywords(keywords, words, num_clos,
+                                                               group_size=KEYWORDS_PER_CLO)
+
+        # Generate CLOs, seeded per document so batch and single-file runs match
+        if verbose:
+            print(f"Generating {num_clos} CLOs...")
+        with instrumentation.stage('generate_clos'):
+            clos = self.clo_generator.generate_clos(keywords, num_clos=num_clos, seed=self.seed,
+                                                    keyword_groups=keyword_groups,
+                                                    preferred_verbs=preferred_verbs)
+
+        # Extract skill sets
+        if verbose:
+            print(f"Extracting {num_skills} skills...")
+        with instrumentation.stage('extract_skills'):
+            skills = self.clo_generator.extract_skills(keywords, clos, num_skills=num_skills)
+
+        result = {
+            'keywords': keywords,
+            'clos': clos,
+            'skills': skills
+        }
+        if content_scan is not None:
+            result['content_scan'] = content_scan
+        if signature is not None:
+            # Raw text has no path, so later matches name it by its digest
+            self.near_duplicates.add(signature, params_key, file_path if file_path is not None else digest, result)
+        return result
+
+
+def read_manifest(manifest):
+    """
+    Read the document paths listed in a manifest.
+
+    Args:
+        manifest (str): File listing one document path per line
+
+    Returns:
+        list: Listed paths, relative entries resolved against the manifest location
+    """
+    manifest_dir = os.path.dirname(os.path.abspath(manifest))
+    paths = []
+    with open(manifest, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            # Skip blank lines and comments
+            if not line or line.startswith('#'):
+                continue
+            # Relative manifest entries are resolved against the manifest location
+            if not os.path.isabs(line):
+                line = os.path.join(manifest_dir, line)
+            paths.append(line)
+    return paths
+
+
+def collect_documents(inputs, manifest=None):
+    """
+    Expand files, directories, glob patterns and a manifest into document paths.
+
+    Args:
+        inputs (list): File paths, directories or glob patterns
+        manifest (str): Optional file listing one document path per line
+
+    Returns:
+        list: Sorted, de-duplicated list of supported document paths
+    """
+    candidates = []
+
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                candidates.extend(os.path.join(root, name) for name in files)
+        elif glob.has_magic(item):
+            candidates.extend(glob.glob(item, recursive=True))
+        else:
+            candidates.append(item)
+
+    if manifest:
+        candidates.extend(read_manifest(manifest))
+
+    documents = set()
+    for path in candidates:
+        if os.path.isfile(path) and os.path.splitext(path)[1].lower() in SUPPORTED_EXTENSIONS:
+            documents.add(os.path.normpath(path))
+
+    return sorted(documents)
+
+
+# Pipeline instance owned by each worker process, built once by _init_worker
+_worker_pipeline = None
+
+
+def _init_worker(pipeline_options):
+    """Build the processors once per worker process."""
+    global _worker_pipeline
+    _worker_pipeline = CLOPipeline(**pipeline_options)
+
+
+def _process_in_worker(file_path, num_clos, num_skills, corpus_keywords=None):
+    """Process one document with the worker's pipeline, capturing any error."""
+    try:
+        return _worker_pipeline.process_file(file_path, num_clos=num_clos, num_skills=num_skills,
+                                             corpus_keywords=corpus_keywords)
+    except Exception as e:
+        return {'file_path': file_path, 'error': f"{type(e).__name__}: {e}"}
+
+
+def _count_terms_in_worker(file_path):
+    """Count one document's keyword candidates with the worker's pipeline, capturing any error."""
+    try:
+        return {'file_path': file_path, 'term_counts': _worker_pipeline.term_counts(file_path)}
+    except Exception as e:
+        return {'file_path': file_path, 'error': f"{type(e).__name__}: {e}"}
+
+
+def _process_jobs_in_worker(jobs):
+    """
+    Process a micro-batch of service jobs with the worker's pipeline.
+
+    Args:
+        jobs (list): (kind, payload, num_clos, num_skills) tuples, where kind is
+            'text' (payload is raw text) or 'file' (payload is a file path)
+
+    Returns:
+        list: One result per job, in order, with an 'error' key if it failed
+    """
+    results = []
+    for kind, payload, num_clos, num_skills in jobs:
+        try:
+            if kind == 'text':
+                results.append(_worker_pipeline.process_text(payload, num_clos=num_clos, num_skills=num_skills))
+            else:
+                results.append(_worker_pipeline.process_file(payload, num_clos=num_clos, num_skills=num_skills))
+        except Exception as e:
+            results.append({'error': f"{type(e).__name__}: {e}"})
+    return results
+
+
+def _map_documents(file_paths, workers, pipeline_options, submit):
+    """
+    Run one task per document across a pool of worker processes.
+
+    Only a few documents per worker are in flight at a time, and results are
+    yielded in completion order.
+
+    Args:
+        file_paths (list): Paths of the documents
+        workers (int): Number of worker processes (defaults to the CPU count)
+        pipeline_options (dict): Keyword arguments for each worker's CLOPipeline
+        submit (callable): submit(executor, path) submits the task of one document
+
+    Yields:
+        The result of each task
+    """
+    if not file_paths:
+        return
+
+    workers = min(workers or os.cpu_count() or 1, len(file_paths))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(pipeline_options,)) as executor:
+        paths = iter(file_paths)
+        pending = {submit(executor, path)
+                   for path in itertools.islice(paths, workers * DOCUMENTS_IN_FLIGHT_PER_WORKER)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for path in itertools.islice(paths, 1):
+                    pending.add(submit(executor, path))
+                yield future.result()
+
+
+def process_batch(file_paths, num_clos=5, num_skills=10, workers=None, corpus_keywords=None,
+                  **pipeline_options):
+    """
+    Process many documents across a pool of worker processes.
+
+    Results are yielded as soon as each document finishes, so they arrive in
+    completion order rather than input order. Only a few documents per worker
+    are in flight at a time, so finished results are never accumulated.
+
+    Args:
+        file_paths (list): Paths of the documents to process
+        num_clos (int): Number of CLOs to generate per document
+        num_skills (int): Number of skills to extract per document
+        workers (int): Number of worker processes (defaults to the CPU count)
+        corpus_keywords (dict): Path -> keywords ranked across the corpus, from
+            rank_corpus_keywords (documents without an entry rank their own keywords)
+        **pipeline_options: Keyword arguments for each worker's CLOPipeline
+
+    Yields:
+        dict: Result for one document, with an 'error' key if it failed
+    """
+    corpus_keywords = corpus_keywords or {}
+
+    def submit(executor, path):
+        return executor.submit(_process_in_worker, path, num_clos, num_skills, corpus_keywords.get(path))
+
+    yield from _map_documents(file_paths, workers, pipeline_options, submit)
+
+
+def rank_corpus_keywords(file_paths, workers=None, **pipeline_options):
+    """
+    Rank the keywords of every document by TF-IDF across the whole batch.
+
+    Worker processes count each document's keyword candidates; the counts are
+    added to a sparse document-term matrix block by block, so terms that appear
+    in most documents (such as "course" or "students") rank below the terms
+    that set a document apart.
+
+    Args:
+        file_paths (list): Paths of the documents in the batch
+        workers (int): Number of worker processes (defaults to the CPU count)
+        **pipeline_options: Keyword arguments for each worker's CLOPipeline
+
+    Returns:
+        dict: Path -> top_n keywords, for every document that could be counted
+    """
+    # Imported here, since the engine loads NumPy, SciPy and scikit-learn
+    from utils.keyword_engine import CorpusKeywordEngine
+
+    engine = CorpusKeywordEngine()
+    counted_paths = []
+    block = []
+
+    def submit(executor, path):
+        return executor.submit(_count_terms_in_worker, path)
+
+    for result in _map_documents(file_paths, workers, pipeline_options, submit):
+        # Failed documents fail again, with their error reported, when they are processed
+        if 'error' in result:
+            continue
+        counted_paths.append(result['file_path'])
+        block.append(result['term_counts'])
+        if len(block) >= TFIDF_FIT_BLOCK:
+            engine.partial_fit(block)
+            block = []
+    if block:
+        engine.partial_fit(block)
+
+    top_n = pipeline_options.get('top_n', 30)
+    return dict(zip(counted_paths, engine.top_keywords(top_n=top_n)))
+
+
+class ProgressReporter:
+    """Class for reporting batch progress and throughput."""
+
+    def __init__(self, total):
+        """
+        Initialize the progress reporter.
+
+        Args:
+            total (int): Total number of documents in the batch
+        """
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.start_time = time.perf_counter()
+
+    @property
+    def docs_per_second(self):
+        """Throughput so far, in documents per second."""
+        elapsed = time.perf_counter() - self.start_time
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def update(self, result):
+        """Record a finished document and print a progress line."""
+        self.done += 1
+        status = "ok"
+        if 'near_duplicate_of' in result:
+            status = f"ok (near-duplicate of {result['near_duplicate_of']}, similarity {result['similarity']:.2f})"
+        if 'error' in result:
+            self.failed += 1
+            status = f"FAILED ({result['error']})"
+        print(f"[{self.done}/{self.total}] {result['file_path']}: {status} "
+              f"| {self.docs_per_second:.2f} docs/sec")
+
+    def summary(self):
+        """Print the final batch summary."""
+        elapsed = time.perf_counter() - self.start_time
+        print(f"\nProcessed {self.done} documents ({self.failed} failed) in {elapsed:.2f}s "
+              f"| {self.docs_per_second:.2f} docs/sec")
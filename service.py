@@ -0,0 +1,501 @@
+"""
+Service Module
+This module runs the CLO pipeline as a long-running local HTTP service, so other
+tools can send text or documents without paying interpreter and NLTK start-up
+for every document.
+
+Requests are queued in a bounded queue (a full queue is answered with 503 and
+Retry-After), grouped into micro-batches by a batcher thread, and processed by a
+pool of worker processes that each keep a warm CLOPipeline.
+
+Endpoints:
+    POST /process                 JSON {"text": ..., "num_clos": 5, "num_skills": 10}
+    POST /upload?filename=x.pdf   Raw document bytes (num_clos/num_skills as query parameters)
+    GET  /metrics                 Queue depth, batch sizes, latency percentiles and throughput
+    GET  /health                  Liveness check
+
+Usage:
+    python service.py --port 8765 --workers 4
+"""
+
+import os
+import json
+import time
+import queue
+import signal
+import argparse
+import tempfile
+import contextlib
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from pipeline import SUPPORTED_EXTENSIONS, _init_worker, _process_jobs_in_worker
+from utils.resources import ensure_nltk_resource
+
+# Upper bound for the number of CLOs or skills a request may ask for
+MAX_ITEMS_PER_REQUEST = 50
+
+
+def _init_service_worker(pipeline_options):
+    """Build the worker's pipeline; Ctrl+C is left to the server, which drains the workers."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _init_worker(pipeline_options)
+
+
+class ServiceMetrics:
+    """Class for tracking request counts, batch sizes, latency and throughput."""
+
+    def __init__(self, window=1000):
+        """
+        Initialize the metrics.
+
+        Args:
+            window (int): Number of recent requests used for latency percentiles and throughput
+        """
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+        self.received = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.batches = 0
+        self.batched_jobs = 0
+        self.latencies = deque(maxlen=window)
+        self.completion_times = deque(maxlen=window)
+
+    def record_received(self):
+        """Count an incoming processing request."""
+        with self.lock:
+            self.received += 1
+
+    def record_rejected(self):
+        """Count a request turned away because the queue was full."""
+        with self.lock:
+            self.rejected += 1
+
+    def record_batch(self, size):
+        """Count a micro-batch sent to the worker pool."""
+        with self.lock:
+            self.batches += 1
+            self.batched_jobs += size
+
+    def record_done(self, latency, failed=False):
+        """Count a finished request and its queue-to-result latency in seconds."""
+        with self.lock:
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+            self.latencies.append(latency)
+            self.completion_times.append(time.time())
+
+    def snapshot(self, queue_depth):
+        """
+        Summarize the metrics.
+
+        Args:
+            queue_depth (int): Number of requests currently waiting
+
+        Returns:
+            dict: Counters, average batch size, latency percentiles (ms) and throughput
+        """
+        with self.lock:
+            latencies = sorted(self.latencies)
+            completion_times = list(self.completion_times)
+            snapshot = {
+                'uptime_seconds': round(time.time() - self.start_time, 3),
+                'received': self.received,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'queue_depth': queue_depth,
+                'batches': self.batches,
+                'average_batch_size': round(self.batched_jobs / self.batches, 2) if self.batches else 0.0
+            }
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000, 2)
+
+        snapshot['latency_ms'] = {'p50': percentile(0.5), 'p95': percentile(0.95), 'p99': percentile(0.99)}
+
+        # Throughput over the recent window of completions
+        span = completion_times[-1] - completion_times[0] if len(completion_times) > 1 else 0.0
+        snapshot['requests_per_second'] = round((len(completion_times) - 1) / span, 2) if span > 0 else 0.0
+        return snapshot
+
+
+class BatchingWorkerPool:
+    """Class for micro-batching queued jobs onto a pool of warm pipeline workers."""
+
+    def __init__(self, pipeline_options, metrics, workers=None, batch_size=8, batch_wait=0.01,
+                 max_queue=64):
+        """
+        Start the worker processes and the batcher thread.
+
+        Args:
+            pipeline_options (dict): Keyword arguments for each worker's CLOPipeline
+            metrics (ServiceMetrics): Metrics to update
+            workers (int): Number of worker processes (defaults to the CPU count)
+            batch_size (int): Maximum number of jobs per micro-batch
+            batch_wait (float): Seconds to wait for more jobs before sending a partial batch
+            max_queue (int): Maximum number of waiting jobs; further jobs are rejected
+        """
+        self.metrics = metrics
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.jobs = queue.Queue(maxsize=max_queue)
+
+        # At most two batches per worker in flight, so excess load stays in the
+        # bounded queue (and is rejected there) instead of piling up in the pool
+        self.in_flight = threading.BoundedSemaphore(self.workers * 2)
+        self.pipeline_options = pipeline_options
+        self.executor = self._start_executor()
+        self._warm_up()
+
+        self.closed = False
+        self.batcher = threading.Thread(target=self._run, name="batcher", daemon=True)
+        self.batcher.start()
+
+    def _start_executor(self):
+        """Start a pool of worker processes that each build a pipeline."""
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_service_worker,
+                                   initargs=(self.pipeline_options,))
+
+    def _warm_up(self):
+        """Start every worker and run a tiny job, so the first requests do not pay start-up."""
+        warm_up_job = [('text', "Students will analyze course content.", 1, 1)]
+        for future in [self.executor.submit(_process_jobs_in_worker, warm_up_job) for _ in range(self.workers)]:
+            future.result()
+
+    def submit(self, kind, payload, num_clos=5, num_skills=10):
+        """
+        Queue a job without blocking.
+
+        Args:
+            kind (str): 'text' or 'file'
+            payload (str): Raw text or a document path
+            num_clos (int): Number of CLOs to generate
+            num_skills (int): Number of skills to extract
+
+        Returns:
+            concurrent.futures.Future: Resolves to the job's result dict
+
+        Raises:
+            queue.Full: If the queue is at capacity
+        """
+        future = Future()
+        self.jobs.put_nowait((future, time.perf_counter(), (kind, payload, num_clos, num_skills)))
+        return future
+
+    @property
+    def queue_depth(self):
+        """Number of jobs waiting to be batched."""
+        return self.jobs.qsize()
+
+    def _next_batch(self):
+        """Block for one job, then collect more until the batch is full or the wait expires."""
+        job = self.jobs.get()
+        if job is None:
+            return None
+        batch = [job]
+        deadline = time.perf_counter() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                job = self.jobs.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if job is None:
+                # Shutting down: finish this batch, then stop
+                self.jobs.put(None)
+                break
+            batch.append(job)
+        return batch
+
+    def _run(self):
+        """Batcher loop: send micro-batches to the worker pool until closed."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self.in_flight.acquire()
+            self.metrics.record_batch(len(batch))
+            try:
+                future = self._submit_batch(batch)
+            except Exception as e:
+                # Fail this batch instead of the batcher thread, which would leave every later request hanging
+                self.in_flight.release()
+                self._fail(batch, e)
+                continue
+            future.add_done_callback(lambda done, batch=batch: self._complete(batch, done))
+
+    def _submit_batch(self, batch):
+        """Send a batch to the worker pool, replacing the pool once if a worker crashed."""
+        jobs = [job for _, _, job in batch]
+        try:
+            return self.executor.submit(_process_jobs_in_worker, jobs)
+        except BrokenProcessPool:
+            self.executor.shutdown(wait=False)
+            self.executor = self._start_executor()
+            return self.executor.submit(_process_jobs_in_worker, jobs)
+
+    def _fail(self, batch, error):
+        """Resolve each job's future of a batch that could not be processed with an error."""
+        finished = time.perf_counter()
+        for future, queued_at, _ in batch:
+            self.metrics.record_done(finished - queued_at, failed=True)
+            future.set_result({'error': f"{type(error).__name__}: {error}"})
+
+    def _complete(self, batch, done):
+        """Resolve each job's future from a finished micro-batch."""
+        self.in_flight.release()
+        try:
+            results = done.result()
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        finished = time.perf_counter()
+        for (future, queued_at, _), result in zip(batch, results):
+            self.metrics.record_done(finished - queued_at, failed='error' in result)
+            future.set_result(result)
+
+    def close(self):
+        """Stop the batcher after the queued jobs and shut the worker pool down."""
+        if self.closed:
+            return
+        self.closed = True
+        self.jobs.put(None)
+        self.batcher.join()
+        self.executor.shutdown(wait=True)
+
+
+class _PayloadTooLarge(Exception):
+    """Raised when a request body exceeds the configured limit."""
+
+
+def _remove_upload(path):
+    """Delete an uploaded document once its job is done."""
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """HTTP request handler for the CLO service."""
+
+    server_version = "CLOService/1.0"
+
+    def do_GET(self):
+        """Serve the health and metrics endpoints."""
+        path = urlparse(self.path).path
+        if path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        elif path == '/metrics':
+            self._send_json(200, self.server.metrics.snapshot(self.server.pool.queue_depth))
+        else:
+            self._send_json(404, {'error': f"Unknown endpoint: {path}"})
+
+    def do_POST(self):
+        """Serve the text processing and document upload endpoints."""
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        try:
+            if url.path == '/process':
+                request = json.loads(self._read_body() or b'{}')
+                text = request.get('text') if isinstance(request, dict) else None
+                if not isinstance(text, str) or not text.strip():
+                    raise ValueError("Request body must be a JSON object with a non-empty 'text' field")
+                self._process('text', text, self._count(request, 'num_clos', 5),
+                              self._count(request, 'num_skills', 10))
+            elif url.path == '/upload':
+                filename = query.get('filename', [''])[0]
+                extension = os.path.splitext(filename)[1].lower()
+                if extension not in SUPPORTED_EXTENSIONS:
+                    self._send_json(415, {'error': f"Unsupported file format: {extension or filename!r} "
+                                                   f"(supported: {', '.join(SUPPORTED_EXTENSIONS)})"})
+                    return
+                self._upload(extension, self._read_body(),
+                             self._count(query, 'num_clos', 5), self._count(query, 'num_skills', 10))
+            else:
+                self._send_json(404, {'error': f"Unknown endpoint: {url.path}"})
+        except _PayloadTooLarge as e:
+            self._send_json(413, {'error': str(e)})
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+
+    def _count(self, params, name, default):
+        """Read a positive integer parameter from a JSON body or parsed query string."""
+        value = params.get(name, default)
+        if isinstance(value, list):
+            value = value[0]
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"'{name}' must be an integer")
+        if not 1 <= value <= MAX_ITEMS_PER_REQUEST:
+            raise ValueError(f"'{name}' must be between 1 and {MAX_ITEMS_PER_REQUEST}")
+        return value
+
+    def _read_body(self):
+        """Read the request body, enforcing the size limit."""
+        length = int(self.headers.get('Content-Length') or 0)
+        if length < 0:
+            raise ValueError("Content-Length must not be negative")
+        if length > self.server.max_body_bytes:
+            raise _PayloadTooLarge(f"Request body exceeds {self.server.max_body_bytes} bytes")
+        return self.rfile.read(length)
+
+    def _upload(self, extension, body, num_clos, num_skills):
+        """Store an uploaded document in a temporary file and process it."""
+        handle, path = tempfile.mkstemp(suffix=extension, dir=self.server.upload_dir)
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                file.write(body)
+        except BaseException:
+            os.remove(path)
+            raise
+        # The job owns the file from here on, so it outlives a 504 while still queued or running
+        self._process('file', path, num_clos, num_skills, cleanup=lambda: _remove_upload(path))
+
+    def _process(self, kind, payload, num_clos, num_skills, cleanup=None):
+        """
+        Queue a job, wait for its result and send it, or reject it when the queue is full.
+
+        cleanup, if given, is called once the job is finished or rejected.
+        """
+        server = self.server
+        server.metrics.record_received()
+        try:
+            future = server.pool.submit(kind, payload, num_clos, num_skills)
+        except queue.Full:
+            server.metrics.record_rejected()
+            if cleanup is not None:
+                cleanup()
+            self._send_json(503, {'error': "Server busy, retry later"}, headers={'Retry-After': '1'})
+            return
+        if cleanup is not None:
+            future.add_done_callback(lambda done: cleanup())
+
+        try:
+            result = future.result(timeout=server.request_timeout)
+        except FutureTimeoutError:
+            self._send_json(504, {'error': f"Processing took longer than {server.request_timeout}s"})
+            return
+
+        result.pop('file_path', None)
+        self._send_json(422 if 'error' in result else 200, result)
+
+    def _send_json(self, status, body, headers=None):
+        """Send a JSON response."""
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Log requests only when the server runs in verbose mode."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class CLOService(ThreadingHTTPServer):
+    """HTTP server that owns the worker pool and metrics for its handlers."""
+
+    daemon_threads = True
+
+    def __init__(self, address, pool, metrics, request_timeout=120.0, max_body_bytes=50 * 1024 * 1024,
+                 verbose=False):
+        """
+        Initialize the server.
+
+        Args:
+            address (tuple): (host, port) to listen on
+            pool (BatchingWorkerPool): Worker pool that processes the jobs
+            metrics (ServiceMetrics): Metrics shared with the pool
+            request_timeout (float): Seconds a request waits for its result before a 504
+            max_body_bytes (int): Largest accepted request body
+            verbose (bool): Log every request
+        """
+        super().__init__(address, ServiceRequestHandler)
+        self.pool = pool
+        self.metrics = metrics
+        self.request_timeout = request_timeout
+        self.max_body_bytes = max_body_bytes
+        self.verbose = verbose
+        self.upload_dir = tempfile.mkdtemp(prefix="clo_uploads_")
+
+    def server_close(self):
+        """Stop listening, then drain and stop the worker pool."""
+        super().server_close()
+        self.pool.close()
+        os.rmdir(self.upload_dir)
+
+
+def main():
+    """Run the CLO pipeline as a local HTTP service."""
+    parser = argparse.ArgumentParser(description="Serve the CLO pipeline over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--workers", "-w", type=int, help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=8, help="Maximum number of requests per micro-batch")
+    parser.add_argument("--batch-wait-ms", type=float, default=10.0,
+                        help="Time to wait for more requests before sending a partial batch")
+    parser.add_argument("--queue-size", type=int, default=64,
+                        help="Maximum number of waiting requests; further requests get 503")
+    parser.add_argument("--request-timeout", type=float, default=120.0, help="Seconds before a request gets 504")
+    parser.add_argument("--max-upload-mb", type=int, default=50, help="Largest accepted request body in MB")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible CLOs")
+    parser.add_argument("--tokenizer", choices=["regex", "nltk"], default="regex", help="Tokenizer backend")
+    parser.add_argument("--keyphrases", action="store_true", help="Extract multi-word keyphrases")
+    parser.add_argument("--cache-dir", help="Directory for the persistent result cache (disabled by default)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    # Fail before starting any worker if the NLTK data is missing
+    ensure_nltk_resource('stopwords')
+    if args.tokenizer == 'nltk':
+        ensure_nltk_resource('punkt')
+
+    pipeline_options = {
+        'seed': args.seed,
+        'processor_options': {'tokenizer': args.tokenizer},
+        'cache_dir': args.cache_dir,
+        'keyphrases': args.keyphrases
+    }
+
+    metrics = ServiceMetrics()
+    pool = BatchingWorkerPool(pipeline_options, metrics, workers=args.workers, batch_size=args.batch_size,
+                              batch_wait=args.batch_wait_ms / 1000, max_queue=args.queue_size)
+    server = CLOService((args.host, args.port), pool, metrics, request_timeout=args.request_timeout,
+                        max_body_bytes=args.max_upload_mb * 1024 * 1024, verbose=args.verbose)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    # Shut down cleanly on SIGTERM as well as Ctrl+C
+    signal.signal(signal.SIGTERM, stop)
+
+    print(f"Serving the CLO pipeline on http://{args.host}:{server.server_port} with {pool.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
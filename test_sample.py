@@ -4,21 +4,25 @@ Test script for the CLO Generator system.
 
 import os
 import sys
-import nltk
-
-# Download necessary NLTK resources
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
-
+from collections import Counter
+from utils.resources import ensure_nltk_resources
 from utils.document_processor import DocumentProcessor
 from models.clo_generator import CLOGenerator
 
+def require_nltk_data(names=('stopwords',)):
+    """Skip the calling test when NLTK data it needs is missing; nothing is downloaded."""
+    try:
+        ensure_nltk_resources(names)
+    except LookupError as error:
+        try:
+            import pytest
+        except ImportError:
+            raise error
+        pytest.skip(f"NLTK data is not installed ({error})")
+
 def test_document_processor():
     """Test the document processor functionality."""
+    require_nltk_data()
     print("Testing DocumentProcessor...")
 
     # Create a test document
@@ -76,10 +80,312 @@ def test_document_processor():
     print("DocumentProcessor tests completed successfully\n")
     return keywords
 
-def test_clo_generator(keywords):
+def test_stream_keywords():
+    """Test that streaming keyword extraction with tiny chunks matches the in-memory pipeline."""
+    import random
+    import tempfile
+
+    require_nltk_data()
+    print("Testing streaming keyword extraction...")
+
+    # Many equally frequent words, so the tie order is checked as well
+    rng = random.Random(0)
+    vocabulary = ['learning', 'the', 'data', 'of', 'model', 'regression', 'na\u00efve',
+                  'r\u00e9sum\u00e9', 'clustering', 'and', 'graph', 'caf\u00e9s', 'neural']
+    lines = []
+    for line_number in range(1000):
+        line_words = rng.sample(vocabulary, len(vocabulary)) + ['graph'] * (line_number % 10 == 0)
+        lines.append(' '.join(word + rng.choice(['', ',', '.', '42']) for word in line_words))
+    text = '\n'.join(lines)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "course.txt")
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+        # A one-byte budget gives the smallest chunks, a few kilobytes each
+        doc_processor = DocumentProcessor(memory_budget=1)
+        assert os.path.getsize(file_path) > 10 * doc_processor.txt_chunk_bytes
+
+        words = doc_processor.tokenize_words(doc_processor.preprocess_text(text))
+        for top_n in (1, 5, len(vocabulary)):
+            streamed = doc_processor.stream_keywords(file_path, top_n=top_n)
+            assert streamed == doc_processor.extract_keywords(words, top_n=top_n), top_n
+        print(f"Streamed keywords: {', '.join(streamed)}")
+
+    print("Streaming keyword extraction tests completed successfully\n")
+
+def test_txt_chunks():
+    """Test that chunked TXT reading splits multi-byte characters without changing the text."""
+    import tempfile
+
+    require_nltk_data()
+    print("Testing chunked TXT reading...")
+
+    doc_processor = DocumentProcessor(memory_budget=1)
+    chunk_bytes = doc_processor.txt_chunk_bytes
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "course.txt")
+        # Two-, three- and four-byte characters, starting one to three bytes before each chunk boundary
+        for character in ('\u00e9', '\u20ac', '\U0001f600'):
+            for offset in range(1, len(character.encode('utf-8'))):
+                text = ('a' * (chunk_bytes - offset) + character + ' word\n') * 3 + character * chunk_bytes
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+
+                chunks = list(doc_processor.iter_txt_chunks(file_path))
+                assert len(chunks) > 3
+                with open(file_path, "r", encoding="utf-8") as f:
+                    assert ''.join(chunks) == f.read()
+                assert ''.join(doc_processor.iter_text_from_file(file_path)) == text
+                assert doc_processor.extract_text_from_file(file_path) == text
+
+        # Empty files yield nothing
+        open(file_path, "w").close()
+        assert list(doc_processor.iter_txt_chunks(file_path)) == []
+
+    print("Chunked TXT reading tests completed successfully\n")
+
+def test_token_ids():
+    """Test that keywords counted as token IDs match the string path, ties included."""
+    try:
+        import numpy
+    except ImportError:
+        print("Skipping token-ID tests (NumPy is not installed)")
+        return
+
+    import pipeline
+    from pipeline import CLOPipeline
+
+    require_nltk_data()
+    print("Testing token-ID keyword extraction...")
+
+    doc_processor = DocumentProcessor()
+    texts = [
+        # Every keyword occurs exactly twice, so only the first-occurrence order ranks them
+        "Zeta graphs and alpha trees; the zeta of alpha graphs trees.",
+        "Learning, learning and machine models: the data beats models of data and learning.",
+        # Words first seen in earlier documents get older (smaller) IDs than new ones
+        "novel words before trees graphs alpha zeta novel words trees",
+        "",
+    ]
+    for text in texts:
+        preprocessed = doc_processor.preprocess_text(text)
+        words = doc_processor.tokenize_words(preprocessed)
+        token_ids = doc_processor.tokenize_ids(preprocessed)
+        for top_n in (0, 1, 2, 3, 50):
+            assert (doc_processor.extract_keywords_from_ids(token_ids, top_n=top_n)
+                    == doc_processor.extract_keywords(words, top_n=top_n)), (text, top_n)
+
+    # A vocabulary that outgrows its cap is cleared after the document, without changing any result
+    text = ' '.join(f"term{chr(97 + i % 26)}{chr(97 + i // 26 % 26)}{chr(97 + i // 676)}"
+                    for i in range(3000)) + " repeated repeated"
+    expected = CLOPipeline(seed=0).process_text(text)
+    default_size = pipeline.MAX_VOCABULARY_SIZE
+    pipeline.MAX_VOCABULARY_SIZE = 1000
+    try:
+        capped = CLOPipeline(seed=0)
+        vocabulary = capped.doc_processor.vocabulary
+        assert capped.process_text("small course about graphs")['keywords'] == ['small', 'course', 'graphs']
+        assert len(vocabulary) == 4
+        assert capped.process_text(text) == expected
+        assert len(vocabulary) == 0
+        assert capped.process_text(text) == expected
+        assert capped.process_text("small course about graphs")['keywords'] == ['small', 'course', 'graphs']
+    finally:
+        pipeline.MAX_VOCABULARY_SIZE = default_size
+
+    print("Token-ID keyword extraction tests completed successfully\n")
+
+def test_parallel_counter():
+    """Test that counting shards across worker processes matches counting the whole text."""
+    from utils.parallel_counter import SHARDS_PER_WORKER, count_in_parallel, split_shards
+
+    require_nltk_data()
+    print("Testing parallel keyword counting...")
+
+    doc_processor = DocumentProcessor()
+    workers = 2
+    # Long non-ASCII words, so shard targets land inside tokens and multi-byte characters
+    text = ' '.join(['Stra\u00dfenverkehrsordnung', 'the', 'r\u00e9sum\u00e9s,', 'DATA', 'data42', 'of',
+                     '\u00fcberm\u00e4\u00dfig', 'graph-theory'] * 150)
+    data = text.encode('utf-8')
+    num_shards = workers * SHARDS_PER_WORKER
+    target = len(data) // num_shards
+    assert not data[target:target + 1].isspace() and not data[target - 1:target].isspace()
+
+    shards = split_shards(memoryview(data), len(data), num_shards)
+    assert len(shards) > 1 and shards[0][0] == 0 and shards[-1][1] == len(data)
+    assert all(stop == start for (_, stop), (start, _) in zip(shards, shards[1:]))
+    # The first cut moved past the target to the end of the token it fell in
+    assert shards[0][1] > target and data[shards[0][1]:shards[0][1] + 1].isspace()
+
+    expected = Counter(word for word in doc_processor.tokenize_words(doc_processor.preprocess_text(text))
+                       if len(word) > 3)
+    counts = count_in_parallel(text, workers)
+    assert counts == expected
+    # Merged in shard order, so every word keeps its first-occurrence position
+    assert list(counts) == list(expected)
+    assert count_in_parallel('', workers) == Counter()
+
+    print("Parallel keyword counting tests completed successfully\n")
+
+def test_incremental_analyzer():
+    """Test that re-analyzing edited paragraphs matches a full analysis of the edited text."""
+    from utils.incremental import IncrementalAnalyzer
+
+    require_nltk_data()
+    print("Testing IncrementalAnalyzer...")
+
+    doc_processor = DocumentProcessor()
+    analyzer = IncrementalAnalyzer(doc_processor)
+
+    def full_analysis(text, top_n):
+        sentences, words = doc_processor.tokenize_text(doc_processor.preprocess_text(text), raw_text=text)
+        return len(words), len(set(words)), len(sentences), doc_processor.extract_keywords(words, top_n=top_n)
+
+    paragraphs = [
+        "# Introduction to Graphs\nGraphs model networks. Trees are graphs without cycles.",
+        "Students traverse graphs with search algorithms! Search visits every vertex once.",
+        "Weighted graphs need shortest path algorithms such as Dijkstra's algorithm.",
+        "Trees, heaps and graphs are data structures.",
+    ]
+    edits = [
+        paragraphs,
+        # Insert a paragraph at the start and one in the middle
+        ["Networks appear everywhere; networks connect people."] + paragraphs[:2]
+        + ["Heaps support priority queues.\nQueues order the search frontier."] + paragraphs[2:],
+        # Delete paragraphs
+        [paragraphs[0], paragraphs[3]],
+        # Edit a paragraph, and repeat one, which changes the counts but not the first occurrences
+        [paragraphs[0].replace("cycles", "loops"), paragraphs[3], paragraphs[3]],
+        # Move a paragraph to the front, which changes the tie order
+        [paragraphs[3], paragraphs[0].replace("cycles", "loops"), paragraphs[1]],
+        [],
+        paragraphs,
+    ]
+    analyzed = []
+    for edit_number, edited in enumerate(edits):
+        text = "\n\n".join(edited)
+        for top_n in (3, 30):
+            result = analyzer.analyze(text, top_n=top_n)
+            summary = (result['total_words'], result['unique_words'], result['total_sentences'], result['keywords'])
+            assert summary == full_analysis(text, top_n), (edit_number, top_n)
+            if top_n == 3:
+                analyzed.append(result['paragraphs']['analyzed'])
+        print(f"Edit {edit_number}: {result['paragraphs']}")
+
+    # Only paragraphs that are new, edited, or no longer cached are re-analyzed
+    assert analyzed == [4, 3, 0, 1, 1, 0, 4]
+
+    print("IncrementalAnalyzer tests completed successfully\n")
+
+def test_docx_reader():
+    """Test DOCX paragraph and table extraction on a document built with zipfile."""
+    import tempfile
+    import zipfile
+    from utils.docx_reader import iter_docx_paragraphs
+
+    print("Testing DOCX reading...")
+
+    def paragraph(*runs, properties=''):
+        return f"<w:p>{properties}{''.join(f'<w:r>{run}</w:r>' for run in runs)}</w:p>"
+
+    def cell(*paragraphs):
+        return f"<w:tc><w:tcPr><w:tcW w:w=\"2000\"/></w:tcPr>{''.join(paragraphs)}</w:tc>"
+
+    body = [
+        paragraph('<w:t>Introduction to </w:t>', '<w:t xml:space="preserve">Machine Learning</w:t>'),
+        # Tab stops in the paragraph properties are not text; tabs and breaks in runs are
+        paragraph('<w:t>Week</w:t><w:tab/><w:t>Topic</w:t>', '<w:br/><w:t>Caf\u00e9 &amp; r\u00e9sum\u00e9</w:t>',
+                  properties='<w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>'),
+        paragraph(),
+        "<w:tbl><w:tr>" + cell(paragraph('<w:t>Regression</w:t>'), paragraph('<w:t>Clustering</w:t>'))
+        + cell(paragraph('<w:t>Classification</w:t>')) + "</w:tr><w:tr>"
+        + cell(paragraph('<w:t>Evaluation</w:t>')) + cell(paragraph()) + "</w:tr></w:tbl>",
+        # Field instructions and deleted text are not <w:t> content
+        paragraph('<w:instrText>PAGE</w:instrText>', '<w:t>Final</w:t>', '<w:delText>removed</w:delText>'),
+    ]
+    expected = ['Introduction to Machine Learning', 'Week\tTopic\nCaf\u00e9 & r\u00e9sum\u00e9', '',
+                'Regression', 'Clustering', 'Classification', 'Evaluation', '', 'Final']
+    # Enough paragraphs that the XML spans several read blocks
+    body += [paragraph(f'<w:t>Learning outcome {number}</w:t>') for number in range(5000)]
+    expected += [f"Learning outcome {number}" for number in range(5000)]
+
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{"".join(body)}<w:sectPr/></w:body></w:document>')
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "syllabus.docx")
+        with zipfile.ZipFile(file_path, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("[Content_Types].xml", '<?xml version="1.0"?><Types/>')
+            archive.writestr("word/document.xml", document.encode('utf-8'))
+
+        assert len(document) > 4 * (1 << 16)
+        assert list(iter_docx_paragraphs(file_path)) == expected
+
+        require_nltk_data()
+        text = DocumentProcessor().extract_text_from_file(file_path)
+        assert text == "\n".join(expected) + "\n"
+
+    print("DOCX reading tests completed successfully\n")
+
+def test_text_normalizer():
+    """Test that the single-pass normalizer matches the original multi-pass preprocessing."""
+    import random
+    import re
+    from utils.text_normalizer import normalize_chunk, normalize_stream, normalize_text
+
+    print("Testing text normalization...")
+
+    def reference(text):
+        # The multi-pass preprocessing the normalizer replaced
+        text = text.lower()
+        text = re.sub(r'[^\w\s]', ' ', text)
+        text = re.sub(r'\d+', ' ', text)
+        return re.sub(r'\s+', ' ', text).strip()
+
+    samples = [
+        "",
+        "   \n\t ",
+        "Introduction to Machine Learning: CS-101 (Fall 2024)",
+        "abc123def 4th 2nd-year snake_case __init__ x86_64",
+        "Caf\u00e9 d\u00e9j\u00e0-vu, Stra\u00dfe, na\u00efve \ufb01nance",
+        "\u2018Quoted\u2019 \u201cwords\u201d \u2013 dashes\u2014and\u2026 bullets \u2022 no\u00a0break",
+        "\u039f\u0394\u039f\u03a3\u2019 \u03a3\u0391\u03a3 \u03a3",
+        "\u0130stanbul \u0130I x\u00b2 \u0663\u0664 digits \u0968 and\u2003em\u3000space",
+        "\u5b66\u4e60 \u673a\u5668, \u0645\u0631\u062d\u0628\u0627! \u043f\u0440\u0438\u0432\u0435\u0442.",
+    ]
+    for text in samples:
+        expected = reference(text)
+        assert normalize_chunk(text) == expected, text
+        assert normalize_text(text) == expected, text
+        assert normalize_text(text, chunk_size=3) == expected, text
+
+    # Chunk boundaries anywhere, including inside words and multi-character lowercasings
+    document = " ".join(samples) * 3
+    expected = reference(document)
+    rng = random.Random(0)
+    for chunk_size in (1, 2, 5, 17, 64):
+        assert normalize_text(document, chunk_size=chunk_size) == expected
+        cuts = sorted(rng.sample(range(1, len(document)), (len(document) - 1) // chunk_size))
+        chunks = [document[start:stop] for start, stop in zip([0] + cuts, cuts + [len(document)])]
+        assert ' '.join(normalize_stream(chunks)) == expected
+        assert all(normalize_stream(chunks))
+    assert ' '.join(normalize_stream(iter(document))) == expected
+
+    print("Text normalization tests completed successfully\n")
+
+def test_clo_generator(keywords=None):
     """Test the CLO generator functionality."""
     print("Testing CLOGenerator...")
 
+    if keywords is None:
+        keywords = ['learning', 'machine', 'data', 'regression', 'clustering',
+                    'classification', 'students', 'algorithms', 'model', 'evaluation']
+
     # Initialize CLO generator
     clo_generator = CLOGenerator()
 
@@ -88,7 +394,7 @@ def test_clo_generator(keywords):
     print(f"Generated {len(clos)} CLOs:")
     for i, clo in enumerate(clos):
         print(f"CLO {i+1}: {clo['clo']}")
-        print(f"Taxonomy Level: {clo['taxonomy_level']} | Action Verb: {clo['action_verb']}")
+        print(f"Domain: {clo['domain']} | Action Verb: {clo['action_verb']}")
 
     # Test skill extraction
     skills = clo_generator.extract_skills(keywords, clos, num_skills=5)
@@ -98,6 +404,605 @@ def test_clo_generator(keywords):
 
     print("CLOGenerator tests completed successfully")
 
+def test_clo_generator_batch():
+    """Test that seeded CLO generation is reproducible and batches match single calls."""
+    try:
+        import numpy
+    except ImportError:
+        print("Skipping seeded CLO generation tests (NumPy is not installed)")
+        return
+
+    print("Testing seeded CLO generation...")
+
+    clo_generator = CLOGenerator()
+    keyword_lists = [
+        ['learning', 'machine', 'data', 'regression', 'clustering', 'classification', 'students'],
+        ['graphs', 'trees', 'search'],
+        [],
+        ['learning', 'machine', 'data', 'regression', 'clustering', 'classification', 'students'],
+    ]
+    preferred_verbs = [['apply', 'design'], [], None, ['explain']]
+
+    batch = clo_generator.generate_clos_batch(keyword_lists, num_clos=3, seed=7)
+    assert batch == clo_generator.generate_clos_batch(keyword_lists, num_clos=3, seed=7)
+    assert batch != clo_generator.generate_clos_batch(keyword_lists, num_clos=3, seed=8)
+    assert [len(clos) for clos in batch] == [2, 1, 0, 2]
+    # A document's CLOs depend only on its keywords and the seed, not on its place in the batch
+    assert batch[0] == batch[3]
+    for keywords, clos in zip(keyword_lists, batch):
+        assert clo_generator.generate_clos(keywords, num_clos=3, seed=7) == clos
+
+    batch = clo_generator.generate_clos_batch(keyword_lists, num_clos=3, seed=7, preferred_verbs=preferred_verbs)
+    for keywords, verbs, clos in zip(keyword_lists, preferred_verbs, batch):
+        assert clo_generator.generate_clos(keywords, num_clos=3, seed=7, preferred_verbs=verbs) == clos
+    assert all(clo['action_verb'] == 'explain' for clo in batch[3])
+
+    keyword_groups = [[['graphs', 'trees'], ['search']], [['data']], [], [['learning']]]
+    batch = clo_generator.generate_clos_batch(keyword_lists, num_clos=3, seed=7, keyword_groups=keyword_groups)
+    assert [[clo['keywords'] for clo in clos] for clos in batch] == keyword_groups
+    for keywords, groups, clos in zip(keyword_lists, keyword_groups, batch):
+        assert clo_generator.generate_clos(keywords, num_clos=3, seed=7, keyword_groups=groups) == clos
+
+    # Per-document options must line up with the documents
+    for options in ({'preferred_verbs': preferred_verbs[:2]}, {'keyword_groups': keyword_groups[:3]}):
+        try:
+            clo_generator.generate_clos_batch(keyword_lists, seed=7, **options)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Mismatched {list(options)} were accepted")
+
+    print("Seeded CLO generation tests completed successfully\n")
+
+def test_keyword_clusterer():
+    """Test that co-occurrence clustering keeps every candidate keyword, even in unbalanced clusters."""
+    try:
+        from models.keyword_clustering import KeywordClusterer
+        import sklearn
+    except ImportError:
+        print("Skipping KeywordClusterer tests (NumPy, SciPy or scikit-learn is not installed)")
+        return
+
+    import random
+
+    print("Testing KeywordClusterer...")
+
+    clusterer = KeywordClusterer()
+    keywords = [f"keyword{i}" for i in range(12)]
+    rng = random.Random(0)
+    # Eight keywords always occur together and two others do, so one cluster outgrows its group
+    words = []
+    for _ in range(200):
+        words += rng.sample(keywords[:8], 8) + ['filler'] * 6
+        words += rng.sample(keywords[8:10], 2) + ['filler'] * 6
+
+    for num_groups in (1, 2, 3):
+        candidates = keywords[:num_groups * 5]
+        groups = clusterer.group_keywords(keywords, words, num_groups, group_size=5)
+        print(f"{num_groups} groups: {groups}")
+        assert sorted(keyword for group in groups for keyword in group) == sorted(candidates)
+        assert len(groups) <= num_groups and all(0 < len(group) <= 5 for group in groups)
+        # Groups and the keywords within them stay in rank order
+        assert all(group == sorted(group, key=keywords.index) for group in groups)
+        assert [group[0] for group in groups] == sorted((group[0] for group in groups), key=keywords.index)
+
+    print("KeywordClusterer tests completed successfully\n")
+
+def test_phrase_matcher():
+    """Test phrase matching with overlapping and nested phrases."""
+    from utils.phrase_matcher import PhraseMatcher
+
+    print("Testing PhraseMatcher...")
+
+    matcher = PhraseMatcher()
+    for phrase in ('machine', 'machine learning', 'learning', 'learning rate', 'deep machine learning',
+                   'a b c', 'b c d', 'b x', 'a a'):
+        matcher.add(phrase, label='phrase')
+    matcher.add('learns', canonical='learning', label='inflection')
+
+    tokens = 'deep machine learning rate learns'.split()
+    assert sorted(matcher.iter_matches(tokens)) == [
+        (0, 3, 'deep machine learning', 'phrase'),
+        (1, 2, 'machine', 'phrase'),
+        (1, 3, 'machine learning', 'phrase'),
+        (2, 3, 'learning', 'phrase'),
+        (2, 4, 'learning rate', 'phrase'),
+        (4, 5, 'learning', 'inflection'),
+    ]
+    # Overlapping phrases, and a failed longer match that falls back to a shorter one
+    assert sorted(matcher.iter_matches('a b c d'.split())) == [(0, 3, 'a b c', 'phrase'), (1, 4, 'b c d', 'phrase')]
+    assert list(matcher.iter_matches('a b x'.split())) == [(1, 3, 'b x', 'phrase')]
+    assert list(matcher.iter_matches('a a a'.split())) == [(0, 2, 'a a', 'phrase'), (1, 3, 'a a', 'phrase')]
+    assert list(matcher.iter_matches([])) == []
+
+    counts = matcher.count('machine learning and machine learning rate'.split())
+    assert counts == {('machine', 'phrase'): 2, ('machine learning', 'phrase'): 2, ('learning', 'phrase'): 2,
+                      ('learning rate', 'phrase'): 1}
+    assert list(counts)[:2] == [('machine', 'phrase'), ('machine learning', 'phrase')]
+
+    # Action verbs: inflections are real words, and noun uses are not counted as verbs
+    from models.clo_generator import _verb_forms
+    from utils.text_normalizer import normalize_text
+
+    clo_generator = CLOGenerator()
+    forms = {form for verb in clo_generator.action_verbs for form in _verb_forms(verb)}
+    assert {'used', 'planned', 'applied', 'broken down', 'setting up', 'to design'} <= forms
+    assert not {'useed', 'planed', 'applyed', 'designs', 'test'} & forms
+    text = ("Students will design a test plan. The design uses values and lists. "
+            "Students learn to use tools, planned experiments, tested designs and applied methods.")
+    found = clo_generator.scan_content(normalize_text(text).split())
+    assert found['action_verbs'] == {'design': 1, 'use': 1, 'plan': 1, 'test': 1, 'apply': 1}
+    assert clo_generator.verbs_by_level(found['action_verbs'])['create'] == ['design', 'plan']
+
+    print("PhraseMatcher tests completed successfully\n")
+
+def test_keyphrases():
+    """Test keyphrase extraction, its bounded candidate table, and rejecting it with clustering."""
+    import random
+    from utils.keyphrases import KeyphraseExtractor
+
+    print("Testing KeyphraseExtractor...")
+
+    stop_words = {'of', 'and', 'the', 'is', 'a'}
+    text = ("machine learning is a field of artificial intelligence and machine learning "
+            "uses statistical techniques the analysis of algorithms and machine learning "
+            "models need artificial intelligence research")
+    keyphrases = KeyphraseExtractor().extract(text.split(), stop_words, top_n=5)
+    print(f"Keyphrases: {', '.join(keyphrases)}")
+    assert keyphrases[:2] == ['machine learning', 'artificial intelligence']
+    # Nested words only count outside their phrase, and phrases seen once are dropped
+    assert 'machine' not in keyphrases and 'uses statistical techniques' not in keyphrases
+    # No phrase spans a stopword
+    assert all(' of ' not in phrase for phrase in KeyphraseExtractor(min_count=1).extract(text.split(), stop_words))
+
+    # A tiny cap keeps few candidates, but a phrase frequent from the start keeps its exact count
+    rng = random.Random(0)
+    noise = [f"noise{i}" for i in range(300)]
+    tokens = []
+    for _ in range(500):
+        tokens += ['deep', 'learning'] + rng.sample(noise, 3) + ['of']
+    extractor = KeyphraseExtractor(max_candidates=50)
+    counts, words = extractor.count_ngrams(tokens, stop_words)
+    held = [key for key in counts if len(key) > 1]
+    assert 0 < len(held) <= 50
+    phrase = (words.index('deep'), words.index('learning'))
+    assert counts[phrase] == 500 and counts[(words.index('learning'),)] == 500
+    assert extractor.extract(tokens, stop_words, top_n=1) == ['deep learning']
+
+    # Clustering counts single words, so it is rejected together with keyphrases
+    require_nltk_data()
+    from pipeline import CLOPipeline
+
+    try:
+        CLOPipeline(keyphrases=True, clustering=True)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("keyphrases combined with clustering were accepted")
+
+    print("KeyphraseExtractor tests completed successfully\n")
+
+def test_corpus_keyword_engine():
+    """Test that corpus TF-IDF ranks a term shared by every document below distinctive ones."""
+    try:
+        from utils.keyword_engine import CorpusKeywordEngine
+    except ImportError:
+        print("Skipping CorpusKeywordEngine tests (NumPy, SciPy or scikit-learn is not installed)")
+        return
+
+    print("Testing CorpusKeywordEngine...")
+
+    # 'course' is the most frequent word of every document, but says nothing about any of them
+    documents = [
+        ['course'] * 4 + ['regression'] * 3 + ['clustering'] * 3,
+        ['course'] * 4 + ['compilers'] * 3 + ['parsing'] * 3,
+        ['course'] * 4 + ['genetics'] * 3 + ['proteins'] * 3,
+    ]
+    engine = CorpusKeywordEngine().fit(documents)
+    rankings = engine.top_keywords(top_n=3)
+    print(f"Top keywords per document: {rankings}")
+    assert [ranking[0] for ranking in rankings] == ['regression', 'compilers', 'genetics']
+    assert all(ranking[-1] == 'course' for ranking in rankings)
+
+    # Counts gathered elsewhere (as batch workers send them) rank the same as word lists
+    counted = CorpusKeywordEngine().fit([dict(Counter(words)) for words in documents])
+    assert counted.top_keywords(top_n=3) == rankings
+
+    print("CorpusKeywordEngine tests completed successfully\n")
+
+def test_near_duplicates():
+    """Test MinHash similarity and the size cap of the near-duplicate index."""
+    try:
+        from utils.near_duplicates import MinHasher, NearDuplicateIndex, jaccard_estimate
+    except ImportError:
+        print("Skipping NearDuplicateIndex tests (NumPy is not installed)")
+        return
+
+    import random
+    import tempfile
+
+    print("Testing NearDuplicateIndex...")
+
+    rng = random.Random(0)
+    vocabulary = [f"word{i}" for i in range(500)]
+    tokens = [rng.choice(vocabulary) for _ in range(1000)]
+    edited = tokens[:500] + ['edited'] + tokens[501:]
+    unrelated = [rng.choice(vocabulary) for _ in range(1000)]
+
+    minhasher = MinHasher()
+    signature = minhasher.signature(tokens)
+    assert minhasher.signature([]) is None
+    assert (MinHasher().signature(list(tokens)) == signature).all()
+    assert jaccard_estimate(signature, minhasher.signature(tokens)) == 1.0
+    assert jaccard_estimate(signature, minhasher.signature(edited)) >= 0.9
+    assert jaccard_estimate(signature, minhasher.signature(unrelated)) < 0.1
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index = NearDuplicateIndex(temp_dir, threshold=0.9)
+        result = {'keywords': ['word1', 'word2']}
+        index.add(signature, 'params', 'course.txt', result)
+        assert index.find(minhasher.signature(tokens), 'params') == ('course.txt', 1.0, result)
+        file_path, similarity, _ = index.find(minhasher.signature(edited), 'params')
+        assert file_path == 'course.txt' and 0.9 <= similarity < 1.0
+        assert index.find(minhasher.signature(unrelated), 'params') is None
+        # Results computed with other parameters are never reused
+        assert index.find(signature, 'other params') is None
+        index.close()
+
+        # Each document takes over num_perm * 8 bytes, so a 64 KiB cap holds fewer than 64
+        index = NearDuplicateIndex(os.path.join(temp_dir, "capped"), threshold=0.9, max_bytes=64 * 1024)
+        documents = [[f"document{number}"] + tokens[number:number + 50] for number in range(100)]
+        for number, document in enumerate(documents):
+            index.add(minhasher.signature(document), 'params', f"document{number}.txt", {'number': number})
+            assert len(index) < 64
+        # The oldest documents were evicted, the newest are still found
+        assert index.find(minhasher.signature(documents[0]), 'params') is None
+        assert index.find(minhasher.signature(documents[-1]), 'params')[0] == "document99.txt"
+        # Results larger than the whole cap are not stored at all
+        count = len(index)
+        index.add(minhasher.signature(unrelated), 'params', "huge.txt", {'text': ' '.join(map(str, range(100000)))})
+        assert len(index) == count and index.find(minhasher.signature(unrelated), 'params') is None
+        index.clear()
+        assert len(index) == 0
+        index.close()
+
+    print("NearDuplicateIndex tests completed successfully\n")
+
+def test_result_cache():
+    """Test cache hits, misses and LRU eviction, and that lookups defer their writes."""
+    import random
+    import tempfile
+    from utils.result_cache import FLUSH_LOOKUPS, ResultCache
+
+    print("Testing ResultCache...")
+
+    rng = random.Random(0)
+    # Random text barely compresses, so every value takes about 2 KB
+    values = {name: ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(3000)) for name in 'abc'}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ResultCache(temp_dir, max_bytes=5000)
+        observer = ResultCache(temp_dir, max_bytes=5000)
+        keys = {name: cache.make_key(name, 'text') for name in values}
+        assert len(set(keys.values())) == 3 and cache.make_key('a', 'words') != keys['a']
+
+        assert cache.get(keys['a'], 'text') is None
+        cache.put(keys['a'], 'text', values['a'])
+        cache.put(keys['b'], 'text', values['b'])
+        assert cache.get(keys['a'], 'text') == values['a']
+        assert (cache.hits, cache.misses) == ({'text': 1}, {'text': 1})
+
+        # The hit is queued: other connections see it only after a flush
+        assert observer.stats()['stages'] == {'text': {'hits': 0, 'misses': 1}}
+        cache.flush()
+        assert observer.stats()['stages'] == {'text': {'hits': 1, 'misses': 1}}
+
+        # A store over the cap evicts the least recently used entry, counting queued accesses
+        assert cache.get(keys['b'], 'text') == values['b']
+        assert cache.get(keys['a'], 'text') == values['a']
+        cache.put(keys['c'], 'text', values['c'])
+        assert cache.get(keys['b'], 'text') is None
+        assert cache.get(keys['a'], 'text') == values['a'] and cache.get(keys['c'], 'text') == values['c']
+        stats = cache.stats()
+        assert stats['entries'] == 2 and stats['bytes'] <= 5000
+        assert stats['stages'] == {'text': {'hits': 5, 'misses': 2}}
+
+        # Queued lookups are written once enough of them pile up, and when the cache is closed
+        for _ in range(FLUSH_LOOKUPS):
+            cache.get(keys['c'], 'words')
+        assert observer.stats()['stages']['words'] == {'hits': FLUSH_LOOKUPS, 'misses': 0}
+        cache.get(keys['a'], 'text')
+        cache.close()
+        assert observer.stats()['stages']['text'] == {'hits': 6, 'misses': 2}
+
+        observer.clear()
+        assert observer.stats() == {'entries': 0, 'bytes': 0, 'stages': {}}
+        observer.close()
+
+    print("ResultCache tests completed successfully\n")
+
+def test_file_index():
+    """Test that FileIndex scans only rehash and reprocess documents that changed."""
+    import tempfile
+    from utils import file_index
+    from utils.file_index import FileIndex
+
+    print("Testing FileIndex...")
+
+    # Count the content hashes, to check that unchanged files are never read
+    hashed = []
+    digest = file_index.file_digest
+
+    def counting_digest(path):
+        hashed.append(path)
+        return digest(path)
+
+    file_index.file_digest = counting_digest
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = os.path.join(temp_dir, "courses")
+            os.makedirs(root)
+            paths = [os.path.join(root, name) for name in ("a.txt", "b.txt")]
+            for path in paths:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(f"Content of {os.path.basename(path)}")
+                os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+            index = FileIndex(os.path.join(temp_dir, "index.sqlite3"))
+
+            def scan(params_key='v1'):
+                hashed.clear()
+                return index.scan(paths, roots=[root], params_key=params_key)
+
+            def record(result, params_key='v1'):
+                for state in result.changed:
+                    index.record(state, index.output_name(state.path), params_key=params_key)
+
+            result = scan()
+            assert sorted(state.path for state in result.changed) == paths and len(hashed) == 2
+            record(result)
+            assert len(index) == 2
+
+            # Unchanged files are skipped on their stat alone
+            result = scan()
+            assert (result.changed, result.deleted, result.unchanged, hashed) == ([], [], 2, [])
+
+            # A new modification time means a rehash; the same content is not reprocessed
+            os.utime(paths[0], ns=(2_000_000_000, 2_000_000_000))
+            result = scan()
+            assert (result.changed, result.unchanged, hashed) == ([], 2, [paths[0]])
+            assert scan().unchanged == 2 and hashed == []
+
+            # New content of the same size is reprocessed
+            with open(paths[0], "w", encoding="utf-8") as f:
+                f.write("Content of A.txt")
+            os.utime(paths[0], ns=(3_000_000_000, 3_000_000_000))
+            result = scan()
+            assert [state.path for state in result.changed] == [paths[0]] and hashed == [paths[0]]
+            record(result)
+
+            # Other pipeline parameters invalidate every document
+            result = scan(params_key='v2')
+            assert len(result.changed) == 2 and result.unchanged == 0
+            record(result, params_key='v2')
+            assert scan(params_key='v2').unchanged == 2
+
+            # A deleted document is reported once and forgotten, keeping its output name
+            output_name = index.output_name(paths[1])
+            os.remove(paths[1])
+            result = index.scan(paths[:1], roots=[root], params_key='v2')
+            assert result.deleted == [(paths[1], output_name)]
+            # Without a root covering it, nothing is reported deleted
+            assert index.scan(paths[:1], params_key='v2').deleted == []
+            index.forget(paths[1])
+            assert len(index) == 1
+            assert index.scan(paths[:1], roots=[root], params_key='v2').deleted == []
+            index.close()
+    finally:
+        file_index.file_digest = digest
+
+    print("FileIndex tests completed successfully\n")
+
+def _sink_results():
+    """Return a successful result with a stage trace, and a failed one."""
+    return [
+        {
+            'file_path': 'courses/ml.txt',
+            'keywords': ['learning', 'r\u00e9gression'],
+            'clos': [{'clo': 'Students will be able to apply learning.', 'action_verb': 'apply',
+                      'domain': 'cognitive', 'keywords': ['learning']}],
+            'skills': ['Proficiency in learning'],
+            'seconds': 0.5,
+            'trace': [{'event': 'stage', 'stage': 'extract_text', 'seconds': 0.25},
+                      {'event': 'stage', 'stage': 'extract_text', 'seconds': 0.125},
+                      {'event': 'count', 'name': 'tokens', 'value': 12}]
+        },
+        {'file_path': 'courses/broken.pdf', 'error': 'PDF is encrypted'},
+    ]
+
+def test_jsonl_sink():
+    """Test that the JSONL sink appends one flattened record per result."""
+    import json
+    import tempfile
+    from utils.result_sink import JSONLSink, open_sink
+
+    print("Testing JSONLSink...")
+
+    first, failed = _sink_results()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "results.jsonl")
+        with open_sink(path) as sink:
+            assert isinstance(sink, JSONLSink)
+            sink.write(first)
+            sink.write(failed)
+            assert sink.records == 2
+        # Reopening appends instead of replacing
+        with JSONLSink(path) as sink:
+            sink.write(first)
+
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+
+    assert len(records) == 3 and records[0] == records[2]
+    assert records[0] == {
+        'file_path': 'courses/ml.txt', 'error': None, 'keywords': ['learning', 'r\u00e9gression'],
+        'clos': first['clos'], 'skills': ['Proficiency in learning'], 'seconds': 0.5,
+        'timings': {'extract_text': 0.375}
+    }
+    assert records[1] == {'file_path': 'courses/broken.pdf', 'error': 'PDF is encrypted', 'keywords': [],
+                          'clos': [], 'skills': [], 'seconds': None, 'timings': {}}
+
+    print("JSONLSink tests completed successfully\n")
+
+def test_parquet_sink():
+    """Test that records written to the Parquet sink read back unchanged, across row groups."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("Skipping ParquetSink tests (pyarrow is not installed)")
+        return
+
+    import tempfile
+    from utils.result_sink import ParquetSink, open_sink, result_record
+
+    print("Testing ParquetSink...")
+
+    results = _sink_results() * 3
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "results.parquet")
+        with open_sink(path, row_group_size=4) as sink:
+            assert isinstance(sink, ParquetSink)
+            for result in results:
+                sink.write(result)
+            assert sink.records == len(results)
+
+        parquet_file = pq.ParquetFile(path)
+        assert parquet_file.metadata.num_row_groups == 2
+        records = parquet_file.read().to_pylist()
+
+    for record in records:
+        # Maps read back as (key, value) pairs
+        record['timings'] = dict(record['timings'])
+    assert records == [result_record(result) for result in results]
+
+    print("ParquetSink tests completed successfully\n")
+
+def test_service():
+    """Test the HTTP service in-process: a processed request, and a 503 when the queue is full."""
+    import json
+    import queue
+    import threading
+    import time
+    import urllib.error
+    import urllib.request
+    from service import BatchingWorkerPool, CLOService, ServiceMetrics
+
+    require_nltk_data()
+    print("Testing CLOService...")
+
+    metrics = ServiceMetrics()
+    pool = BatchingWorkerPool({'seed': 0}, metrics, workers=1, batch_size=1, max_queue=2)
+    server = CLOService(('127.0.0.1', 0), pool, metrics)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    text = "Students will analyze machine learning models and evaluate regression techniques."
+
+    def post(body):
+        request = urllib.request.Request(f"{url}/process", data=json.dumps(body).encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                return response.status, dict(response.headers), json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, dict(e.headers), json.loads(e.read())
+
+    try:
+        status, _, result = post({'text': text, 'num_clos': 2})
+        assert status == 200 and len(result['clos']) == 2 and result['keywords']
+        assert post({'text': ' '})[0] == 400
+
+        # Hold every in-flight slot, so the batcher stalls and the queue fills up
+        for _ in range(pool.workers * 2):
+            pool.in_flight.acquire()
+        waiting = []
+        try:
+            while True:
+                try:
+                    waiting.append(pool.submit('text', text))
+                except queue.Full:
+                    # Full once the batcher holds one job and can take no more
+                    time.sleep(0.2)
+                    if pool.queue_depth == 2:
+                        break
+            status, headers, result = post({'text': text})
+            assert status == 503 and headers['Retry-After'] == '1' and 'error' in result
+        finally:
+            for _ in range(pool.workers * 2):
+                pool.in_flight.release()
+
+        # The queued jobs still finish once the pool has room again
+        assert all('error' not in future.result(timeout=60) for future in waiting)
+        with urllib.request.urlopen(f"{url}/metrics", timeout=60) as response:
+            snapshot = json.loads(response.read())
+        print(f"Metrics: {snapshot}")
+        assert snapshot['rejected'] == 1 and snapshot['queue_depth'] == 0
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print("CLOService tests completed successfully\n")
+
+def test_keyword_reranker():
+    """Test keyword re-ranking with a tiny locally built embedding model."""
+    try:
+        import torch
+        from transformers import BertConfig, BertModel, BertTokenizer
+    except ImportError:
+        print("Skipping KeywordReranker tests (transformers or PyTorch is not installed)")
+        return
+
+    import tempfile
+    from models.keyword_reranker import KeywordReranker
+    from utils.embedding_cache import EmbeddingCache
+
+    print("Testing KeywordReranker...")
+    keywords = ['learning', 'machine', 'data', 'regression', 'clustering', 'students']
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Save a randomly initialized one-layer BERT with a word-level vocabulary
+        model_dir = os.path.join(temp_dir, "model")
+        os.makedirs(model_dir)
+        vocab_path = os.path.join(model_dir, "vocab.txt")
+        with open(vocab_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + keywords) + "\n")
+        BertTokenizer(vocab_path).save_pretrained(model_dir)
+        torch.manual_seed(0)
+        config = BertConfig(vocab_size=len(keywords) + 5, hidden_size=16, num_hidden_layers=1,
+                            num_attention_heads=2, intermediate_size=32)
+        BertModel(config).save_pretrained(model_dir)
+
+        cache = EmbeddingCache(os.path.join(temp_dir, "cache"))
+        reranker = KeywordReranker(model_dir, cache=cache, max_batch_tokens=8)
+        text = "Machine learning students study regression and clustering of data. " * 20
+
+        ranked = reranker.rerank(keywords, text)
+        print(f"Re-ranked keywords: {', '.join(ranked)}")
+        assert sorted(ranked) == sorted(keywords)
+
+        # Batched embeddings match one-at-a-time embeddings, and the cache returns them unchanged
+        batched = reranker.encode(keywords)
+        single = [reranker.encode([keyword])[0] for keyword in keywords]
+        assert max(abs(batched[i] - single[i]).max() for i in range(len(keywords))) < 1e-5
+        cached = reranker.embed_terms(keywords)
+        assert (cached == batched).all()
+        assert cache.hits == len(keywords)
+        assert reranker.rerank(keywords, text) == ranked
+        cache.close()
+
+    print("KeywordReranker tests completed successfully\n")
+
 def main():
     """Main function to run the tests."""
     print("=== CLO Generator System Tests ===\n")
@@ -108,6 +1013,61 @@ def main():
     # Test CLO generator
     test_clo_generator(keywords)
 
+    # Test text normalization
+    test_text_normalizer()
+
+    # Test streaming keyword extraction
+    test_stream_keywords()
+
+    # Test chunked TXT reading
+    test_txt_chunks()
+
+    # Test token-ID keyword extraction
+    test_token_ids()
+
+    # Test parallel keyword counting
+    test_parallel_counter()
+
+    # Test incremental re-analysis
+    test_incremental_analyzer()
+
+    # Test DOCX reading
+    test_docx_reader()
+
+    # Test seeded CLO generation
+    test_clo_generator_batch()
+
+    # Test keyword clustering
+    test_keyword_clusterer()
+
+    # Test phrase matching and action verb grounding
+    test_phrase_matcher()
+
+    # Test keyphrase extraction
+    test_keyphrases()
+
+    # Test corpus-level keyword ranking
+    test_corpus_keyword_engine()
+
+    # Test near-duplicate detection
+    test_near_duplicates()
+
+    # Test the result cache
+    test_result_cache()
+
+    # Test the incremental sync index
+    test_file_index()
+
+    # Test the result sinks
+    test_jsonl_sink()
+    test_parquet_sink()
+
+    # Test the HTTP service
+    test_service()
+
+    # Test keyword re-ranking
+    test_keyword_reranker()
+
     print("\nAll tests completed successfully!")
 
 if __name__ == "__main__":
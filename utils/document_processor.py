@@ -1,30 +1,93 @@
 """
 Document Processor Module
 This module handles the extraction and preprocessing of text from various document formats.
+
+The PDF backend (PyPDF2) and NLTK are imported only when a matching file type or
+feature is first used, which keeps start-up fast. DOCX files are streamed straight
+from their zip container, tables included, and TXT files through a memory map.
 """
 
 import os
-import re
-import PyPDF2
-import docx
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
-
-# Download necessary NLTK resources
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
+import math
+import mmap
+import heapq
+import codecs
+from collections import Counter
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+from utils.docx_reader import iter_docx_paragraphs
+from utils.instrumentation import Instrumentation
+from utils.keyphrases import KeyphraseExtractor
+from utils.parallel_counter import count_in_parallel
+from utils.resources import load_stopwords
+from utils.text_normalizer import normalize_stream, normalize_text
+from utils.tokenizers import get_tokenizer
+from utils.vocabulary import Vocabulary
+
+# PDFs with fewer pages than this are always extracted in-process
+PARALLEL_PDF_MIN_PAGES = 50
+
+# Approximate number of characters per chunk when streaming DOCX paragraphs
+DOCX_CHUNK_CHARS = 1 << 16
+
+# Default memory budget for the chunks of a streamed TXT file, in bytes
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+
+# Peak memory of streaming keyword counting per byte of TXT chunk (the decoded
+# text, its normalized copies and the token list); about 24 was measured on
+# English syllabi, and non-ASCII text decodes to wider strings
+TXT_MEMORY_PER_CHUNK_BYTE = 32
+
+# Texts with fewer characters than this are always counted in-process
+PARALLEL_COUNT_MIN_CHARS = 8 * 1024 * 1024
+
+
+def _extract_pdf_page_range(file_path, start, stop):
+    """Extract the text of pages [start, stop) of a PDF (runs in a worker process)."""
+    import PyPDF2
+
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return "".join(pdf_reader.pages[page_num].extract_text() or ""
+                       for page_num in range(start, stop))
+
 
 class DocumentProcessor:
     """Class for processing documents and extracting text content."""
 
-    def __init__(self):
-        """Initialize the document processor."""
-        self.stop_words = set(stopwords.words('english'))
+    def __init__(self, pdf_workers=None, max_pages=None, tokenizer='regex', instrumentation=None,
+                 memory_budget=DEFAULT_MEMORY_BUDGET, vocabulary=None, count_workers=None):
+        """
+        Initialize the document processor.
+
+        Args:
+            pdf_workers (int): Number of worker processes used to extract large PDFs
+                (None or 1 extracts every PDF in-process)
+            max_pages (int): Maximum number of PDF pages to extract (None for all pages)
+            tokenizer (str): Tokenizer backend, 'regex' (fast) or 'nltk'
+            instrumentation (Instrumentation): Receives the number of PDF pages extracted
+            memory_budget (int): Approximate peak memory, in bytes, for the chunks of a
+                streamed TXT file (the keyword counts themselves grow with the vocabulary)
+            vocabulary (Vocabulary): Token-ID vocabulary to share with other processors
+                or corpus features (a new one is created by default)
+            count_workers (int): Number of worker processes used to count the keywords
+                of large texts shard by shard (None or 1 counts every text in-process)
+
+        Raises:
+            LookupError: If the required NLTK data is not installed
+        """
+        # Fail fast, before any document is read, if the NLTK data is missing
+        self.stop_words = load_stopwords('english')
+        self.tokenizer = get_tokenizer(tokenizer)
+        self.pdf_workers = pdf_workers
+        self.count_workers = count_workers
+        self.max_pages = max_pages
+        self.keyphrase_extractor = KeyphraseExtractor()
+        self.vocabulary = vocabulary or Vocabulary(self.stop_words)
+        self.instrumentation = instrumentation or Instrumentation()
+        # Chunks are whole multiples of the mmap granularity, so consumed pages can be released
+        granularity = mmap.ALLOCATIONGRANULARITY
+        self.txt_chunk_bytes = max(granularity, memory_budget // TXT_MEMORY_PER_CHUNK_BYTE // granularity * granularity)
 
     def extract_text_from_file(self, file_path):
         """
@@ -47,23 +110,164 @@ class DocumentProcessor:
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
 
-    def _extract_from_pdf(self, file_path):
-        """Extract text from a PDF file."""
-        text = ""
+    def iter_text_from_file(self, file_path):
+        """
+        Extract text from a file as a stream of chunks.
+
+        PDFs are yielded page by page, DOCX files in batches of paragraphs and TXT
+        files in fixed-size chunks, so later stages can start consuming text as
+        soon as the first part has been extracted.
+
+        Args:
+            file_path (str): Path to the document file
+
+        Yields:
+            str: Chunks of text content, in document order
+        """
+        _, file_extension = os.path.splitext(file_path)
+
+        if file_extension.lower() == '.pdf':
+            yield from self._iter_pdf_chunks(file_path)
+        elif file_extension.lower() in ['.docx', '.doc']:
+            yield from self.iter_docx_chunks(file_path)
+        elif file_extension.lower() == '.txt':
+            yield from self.iter_txt_chunks(file_path)
+        else:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+
+    def iter_pdf_pages(self, file_path):
+        """
+        Extract the text of a PDF one page at a time.
+
+        Args:
+            file_path (str): Path to the PDF file
+
+        Yields:
+            str: Text of each page, up to the processor's page cap
+        """
+        import PyPDF2
+
         with open(file_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text()
-        return text
+            num_pages = len(pdf_reader.pages)
+            if self.max_pages is not None:
+                num_pages = min(num_pages, self.max_pages)
+            for page_num in range(num_pages):
+                self.instrumentation.count('pages')
+                yield pdf_reader.pages[page_num].extract_text() or ""
+
+    def iter_pdf_page_ranges(self, file_path):
+        """
+        Extract the text of a PDF by splitting page ranges across worker processes.
+
+        Small PDFs (fewer than PARALLEL_PDF_MIN_PAGES pages) are extracted in-process,
+        since starting the workers would cost more than it saves.
+
+        Args:
+            file_path (str): Path to the PDF file
+
+        Yields:
+            str: Text of each page range, in document order
+        """
+        import PyPDF2
+
+        with open(file_path, 'rb') as file:
+            num_pages = len(PyPDF2.PdfReader(file).pages)
+        if self.max_pages is not None:
+            num_pages = min(num_pages, self.max_pages)
+
+        if num_pages < PARALLEL_PDF_MIN_PAGES:
+            yield from self.iter_pdf_pages(file_path)
+            return
+
+        # Several ranges per worker keeps the pool busy when pages vary in cost
+        workers = min(self.pdf_workers, num_pages)
+        range_size = math.ceil(num_pages / (workers * 4))
+        starts = list(range(0, num_pages, range_size))
+        stops = [min(start + range_size, num_pages) for start in starts]
+
+        self.instrumentation.count('pages', num_pages)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map() returns results in submission order, as soon as each is ready
+            yield from executor.map(_extract_pdf_page_range, [file_path] * len(starts), starts, stops)
+
+    def _iter_pdf_chunks(self, file_path):
+        """Extract a PDF page by page, or by page range when PDF workers are configured."""
+        if self.pdf_workers and self.pdf_workers > 1:
+            return self.iter_pdf_page_ranges(file_path)
+        return self.iter_pdf_pages(file_path)
+
+    def _extract_from_pdf(self, file_path):
+        """Extract text from a PDF file."""
+        return "".join(self._iter_pdf_chunks(file_path))
+
+    def iter_docx_chunks(self, file_path):
+        """
+        Stream the text of a DOCX file, including its tables, in batches of paragraphs.
+
+        Args:
+            file_path (str): Path to the DOCX file
+
+        Yields:
+            str: Newline-terminated paragraphs, about DOCX_CHUNK_CHARS characters at a time
+        """
+        batch, size = [], 0
+        for paragraph in iter_docx_paragraphs(file_path):
+            batch.append(paragraph)
+            size += len(paragraph) + 1
+            if size >= DOCX_CHUNK_CHARS:
+                batch.append("")
+                yield "\n".join(batch)
+                batch, size = [], 0
+        if batch:
+            batch.append("")
+            yield "\n".join(batch)
 
     def _extract_from_docx(self, file_path):
-        """Extract text from a DOCX file."""
-        doc = docx.Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        """Extract text from a DOCX file, one line per paragraph or table cell paragraph."""
+        return "".join(self.iter_docx_chunks(file_path))
+
+    def iter_txt_chunks(self, file_path):
+        """
+        Stream a UTF-8 TXT file through a memory map in fixed-size chunks.
+
+        Each chunk of txt_chunk_bytes is decoded incrementally, so multi-byte
+        characters split across chunks are decoded correctly; words split across
+        chunks are rejoined by normalize_stream. Pages already decoded are
+        released from the mapping, so neither the file nor its text is ever held
+        in memory as a whole. Line endings are not translated, which makes no
+        difference to the normalized words.
+
+        Args:
+            file_path (str): Path to the TXT file
+
+        Yields:
+            str: Decoded chunks of text, in file order
+
+        Raises:
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        chunk_bytes = self.txt_chunk_bytes
+        decoder = codecs.getincrementaldecoder('utf-8')()
+
+        with open(file_path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            # Empty files cannot be memory-mapped
+            if not size:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                for start in range(0, size, chunk_bytes):
+                    text = decoder.decode(mapped[start:start + chunk_bytes])
+                    if hasattr(mmap, 'MADV_DONTNEED'):
+                        mapped.madvise(mmap.MADV_DONTNEED, start, min(chunk_bytes, size - start))
+                    if text:
+                        yield text
+
+        text = decoder.decode(b'', final=True)
+        if text:
+            yield text
 
     def _extract_from_txt(self, file_path):
         """Extract text from a TXT file."""
@@ -75,6 +279,10 @@ class DocumentProcessor:
         """
         Process raw text input directly.
 
+        This keeps the full preprocessed text and word list; use
+        count_keyword_candidates or stream_keywords when only the keywords
+        are needed.
+
         Args:
             text (str): Raw text content
 
@@ -84,8 +292,8 @@ class DocumentProcessor:
         # Preprocess the text
         preprocessed_text = self.preprocess_text(text)
 
-        # Tokenize the text
-        sentences, words = self.tokenize_text(preprocessed_text)
+        # Tokenize the text, splitting sentences on the raw text
+        sentences, words = self.tokenize_text(preprocessed_text, raw_text=text)
 
         # Extract keywords
         keywords = self.extract_keywords(words, top_n=30)
@@ -102,35 +310,99 @@ class DocumentProcessor:
         Returns:
             str: Preprocessed text
         """
-        # Convert to lowercase
-        text = text.lower()
+        # Lowercase, remove special characters and numbers, and collapse
+        # whitespace in a single precompiled pass
+        return normalize_text(text)
 
-        # Remove special characters and numbers
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\d+', ' ', text)
+    def tokenize_text(self, text, raw_text=None):
+        """
+        Tokenize text into sentences and words.
 
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        Preprocessing strips all punctuation, so sentences are only meaningful
+        when the raw text is passed as well.
 
-        return text
+        Args:
+            text (str): Preprocessed text
+            raw_text (str): Raw text to split into sentences (defaults to text)
+
+        Returns:
+            tuple: (sentences, words)
+        """
+        sentences = self.tokenizer.tokenize_sentences(text if raw_text is None else raw_text)
+        return sentences, self.tokenize_words(text)
 
-    def tokenize_text(self, text):
+    def tokenize_words(self, text):
         """
-        Tokenize text into sentences and words.
+        Tokenize text into words without splitting it into sentences.
 
         Args:
             text (str): Preprocessed text
 
         Returns:
-            tuple: (sentences, words)
+            list: Words, without stopwords
         """
-        sentences = sent_tokenize(text)
-        words = word_tokenize(text)
+        stop_words = self.stop_words
+        return [word for word in self.tokenizer.tokenize_words(text) if word not in stop_words]
 
-        # Remove stopwords
-        filtered_words = [word for word in words if word not in self.stop_words]
+    def tokenize_ids(self, text):
+        """
+        Tokenize preprocessed text into an array of vocabulary IDs.
+
+        Stopwords are kept, since the vocabulary's masks filter them in one
+        vectorized step; Vocabulary.content_ids drops them when needed.
 
-        return sentences, filtered_words
+        Args:
+            text (str): Preprocessed text
+
+        Returns:
+            array.array: Token IDs in document order
+        """
+        return self.vocabulary.encode(self.tokenizer.tokenize_words(text))
+
+    def extract_keywords_from_ids(self, token_ids, top_n=50):
+        """
+        Extract keywords from a token-ID stream based on frequency.
+
+        Args:
+            token_ids (array.array): Token IDs from tokenize_ids
+            top_n (int): Number of top keywords to return
+
+        Returns:
+            list: Top keywords, identical to extract_keywords on the filtered words
+        """
+        return self.vocabulary.top_keywords(token_ids, top_n=top_n)
+
+    def counts_in_parallel(self, text):
+        """
+        Tell whether extract_keywords_parallel would split a text across workers.
+
+        Small texts (fewer than PARALLEL_COUNT_MIN_CHARS characters) are counted
+        in-process, since starting the workers would cost more than it saves.
+
+        Args:
+            text (str): Raw text content
+
+        Returns:
+            bool: True if count workers are configured and the text is large enough
+        """
+        return bool(self.count_workers and self.count_workers > 1 and len(text) >= PARALLEL_COUNT_MIN_CHARS)
+
+    def extract_keywords_parallel(self, text, top_n=50):
+        """
+        Extract keywords from raw text, counting shards of it across count_workers processes.
+
+        Normalization, tokenization and stopword filtering run in the workers, on
+        shards cut at whitespace and passed through shared memory.
+
+        Args:
+            text (str): Raw text content
+            top_n (int): Number of top keywords to return
+
+        Returns:
+            list: Top keywords, identical to extract_keywords on the filtered words
+        """
+        word_freq = count_in_parallel(text, self.count_workers or 1, tokenizer=self.tokenizer.name)
+        return self.top_keywords(word_freq, top_n=top_n)
 
     def extract_keywords(self, words, top_n=50):
         """
@@ -143,17 +415,89 @@ class DocumentProcessor:
         Returns:
             list: Top keywords
         """
-        # Count word frequencies
-        word_freq = {}
-        for word in words:
-            if len(word) > 3:  # Only consider words longer than 3 characters
-                if word in word_freq:
-                    word_freq[word] += 1
-                else:
-                    word_freq[word] = 1
+        # Count word frequencies, only considering words longer than 3 characters
+        word_freq = Counter(word for word in words if len(word) > 3)
+
+        return self.top_keywords(word_freq, top_n=top_n)
+
+    def count_keyword_candidates(self, chunks):
+        """
+        Count keyword candidates in a stream of raw text chunks.
 
-        # Sort by frequency
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
+        Normalization, tokenization and stopword filtering run chunk by chunk,
+        so memory grows with the vocabulary rather than with the document length.
 
-        # Return top N keywords
-        return [word for word, freq in sorted_words[:top_n]]
+        Args:
+            chunks (iterable): Raw text chunks, e.g. from iter_text_from_file
+
+        Returns:
+            collections.Counter: Frequency of each candidate, in order of first occurrence
+        """
+        word_freq = Counter()
+        stop_words = self.stop_words
+        tokenize_words = self.tokenizer.tokenize_words
+
+        for normalized in normalize_stream(chunks):
+            word_freq.update(word for word in tokenize_words(normalized)
+                             if len(word) > 3 and word not in stop_words)
+
+        return word_freq
+
+    def top_keywords(self, word_freq, top_n=50):
+        """
+        Select the most frequent words without sorting the whole vocabulary.
+
+        Ties keep their first-occurrence order, exactly as a stable sort would.
+
+        Args:
+            word_freq (dict): Word frequencies, in order of first occurrence
+            top_n (int): Number of top keywords to return
+
+        Returns:
+            list: Top keywords
+        """
+        return [word for word, freq in heapq.nlargest(top_n, word_freq.items(), key=itemgetter(1))]
+
+    def stream_keywords(self, file_path, top_n=30):
+        """
+        Extract keywords from a document with the streaming pipeline.
+
+        Args:
+            file_path (str): Path to the document file
+            top_n (int): Number of top keywords to return
+
+        Returns:
+            list: Top keywords, identical to the non-streaming pipeline
+        """
+        word_freq = self.count_keyword_candidates(self.iter_text_from_file(file_path))
+        return self.top_keywords(word_freq, top_n=top_n)
+
+    def extract_keyphrases(self, tokens, top_n=30):
+        """
+        Extract multi-word keyphrases and single keywords from a token stream.
+
+        Args:
+            tokens (iterable): Preprocessed tokens before stopword removal, since
+                stopwords mark the phrase boundaries
+            top_n (int): Number of keyphrases to return
+
+        Returns:
+            list: Top keyphrases, best first
+        """
+        return self.keyphrase_extractor.extract(tokens, self.stop_words, top_n=top_n)
+
+    def stream_keyphrases(self, file_path, top_n=30):
+        """
+        Extract keyphrases from a document with the streaming pipeline.
+
+        Args:
+            file_path (str): Path to the document file
+            top_n (int): Number of keyphrases to return
+
+        Returns:
+            list: Top keyphrases, identical to extract_keyphrases on the whole text
+        """
+        tokenize_words = self.tokenizer.tokenize_words
+        tokens = (token for normalized in normalize_stream(self.iter_text_from_file(file_path))
+                  for token in tokenize_words(normalized))
+        return self.extract_keyphrases(tokens, top_n=top_n)
@@ -0,0 +1,101 @@
+"""
+DOCX Reader Module
+This module streams the text of a DOCX file straight from its zip container.
+
+word/document.xml is decompressed in blocks and fed to an incremental XML
+parser whose target receives the start/end/data callbacks directly, so no
+element tree is built at all. Each paragraph (including the paragraphs inside
+table cells) is yielded as soon as it ends, and memory stays flat no matter
+how large the document is.
+"""
+
+import zipfile
+from xml.etree.ElementTree import XMLParser
+
+_WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_PARAGRAPH = _WORD_NAMESPACE + 'p'
+_RUN = _WORD_NAMESPACE + 'r'
+_TEXT = _WORD_NAMESPACE + 't'
+
+# Run content rendered as whitespace, as python-docx renders it
+_RUN_BREAKS = {
+    _WORD_NAMESPACE + 'tab': '\t',
+    _WORD_NAMESPACE + 'br': '\n',
+    _WORD_NAMESPACE + 'cr': '\n'
+}
+
+# Compressed XML is read from the zip in blocks of this many bytes
+_READ_BLOCK_SIZE = 1 << 16
+
+
+class _ParagraphCollector:
+    """XMLParser target that collects the text of each paragraph as it ends."""
+
+    def __init__(self):
+        """Initialize the collector."""
+        self.paragraphs = []
+        # Text parts of the innermost open paragraph, and of the enclosing ones
+        # (text boxes can nest paragraphs inside a paragraph)
+        self._parts = []
+        self._open = []
+        self._run_depth = 0
+        self._in_text = False
+
+    def start(self, tag, attrib):
+        """Handle an opening tag."""
+        if tag == _TEXT:
+            self._in_text = True
+        elif tag == _RUN:
+            self._run_depth += 1
+        elif tag == _PARAGRAPH:
+            self._open.append(self._parts)
+            self._parts = []
+        elif self._run_depth and tag in _RUN_BREAKS:
+            # Tab stops in paragraph properties share the tag, but only run content counts
+            self._parts.append(_RUN_BREAKS[tag])
+
+    def end(self, tag):
+        """Handle a closing tag."""
+        if tag == _TEXT:
+            self._in_text = False
+        elif tag == _RUN:
+            self._run_depth -= 1
+        elif tag == _PARAGRAPH:
+            self.paragraphs.append(''.join(self._parts))
+            self._parts = self._open.pop()
+
+    def data(self, data):
+        """Handle character data, keeping only the text of runs."""
+        if self._in_text:
+            self._parts.append(data)
+
+    def close(self):
+        """Finish parsing."""
+        return None
+
+
+def iter_docx_paragraphs(file_path):
+    """
+    Stream the paragraphs of a DOCX document in document order.
+
+    Table cells are read too: every paragraph inside a cell is yielded as its
+    own paragraph, in row order.
+
+    Args:
+        file_path (str): Path to the DOCX file
+
+    Yields:
+        str: Text of each paragraph
+    """
+    collector = _ParagraphCollector()
+    parser = XMLParser(target=collector)
+
+    with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as document:
+        for block in iter(lambda: document.read(_READ_BLOCK_SIZE), b''):
+            parser.feed(block)
+            if collector.paragraphs:
+                yield from collector.paragraphs
+                collector.paragraphs = []
+
+    parser.close()
+    yield from collector.paragraphs
@@ -0,0 +1,136 @@
+"""
+Embedding Cache Module
+This module provides a persistent cache for term embeddings, so each keyword is
+only run through the embedding model once per model.
+
+Vectors are keyed by the model's fingerprint and the term, and stored as raw
+float32 bytes. The cache is a single SQLite database, which makes it safe to
+share between worker processes; least recently used terms are evicted once the
+entry cap is reached.
+"""
+
+import os
+import time
+import sqlite3
+
+import numpy as np
+
+# Default entry cap for the cache (about 300 MB for 384-dimensional vectors)
+DEFAULT_MAX_ENTRIES = 200000
+
+# Terms per SELECT, below SQLite's limit on bound parameters
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    term TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (model, term)
+);
+CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access);
+"""
+
+
+class EmbeddingCache:
+    """Class for caching term embeddings on disk."""
+
+    def __init__(self, cache_dir, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache, creating the database if needed.
+
+        Args:
+            cache_dir (str): Directory holding the cache database
+            max_entries (int): Entry cap; least recently used terms are evicted above it
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "embeddings.sqlite3")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        # Autocommit mode; writes that must be atomic use explicit transactions
+        self._connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def get_many(self, model_id, terms):
+        """
+        Look up the cached embeddings of several terms, marking them as recently used.
+
+        Args:
+            model_id (str): Fingerprint of the embedding model
+            terms (list): Distinct terms
+
+        Returns:
+            dict: Term -> embedding (numpy.ndarray) for every cached term
+        """
+        found = {}
+        for start in range(0, len(terms), _LOOKUP_BATCH):
+            batch = terms[start:start + _LOOKUP_BATCH]
+            placeholders = ", ".join("?" * len(batch))
+            for term, vector in self._connection.execute(
+                    f"SELECT term, vector FROM embeddings WHERE model = ? AND term IN ({placeholders})",
+                    (model_id, *batch)):
+                found[term] = np.frombuffer(vector, dtype=np.float32)
+
+        if found:
+            now = time.time()
+            self._connection.executemany(
+                "UPDATE embeddings SET last_access = ? WHERE model = ? AND term = ?",
+                [(now, model_id, term) for term in found]
+            )
+        self.hits += len(found)
+        self.misses += len(terms) - len(found)
+        return found
+
+    def put_many(self, model_id, embeddings):
+        """
+        Store several embeddings, evicting least recently used terms if the cache is over its cap.
+
+        Args:
+            model_id (str): Fingerprint of the embedding model
+            embeddings (dict): Term -> embedding (numpy.ndarray)
+        """
+        if not embeddings:
+            return
+
+        now = time.time()
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, term, vector, last_access) VALUES (?, ?, ?, ?)",
+                [(model_id, term, np.asarray(vector, dtype=np.float32).tobytes(), now)
+                 for term, vector in embeddings.items()]
+            )
+            self._evict()
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits its cap."""
+        connection = self._connection
+        excess = connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+        if excess > 0:
+            connection.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY last_access LIMIT ?)",
+                (excess,)
+            )
+
+    def __len__(self):
+        """Return the number of cached embeddings, across all models."""
+        return self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def clear(self):
+        """Remove every cached embedding."""
+        self._connection.execute("DELETE FROM embeddings")
+
+    def close(self):
+        """Close the database connection."""
+        self._connection.close()
@@ -0,0 +1,259 @@
+"""
+File Index Module
+This module keeps a persistent index of processed documents (path, modification
+time, size, content hash and the key of the pipeline parameters), so a directory
+can be re-scanned cheaply and only new or changed documents are processed again.
+
+A scan stats every file and compares the result with the index; the content is
+only hashed when the modification time or size changed, so rescanning an
+unchanged tree costs one stat call per file. Files that were merely touched
+(same hash) are not reprocessed. The index is a single SQLite database.
+"""
+
+import os
+import glob
+import time
+import fnmatch
+import sqlite3
+from utils.result_cache import file_digest
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    params_key TEXT,
+    output_name TEXT NOT NULL UNIQUE,
+    error TEXT,
+    processed_at REAL NOT NULL
+);
+"""
+
+
+def root_base(root):
+    """
+    Return the directory or file a scan root stands for.
+
+    Args:
+        root (str): File, directory or glob pattern
+
+    Returns:
+        str: The root itself, or the directory before the first glob component
+    """
+    if not glob.has_magic(root):
+        return root
+    parts = []
+    for part in root.split(os.sep):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return os.sep.join(parts) or os.curdir
+
+
+def missing_roots(roots):
+    """
+    Find the scan roots that do not exist, e.g. an unmounted or mistyped directory.
+
+    Args:
+        roots (list): Files, directories or glob patterns
+
+    Returns:
+        list: Roots whose file or base directory is missing
+    """
+    return [root for root in roots if not os.path.exists(root_base(root))]
+
+
+def _under_root(path, root):
+    """Return True if an absolute path is the root, lies below it or matches its pattern."""
+    if glob.has_magic(root):
+        return fnmatch.fnmatch(path, root)
+    return path == root or path.startswith(os.path.join(root, ''))
+
+
+class FileState:
+    """Stat and content hash of one document, as seen by a scan."""
+
+    __slots__ = ('path', 'mtime_ns', 'size', 'digest')
+
+    def __init__(self, path, mtime_ns, size, digest):
+        """Initialize the file state."""
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+
+
+class ScanResult:
+    """Outcome of one scan: the documents to process and the ones to forget."""
+
+    def __init__(self, changed, deleted, settling, unchanged):
+        """
+        Initialize the scan result.
+
+        Args:
+            changed (list): FileState of every new or changed document
+            deleted (list): (path, output_name) of every indexed document that is gone
+            settling (list): Paths modified too recently, left for a later scan
+            unchanged (int): Number of documents that did not need processing
+        """
+        self.changed = changed
+        self.deleted = deleted
+        self.settling = settling
+        self.unchanged = unchanged
+
+
+class FileIndex:
+    """Class for tracking which documents have been processed, and in which version."""
+
+    def __init__(self, path):
+        """
+        Open the index, creating the database if needed.
+
+        Args:
+            path (str): Path of the index database
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(files)")}
+        if 'params_key' not in columns:
+            # Indexes from before the parameters were recorded; their rows count as changed
+            self._connection.execute("ALTER TABLE files ADD COLUMN params_key TEXT")
+
+    def __len__(self):
+        """Return the number of indexed documents."""
+        return self._connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def scan(self, file_paths, settle=0.0, roots=(), params_key=None):
+        """
+        Compare the documents on disk with the index.
+
+        An indexed document only counts as deleted when it lies under one of the
+        scanned roots and no longer exists, so documents indexed from other
+        inputs are left alone.
+
+        Args:
+            file_paths (list): Paths of every document that currently exists
+            settle (float): Seconds a document must stay unmodified before it is
+                processed, so a burst of writes to the same file is handled once
+            roots (list): Files, directories or glob patterns the paths were collected
+                from (no document is reported deleted without them)
+            params_key (str): Key of the pipeline version and result parameters;
+                documents processed with other parameters count as changed
+
+        Returns:
+            ScanResult: New or changed documents, deleted documents and documents
+                still settling
+        """
+        indexed = {
+            path: (mtime_ns, size, digest, output_name, indexed_params_key)
+            for path, mtime_ns, size, digest, output_name, indexed_params_key in
+            self._connection.execute("SELECT path, mtime_ns, size, digest, output_name, params_key FROM files")
+        }
+        now_ns = time.time_ns()
+        settle_ns = int(settle * 1e9)
+
+        changed = []
+        settling = []
+        seen = set()
+        unchanged = 0
+        for path in file_paths:
+            path = os.path.abspath(path)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                # Deleted between listing and scanning; the next scan forgets it
+                continue
+            seen.add(path)
+
+            previous = indexed.get(path)
+            if previous is not None and previous[4] != params_key:
+                # Processed by another pipeline version or with other options
+                previous = None
+            if previous is not None and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                unchanged += 1
+                continue
+            if now_ns - stat.st_mtime_ns < settle_ns:
+                settling.append(path)
+                continue
+
+            digest = file_digest(path)
+            if previous is not None and previous[2] == digest:
+                # Touched or copied over with the same content: just remember the new stat
+                self._connection.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                                         (stat.st_mtime_ns, stat.st_size, path))
+                unchanged += 1
+                continue
+            changed.append(FileState(path, stat.st_mtime_ns, stat.st_size, digest))
+
+        roots = [os.path.abspath(root) for root in roots]
+        deleted = [(path, entry[3]) for path, entry in indexed.items()
+                   if path not in seen and any(_under_root(path, root) for root in roots)
+                   and not os.path.exists(path)]
+        return ScanResult(changed, deleted, settling, unchanged)
+
+    def output_name(self, path, reserved=()):
+        """
+        Return the stable output name of a document, allocating one if it is new.
+
+        Names are the file name without its extension, with a numeric suffix when
+        another indexed document already uses it.
+
+        Args:
+            path (str): Absolute document path
+            reserved (set): Names allocated to other documents that are not recorded yet
+
+        Returns:
+            str: Output name, unique within the index
+        """
+        row = self._connection.execute("SELECT output_name FROM files WHERE path = ?", (path,)).fetchone()
+        if row is not None:
+            return row[0]
+
+        base = os.path.splitext(os.path.basename(path))[0]
+        name, suffix = base, 1
+        while name in reserved or self._connection.execute(
+                "SELECT 1 FROM files WHERE output_name = ?", (name,)).fetchone():
+            suffix += 1
+            name = f"{base}_{suffix}"
+        return name
+
+    def record(self, state, output_name, params_key=None, error=None):
+        """
+        Mark a document as processed in the scanned version.
+
+        Failed documents are recorded too, with their error, so they are only
+        retried once they change.
+
+        Args:
+            state (FileState): The document as seen by the scan
+            output_name (str): Output name from output_name()
+            params_key (str): Key of the pipeline parameters the document was processed with
+            error (str): Error message if processing failed
+        """
+        self._connection.execute(
+            "INSERT INTO files (path, mtime_ns, size, digest, params_key, output_name, error, processed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (path) DO UPDATE SET mtime_ns = excluded.mtime_ns, size = excluded.size, "
+            "digest = excluded.digest, params_key = excluded.params_key, error = excluded.error, "
+            "processed_at = excluded.processed_at",
+            (state.path, state.mtime_ns, state.size, state.digest, params_key, output_name, error, time.time())
+        )
+
+    def forget(self, path):
+        """
+        Remove a deleted document from the index.
+
+        Args:
+            path (str): Absolute document path
+        """
+        self._connection.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def close(self):
+        """Close the database connection."""
+        self._connection.close()
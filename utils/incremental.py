@@ -0,0 +1,246 @@
+"""
+Incremental Analysis Module
+This module re-analyzes edited course content paragraph by paragraph.
+
+The content is split into paragraphs at line breaks, and each paragraph's word
+counts are cached by a hash of its text. When the content changes, only the new
+or edited paragraphs are preprocessed and tokenized, and the global frequency
+table is updated by the counts of the paragraphs that were removed and added, so
+the cost of a re-analysis tracks the size of the edit rather than the size of
+the document.
+
+Paragraphs are cut only at whitespace, which normalization turns into word
+boundaries anyway, so the words, counts and keywords are identical to analyzing
+the whole text at once. They are also cut only where the default regex tokenizer
+ends a sentence (a blank line, or a line break after '.', '!' or '?'), so the
+sentence counts are identical too.
+"""
+
+import heapq
+import hashlib
+from collections import Counter
+from operator import itemgetter
+from utils.instrumentation import Instrumentation
+
+# Characters that end a sentence, and the closing quotes or brackets that may follow them
+_SENTENCE_ENDS = '.!?'
+_CLOSING_MARKS = '\'")]'
+
+
+def split_paragraphs(text):
+    """
+    Split text into paragraphs at blank lines and at line breaks after a sentence end.
+
+    Both are always sentence boundaries for the regex tokenizer. Lines without a
+    sentence end (such as headings) stay with the lines that follow them.
+
+    Args:
+        text (str): Raw text content
+
+    Returns:
+        list: Raw paragraphs in document order, without the blank lines
+    """
+    paragraphs = []
+    lines = []
+    for line in text.split('\n'):
+        stripped = line.rstrip()
+        if not stripped:
+            if lines:
+                paragraphs.append('\n'.join(lines))
+                lines = []
+            continue
+
+        lines.append(line)
+        if stripped[-1] in _SENTENCE_ENDS or (stripped[-1] in _CLOSING_MARKS and len(stripped) > 1
+                                              and stripped[-2] in _SENTENCE_ENDS):
+            paragraphs.append('\n'.join(lines))
+            lines = []
+
+    if lines:
+        paragraphs.append('\n'.join(lines))
+    return paragraphs
+
+
+def paragraph_digest(paragraph):
+    """
+    Compute the cache key of a paragraph.
+
+    Args:
+        paragraph (str): Raw paragraph text
+
+    Returns:
+        bytes: 16-byte BLAKE2b digest of the UTF-8 encoded paragraph
+    """
+    return hashlib.blake2b(paragraph.encode('utf-8'), digest_size=16).digest()
+
+
+class _ParagraphAnalysis:
+    """Cached analysis of one paragraph."""
+
+    __slots__ = ('counts', 'total_words', 'total_sentences')
+
+    def __init__(self, counts, total_words, total_sentences):
+        """Initialize the analysis."""
+        # Filtered word counts, in order of first occurrence in the paragraph
+        self.counts = counts
+        self.total_words = total_words
+        self.total_sentences = total_sentences
+
+
+class IncrementalAnalyzer:
+    """Class for re-analyzing edited text by recomputing only the changed paragraphs."""
+
+    def __init__(self, doc_processor, min_keyword_length=4, instrumentation=None):
+        """
+        Initialize the incremental analyzer.
+
+        Args:
+            doc_processor (DocumentProcessor): Preprocesses and tokenizes each paragraph
+            min_keyword_length (int): Minimum word length to count as a keyword
+                (4 matches DocumentProcessor.extract_keywords)
+            instrumentation (Instrumentation): Times the analysis stages and counts
+                the paragraphs reused and re-analyzed
+        """
+        self.doc_processor = doc_processor
+        self.min_keyword_length = min_keyword_length
+        self.instrumentation = instrumentation or Instrumentation()
+        # Paragraph digest -> _ParagraphAnalysis, for the paragraphs of the current text
+        self._cache = {}
+        # Digests of the current text's paragraphs, in document order
+        self._paragraphs = []
+        # Global filtered word counts and totals, updated by deltas
+        self.word_freq = Counter()
+        self.total_words = 0
+        self.total_sentences = 0
+
+    def _analyze_paragraph(self, paragraph):
+        """Preprocess, tokenize and count one paragraph."""
+        preprocessed_text = self.doc_processor.preprocess_text(paragraph)
+        sentences, words = self.doc_processor.tokenize_text(preprocessed_text, raw_text=paragraph)
+        return _ParagraphAnalysis(Counter(words), len(words), len(sentences))
+
+    def _apply(self, analysis, sign):
+        """Add (sign=1) or remove (sign=-1) a paragraph's counts from the global table."""
+        word_freq = self.word_freq
+        if sign > 0:
+            word_freq.update(analysis.counts)
+        else:
+            for word, freq in analysis.counts.items():
+                remaining = word_freq[word] - freq
+                if remaining:
+                    word_freq[word] = remaining
+                else:
+                    del word_freq[word]
+        self.total_words += sign * analysis.total_words
+        self.total_sentences += sign * analysis.total_sentences
+
+    def update(self, text):
+        """
+        Bring the analysis up to date with the edited text.
+
+        Args:
+            text (str): Full raw text after the edit
+
+        Returns:
+            dict: Number of paragraphs, and how many were re-analyzed and reused
+        """
+        instrumentation = self.instrumentation
+
+        with instrumentation.stage('split_paragraphs'):
+            paragraphs = {}
+            digests = []
+            for paragraph in split_paragraphs(text):
+                digest = paragraph_digest(paragraph)
+                paragraphs.setdefault(digest, paragraph)
+                digests.append(digest)
+
+        with instrumentation.stage('analyze_paragraphs'):
+            old_digests = Counter(self._paragraphs)
+            new_digests = Counter(digests)
+            cache = self._cache
+
+            analyzed = 0
+            for digest, occurrences in (new_digests - old_digests).items():
+                analysis = cache.get(digest)
+                if analysis is None:
+                    analysis = cache[digest] = self._analyze_paragraph(paragraphs[digest])
+                    analyzed += 1
+                for _ in range(occurrences):
+                    self._apply(analysis, 1)
+
+            for digest, occurrences in (old_digests - new_digests).items():
+                for _ in range(occurrences):
+                    self._apply(cache[digest], -1)
+
+            # Only paragraphs of the current text stay cached
+            for digest in old_digests.keys() - new_digests.keys():
+                del cache[digest]
+            self._paragraphs = digests
+
+        instrumentation.count('paragraphs', len(digests))
+        instrumentation.count('paragraphs_analyzed', analyzed)
+        return {
+            'paragraphs': len(digests),
+            'analyzed': analyzed,
+            'reused': len(digests) - analyzed
+        }
+
+    def top_keywords(self, top_n=30):
+        """
+        Select the most frequent keywords of the current text.
+
+        Ties are ordered by first occurrence in the document, exactly as
+        DocumentProcessor.extract_keywords orders them; first occurrences are
+        only looked up for the words that can make the top_n.
+
+        Args:
+            top_n (int): Number of top keywords to return
+
+        Returns:
+            list: Top keywords, identical to extract_keywords on the whole text
+        """
+        min_length = self.min_keyword_length
+        eligible = [(word, freq) for word, freq in self.word_freq.items() if len(word) >= min_length]
+        if not eligible or top_n <= 0:
+            return []
+
+        # Every word at least as frequent as the top_n-th word may be selected
+        top = heapq.nlargest(top_n, eligible, key=itemgetter(1))
+        threshold = top[-1][1] if len(top) == top_n else 0
+        candidates = {word: freq for word, freq in eligible if freq >= threshold}
+
+        # Rank the candidates by first occurrence, scanning paragraphs in document order
+        first_seen = {}
+        for digest in self._paragraphs:
+            for word in self._cache[digest].counts:
+                if word in candidates and word not in first_seen:
+                    first_seen[word] = len(first_seen)
+            if len(first_seen) == len(candidates):
+                break
+
+        ranked = sorted(candidates, key=lambda word: (-candidates[word], first_seen[word]))
+        return ranked[:top_n]
+
+    def analyze(self, text, top_n=30):
+        """
+        Update the analysis with the edited text and summarize it.
+
+        Args:
+            text (str): Full raw text after the edit
+            top_n (int): Number of top keywords to return
+
+        Returns:
+            dict: Text statistics, extracted keywords and paragraph reuse counts
+        """
+        paragraphs = self.update(text)
+
+        with self.instrumentation.stage('extract_keywords'):
+            keywords = self.top_keywords(top_n=top_n)
+
+        return {
+            'total_words': self.total_words,
+            'unique_words': len(self.word_freq),
+            'total_sentences': self.total_sentences,
+            'keywords': keywords,
+            'paragraphs': paragraphs
+        }
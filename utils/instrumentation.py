@@ -0,0 +1,157 @@
+"""
+Instrumentation Module
+This module records per-stage timings, counters (pages, tokens, keywords) and,
+optionally, peak memory for the pipeline, as a list of structured trace events.
+
+A disabled Instrumentation hands out one shared no-op context manager and
+returns from count() immediately, so instrumented code costs next to nothing
+when profiling is off.
+"""
+
+import json
+import time
+import contextlib
+
+# Shared no-op stage, returned whenever instrumentation is disabled
+_NULL_STAGE = contextlib.nullcontext()
+
+
+class Instrumentation:
+    """Class for collecting stage timings, counters and peak memory as trace events."""
+
+    def __init__(self, enabled=False, trace_memory=False):
+        """
+        Initialize the instrumentation.
+
+        Args:
+            enabled (bool): Record events (when False every call is a no-op)
+            trace_memory (bool): Also record each stage's peak memory with tracemalloc,
+                which slows allocation-heavy stages down noticeably
+        """
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.events = []
+        self.counters = {}
+        self.document_path = None
+
+    def stage(self, name):
+        """
+        Time a pipeline stage.
+
+        Stages should not be nested when tracing memory, since each stage resets
+        the tracemalloc peak.
+
+        Args:
+            name (str): Stage name
+
+        Returns:
+            Context manager that records a 'stage' event when the stage ends
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._timed_stage(name)
+
+    @contextlib.contextmanager
+    def _timed_stage(self, name):
+        """Record the duration (and peak memory) of the enclosed block."""
+        tracemalloc = None
+        if self.trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            event = {
+                'event': 'stage',
+                'document': self.document_path,
+                'stage': name,
+                'seconds': time.perf_counter() - start
+            }
+            if tracemalloc is not None:
+                event['peak_bytes'] = tracemalloc.get_traced_memory()[1] - baseline
+            self.events.append(event)
+
+    def count(self, name, value=1):
+        """
+        Add to a counter of the current document, e.g. pages, tokens or keywords.
+
+        Args:
+            name (str): Counter name
+            value (int): Amount to add
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextlib.contextmanager
+    def document(self, file_path):
+        """
+        Attribute the enclosed stages and counters to one document.
+
+        Records a 'document' event with the total time and the counters when the
+        block ends.
+
+        Args:
+            file_path (str): Path of the document being processed
+        """
+        if not self.enabled:
+            yield
+            return
+
+        self.document_path = file_path
+        self.counters = {}
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.append({
+                'event': 'document',
+                'document': file_path,
+                'seconds': time.perf_counter() - start,
+                'counters': self.counters
+            })
+            self.document_path = None
+            self.counters = {}
+
+    def drain(self):
+        """
+        Return the recorded events and start a new trace.
+
+        Returns:
+            list: Trace events, in the order they were recorded
+        """
+        events, self.events = self.events, []
+        return events
+
+    def stage_totals(self, events=None):
+        """
+        Sum the recorded stage times by stage name.
+
+        Args:
+            events (list): Events to summarize (defaults to the recorded events)
+
+        Returns:
+            dict: Stage name -> total seconds, in order of first occurrence
+        """
+        totals = {}
+        for event in self.events if events is None else events:
+            if event['event'] == 'stage':
+                totals[event['stage']] = totals.get(event['stage'], 0.0) + event['seconds']
+        return totals
+
+
+def write_trace(events, file):
+    """
+    Write trace events as JSON lines.
+
+    Args:
+        events (list): Trace events from Instrumentation.drain
+        file: Open text file to append to
+    """
+    for event in events:
+        file.write(json.dumps(event) + "\n")
+    file.flush()
@@ -0,0 +1,152 @@
+"""
+Keyphrases Module
+This module extracts multi-word keyphrases ("machine learning") as well as single
+keywords from a token stream.
+
+Candidates are n-grams of up to four words that never cross a stopword, so
+"analysis of algorithms" yields "analysis" and "algorithms" but no phrase
+spanning "of". N-grams are counted as tuples of integer token IDs, which avoids
+building a string for every window, and rare n-grams are pruned whenever the
+candidate table grows past its cap, so memory stays bounded on book-length input.
+"""
+
+import heapq
+from collections import Counter, deque
+from operator import itemgetter
+
+
+class KeyphraseExtractor:
+    """Class for counting stopword-bounded n-grams and ranking them as keyphrases."""
+
+    def __init__(self, max_n=4, min_count=2, min_word_length=4, max_candidates=200000):
+        """
+        Initialize the keyphrase extractor.
+
+        Args:
+            max_n (int): Longest phrase, in words
+            min_count (int): Minimum number of occurrences for a multi-word phrase
+            min_word_length (int): Minimum length of a single-word keyword
+            max_candidates (int): Number of distinct multi-word n-grams kept before
+                rare ones are pruned
+        """
+        self.max_n = max_n
+        self.min_count = min_count
+        self.min_word_length = min_word_length
+        self.max_candidates = max_candidates
+
+    def count_ngrams(self, tokens, stop_words):
+        """
+        Count stopword-bounded n-grams in a single pass over the tokens.
+
+        Single words are counted exactly. Whenever more than max_candidates
+        multi-word n-grams are held, the n-grams seen no more than a floor are
+        pruned, with the floor raised until at most half of the cap is left, so
+        every scan of the table is paid for by max_candidates / 2 new n-grams.
+        Counts of phrases that only become frequent late in a very long document
+        can be underestimated.
+
+        Args:
+            tokens (iterable): Preprocessed tokens, with stopwords still in place
+            stop_words (set): Words that end a phrase
+
+        Returns:
+            tuple: (Counter of token-ID tuples in order of first occurrence, list
+                mapping token IDs back to words)
+        """
+        ids = {}
+        words = []
+        counts = Counter()
+        window = deque(maxlen=self.max_n)
+        min_word_length = self.min_word_length
+        floor = 0
+        phrases_held = 0
+
+        for token in tokens:
+            if token in stop_words:
+                window.clear()
+                continue
+
+            token_id = ids.get(token)
+            if token_id is None:
+                token_id = ids[token] = len(words)
+                words.append(token)
+            window.append(token_id)
+
+            # Every n-gram ending at this token: the token alone, then longer suffixes
+            if len(token) >= min_word_length:
+                counts[(token_id,)] += 1
+            recent = tuple(window)
+            for start in range(len(recent) - 1):
+                ngram = recent[start:]
+                if ngram not in counts:
+                    phrases_held += 1
+                counts[ngram] += 1
+
+            if phrases_held > self.max_candidates:
+                floor, phrases_held = self._prune(counts, floor)
+
+        return counts, words
+
+    def _prune(self, counts, floor):
+        """Drop the rarest multi-word n-grams until at most half of max_candidates are left."""
+        frequencies = Counter(count for key, count in counts.items() if len(key) > 1)
+        held = sum(frequencies.values())
+        target = self.max_candidates // 2
+        for count in sorted(frequencies):
+            # N-grams at or below the previous floor always go
+            if count > floor and held <= target:
+                break
+            floor = max(floor, count)
+            held -= frequencies[count]
+
+        for key in [key for key, count in counts.items() if len(key) > 1 and count <= floor]:
+            del counts[key]
+        return floor, held
+
+    def score(self, counts):
+        """
+        Score n-grams by frequency and length, discounting nested occurrences.
+
+        A phrase's score is its length times the number of occurrences not
+        explained by a longer phrase that contains it, so "machine" and
+        "learning" drop out when they only ever occur inside "machine learning".
+
+        Args:
+            counts (Counter): N-gram counts from count_ngrams
+
+        Returns:
+            dict: Score of each n-gram worth keeping, in order of first occurrence
+        """
+        min_count = self.min_count
+        # Most frequent qualifying phrase one word longer that contains each n-gram
+        nested = {}
+        for key, count in counts.items():
+            if len(key) > 1 and count >= min_count:
+                for part in (key[:-1], key[1:]):
+                    if count > nested.get(part, 0):
+                        nested[part] = count
+
+        scores = {}
+        for key, count in counts.items():
+            if len(key) > 1 and count < min_count:
+                continue
+            independent = count - nested.get(key, 0)
+            if independent > 0:
+                scores[key] = independent * len(key)
+        return scores
+
+    def extract(self, tokens, stop_words, top_n=30):
+        """
+        Extract the top keyphrases from a token stream.
+
+        Args:
+            tokens (iterable): Preprocessed tokens, with stopwords still in place
+            stop_words (set): Words that end a phrase
+            top_n (int): Number of keyphrases to return
+
+        Returns:
+            list: Keyphrases, best first; ties keep their first-occurrence order
+        """
+        counts, words = self.count_ngrams(tokens, stop_words)
+        best = heapq.nlargest(top_n, self.score(counts).items(), key=itemgetter(1))
+        return [' '.join(words[token_id] for token_id in key) for key, _ in best]
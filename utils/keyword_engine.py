@@ -0,0 +1,179 @@
+"""
+Keyword Engine Module
+This module ranks keywords across a whole corpus with TF-IDF, so terms that
+appear in every syllabus (such as "course" or "students") stop dominating.
+
+Term IDs come from a Vocabulary, which can be shared with the DocumentProcessor
+so documents already encoded as token-ID arrays are fitted without touching a
+single string.
+"""
+
+from array import array
+
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+from utils.vocabulary import Vocabulary, as_id_array
+
+
+class CorpusKeywordEngine:
+    """Class for corpus-level TF-IDF keyword ranking on a sparse document-term matrix."""
+
+    def __init__(self, min_length=4, sublinear_tf=False, vocabulary=None):
+        """
+        Initialize the keyword engine.
+
+        Args:
+            min_length (int): Minimum word length to count as a keyword
+                (4 matches DocumentProcessor.extract_keywords)
+            sublinear_tf (bool): Use 1 + log(tf) instead of raw term counts
+            vocabulary (Vocabulary): Vocabulary to share, e.g. a DocumentProcessor's;
+                its stopwords and minimum length decide which terms count
+        """
+        self.sublinear_tf = sublinear_tf
+        self.vocabulary = vocabulary or Vocabulary(min_length=min_length)
+        self.min_length = self.vocabulary.min_length
+        self._counts = None
+        self._document_frequency = np.zeros(0, dtype=np.int64)
+
+    @property
+    def terms(self):
+        """list: Term for every term id (the vocabulary's tokens)."""
+        return self.vocabulary.tokens
+
+    @property
+    def n_documents(self):
+        """Number of documents fitted so far."""
+        return 0 if self._counts is None else self._counts.shape[0]
+
+    def fit(self, documents):
+        """
+        Build the document-term matrix from scratch.
+
+        Args:
+            documents (list): One list of (filtered) words, or one mapping of word
+                to count, per document
+
+        Returns:
+            CorpusKeywordEngine: The fitted engine
+        """
+        self._counts = None
+        self._document_frequency = np.zeros(0, dtype=np.int64)
+        return self.partial_fit(documents)
+
+    def partial_fit(self, documents):
+        """
+        Add documents to the corpus without recounting the existing ones.
+
+        New terms extend the vocabulary; only the new rows are counted and the
+        document frequencies are updated in place.
+
+        Args:
+            documents (list): One list of (filtered) words, one mapping of word to
+                count, or one array of token IDs from the shared vocabulary, per document
+
+        Returns:
+            CorpusKeywordEngine: The updated engine
+        """
+        vocabulary = self.vocabulary
+        rows = [np.zeros(0, dtype=np.int64)]
+        columns = [np.zeros(0, dtype=np.int64)]
+        values = [np.zeros(0, dtype=np.float64)]
+
+        for row, document in enumerate(documents):
+            if isinstance(document, dict):
+                # Counted already, e.g. by a worker process: one entry per distinct word
+                counts = np.fromiter(document.values(), dtype=np.float64, count=len(document))
+                document = vocabulary.encode(document)
+            else:
+                counts = None
+                if not isinstance(document, (array, np.ndarray)):
+                    document = vocabulary.encode(document)
+            token_ids = as_id_array(document)
+            # Stopwords and short words are dropped with one mask lookup
+            keep = vocabulary.keyword_mask[token_ids]
+            token_ids = token_ids[keep]
+            rows.append(np.full(len(token_ids), row, dtype=np.int64))
+            columns.append(token_ids.astype(np.int64))
+            values.append(counts[keep] if counts is not None else np.ones(len(token_ids), dtype=np.float64))
+
+        rows = np.concatenate(rows)
+        columns = np.concatenate(columns)
+        num_terms = len(vocabulary)
+        # Duplicate (row, column) pairs are summed into term counts
+        block = sparse.csr_matrix(
+            (np.concatenate(values), (np.asarray(rows, dtype=np.int64),
+                                      np.asarray(columns, dtype=np.int64))),
+            shape=(len(documents), num_terms)
+        )
+        block.sum_duplicates()
+
+        # Every stored entry in a row is a distinct term, so bincount gives document frequencies
+        document_frequency = np.zeros(num_terms, dtype=np.int64)
+        document_frequency[:len(self._document_frequency)] = self._document_frequency
+        document_frequency += np.bincount(block.indices, minlength=num_terms)
+        self._document_frequency = document_frequency
+
+        if self._counts is None:
+            self._counts = block
+        else:
+            self._counts.resize((self._counts.shape[0], num_terms))
+            self._counts = sparse.vstack([self._counts, block], format='csr')
+
+        return self
+
+    def idf(self):
+        """
+        Compute smoothed inverse document frequencies for the whole vocabulary.
+
+        Returns:
+            numpy.ndarray: IDF weight per term id
+        """
+        n_documents = self.n_documents
+        return np.log((1.0 + n_documents) / (1.0 + self._document_frequency)) + 1.0
+
+    def tfidf_matrix(self):
+        """
+        Compute the L2-normalized TF-IDF matrix for every fitted document.
+
+        Returns:
+            scipy.sparse.csr_matrix: Documents x terms TF-IDF weights
+        """
+        if self._counts is None:
+            return sparse.csr_matrix((0, 0))
+
+        term_frequency = self._counts.copy()
+        if self.sublinear_tf:
+            np.log(term_frequency.data, out=term_frequency.data)
+            term_frequency.data += 1.0
+
+        weighted = term_frequency @ sparse.diags(self.idf())
+        return normalize(weighted.tocsr(), norm='l2', copy=False)
+
+    def top_keywords(self, top_n=30):
+        """
+        Return the top TF-IDF keywords for every document in one batched call.
+
+        Args:
+            top_n (int): Number of keywords to return per document
+
+        Returns:
+            list: One list of keywords per document, best first
+        """
+        if self._counts is None:
+            return []
+
+        weights = self.tfidf_matrix()
+        weights.sort_indices()
+        indptr = weights.indptr
+        row_ids = np.repeat(np.arange(weights.shape[0]), np.diff(indptr))
+
+        # Sort every entry by row, then by descending weight (ties by term id)
+        order = np.lexsort((weights.indices, -weights.data, row_ids))
+        rank_in_row = np.arange(len(order)) - indptr[row_ids[order]]
+        selected = order[rank_in_row < top_n]
+
+        terms = np.asarray(self.terms, dtype=object)
+        selected_terms = terms[weights.indices[selected]]
+        boundaries = np.searchsorted(row_ids[selected], np.arange(1, weights.shape[0]))
+        return [list(group) for group in np.split(selected_terms, boundaries)]
@@ -0,0 +1,329 @@
+"""
+Near-Duplicate Module
+This module finds documents that are near-copies of documents already processed,
+such as several sections of the same course or last year's syllabus with a new
+date, so their results can be reused instead of recomputed.
+
+Each document is summarized by a MinHash signature over the shingles (runs of
+consecutive tokens) of its token stream: the fraction of equal signature values
+of two documents estimates the Jaccard similarity of their shingle sets. The
+signatures are indexed with locality-sensitive hashing: each band of rows is
+hashed into a bucket, and documents that share a bucket in any band are the
+only candidates compared. Adding or looking up a document touches a fixed
+number of buckets, however large the corpus. The index is a single SQLite
+database, which makes it safe to share between worker processes; like the
+result cache it has a size cap, above which the oldest documents are evicted.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+
+import numpy as np
+from utils.result_cache import DEFAULT_MAX_BYTES
+
+# Tokens per shingle
+DEFAULT_SHINGLE_SIZE = 5
+
+# Hash functions per signature
+DEFAULT_NUM_PERM = 128
+
+# Jaccard similarity above which a document counts as a near-duplicate
+DEFAULT_THRESHOLD = 0.9
+
+# Initial signature value: the largest 32-bit hash, which shingle hashes can equal
+# but never exceed, so every entry ends up as the minimum over at least one shingle
+_MAX_HASH = (1 << 32) - 1
+
+# Shingles hashed per step, bounding the temporary (num_perm x block) array
+_SHINGLE_BLOCK = 8192
+
+# Most candidates whose signatures are compared per lookup
+_MAX_CANDIDATES = 8
+
+# Documents evicted per step when the index is over its cap
+_EVICTION_BATCH = 32
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    file_path TEXT,
+    signature BLOB NOT NULL,
+    result BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    bucket INTEGER NOT NULL,
+    document_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_bucket ON buckets (bucket);
+CREATE INDEX IF NOT EXISTS buckets_document ON buckets (document_id);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, bytes)
+    SELECT 0, COALESCE(SUM(length(signature) + length(result)), 0) FROM documents;
+CREATE TRIGGER IF NOT EXISTS documents_insert AFTER INSERT ON documents BEGIN
+    UPDATE totals SET bytes = bytes + length(NEW.signature) + length(NEW.result) WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS documents_delete AFTER DELETE ON documents BEGIN
+    UPDATE totals SET bytes = bytes - length(OLD.signature) - length(OLD.result) WHERE id = 0;
+END;
+"""
+
+
+def shingle_hashes(tokens, shingle_size=DEFAULT_SHINGLE_SIZE):
+    """
+    Hash every run of shingle_size consecutive tokens to a 32-bit value.
+
+    Token hashes are CRC-32 checksums, so they are the same in every process
+    (unlike hash(), which is salted per process).
+
+    Args:
+        tokens (list): Tokens in document order
+        shingle_size (int): Tokens per shingle; shorter documents form one shingle
+
+    Returns:
+        numpy.ndarray: Distinct shingle hashes (uint64 values below 2**32)
+    """
+    if not tokens:
+        return np.zeros(0, dtype=np.uint64)
+
+    token_hashes = {token: zlib.crc32(token.encode('utf-8')) for token in set(tokens)}
+    values = np.fromiter(map(token_hashes.__getitem__, tokens), dtype=np.uint64, count=len(tokens))
+
+    count = max(len(values) - shingle_size + 1, 1)
+    combined = values[:count].copy()
+    for offset in range(1, min(shingle_size, len(values))):
+        # Polynomial combination, wrapping around at 2**64
+        combined *= np.uint64(1000003)
+        combined += values[offset:offset + count]
+    # Mix the high bits down before keeping the upper 32 bits
+    combined ^= combined >> np.uint64(29)
+    combined *= np.uint64(0xBF58476D1CE4E5B9)
+    return np.unique(combined >> np.uint64(32))
+
+
+def lsh_bands(num_perm, threshold):
+    """
+    Choose the number of bands and rows per band for a similarity threshold.
+
+    The split minimizes the probability of missing a pair above the threshold
+    plus the probability of comparing a pair below it.
+
+    Args:
+        num_perm (int): Signature length
+        threshold (float): Jaccard similarity threshold
+
+    Returns:
+        tuple: (bands, rows)
+    """
+    # Both probabilities are averaged over evenly spaced similarities
+    below = np.linspace(0.0, threshold, 101)
+    above = np.linspace(threshold, 1.0, 101)
+    best, best_error = (1, num_perm), None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positives = threshold * np.mean(1 - (1 - below ** rows) ** bands)
+            false_negatives = (1 - threshold) * np.mean((1 - above ** rows) ** bands)
+            error = false_positives + false_negatives
+            if best_error is None or error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class MinHasher:
+    """Class for computing MinHash signatures of token streams."""
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+        """
+        Initialize the hash functions.
+
+        Args:
+            num_perm (int): Hash functions per signature
+            shingle_size (int): Tokens per shingle
+            seed (int): Seed of the hash function parameters; signatures are only
+                comparable between hashers with the same seed
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # Multiply-add-shift hash functions: the upper 32 bits of a * x + b, wrapping at 2**64
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 1 << 64, size=(num_perm, 1), dtype=np.uint64, endpoint=False) | np.uint64(1)
+        self._b = rng.integers(0, 1 << 64, size=(num_perm, 1), dtype=np.uint64, endpoint=False)
+
+    def signature(self, tokens):
+        """
+        Compute the MinHash signature of a token stream.
+
+        Args:
+            tokens (list): Tokens in document order
+
+        Returns:
+            numpy.ndarray: num_perm minimum hash values, or None if there are no tokens
+        """
+        shingles = shingle_hashes(tokens, self.shingle_size)
+        if not len(shingles):
+            return None
+
+        signature = np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        shift = np.uint64(32)
+        for start in range(0, len(shingles), _SHINGLE_BLOCK):
+            block = shingles[start:start + _SHINGLE_BLOCK]
+            np.minimum(signature, ((self._a * block + self._b) >> shift).min(axis=1), out=signature)
+        return signature
+
+
+def jaccard_estimate(signature, other):
+    """
+    Estimate the Jaccard similarity of two documents from their signatures.
+
+    Args:
+        signature (numpy.ndarray): MinHash signature
+        other (numpy.ndarray): MinHash signature from the same MinHasher
+
+    Returns:
+        float: Fraction of equal signature values
+    """
+    return float(np.mean(signature == other))
+
+
+class NearDuplicateIndex:
+    """Class for storing results by MinHash signature and finding near-duplicate documents."""
+
+    def __init__(self, cache_dir, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM,
+                 shingle_size=DEFAULT_SHINGLE_SIZE, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialize the index, creating the database if needed.
+
+        Args:
+            cache_dir (str): Directory holding the index database
+            threshold (float): Jaccard similarity above which results are reused
+            num_perm (int): Hash functions per signature
+            shingle_size (int): Tokens per shingle
+            max_bytes (int): Size cap for the stored signatures and results; the
+                oldest documents are evicted above it
+
+        Raises:
+            ValueError: If the threshold is not between 0 and 1
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"Near-duplicate threshold must be in (0, 1], got {threshold}")
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "near_duplicates.sqlite3")
+        self.threshold = threshold
+        self.max_bytes = max_bytes
+        self.minhasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+        self.bands, self.rows = lsh_bands(num_perm, threshold)
+
+        # Autocommit mode; writes that must be atomic use explicit transactions
+        self._connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def _buckets(self, signature, params_key):
+        """Hash each band of a signature, with the parameters, to a signed 64-bit bucket."""
+        rows = self.rows
+        return [
+            int.from_bytes(hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(),
+                                           digest_size=8, key=params_key.encode('utf-8')[:64],
+                                           person=band.to_bytes(2, 'little')).digest(),
+                           'little', signed=True)
+            for band in range(self.bands)
+        ]
+
+    def find(self, signature, params_key):
+        """
+        Find the most similar indexed document above the threshold.
+
+        Args:
+            signature (numpy.ndarray): MinHash signature of the new document
+            params_key (str): Key of the pipeline parameters; only results computed
+                with the same parameters are candidates
+
+        Returns:
+            tuple: (source, similarity, result) of the best match, where source is
+                the document path or, for raw text, its digest; or None
+        """
+        buckets = self._buckets(signature, params_key)
+        placeholders = ", ".join("?" * len(buckets))
+        candidates = self._connection.execute(
+            f"SELECT document_id FROM buckets WHERE bucket IN ({placeholders}) "
+            f"GROUP BY document_id ORDER BY COUNT(*) DESC, document_id LIMIT ?",
+            (*buckets, _MAX_CANDIDATES)
+        ).fetchall()
+
+        best = None
+        for (document_id,) in candidates:
+            file_path, stored, result = self._connection.execute(
+                "SELECT file_path, signature, result FROM documents WHERE id = ?", (document_id,)
+            ).fetchone()
+            similarity = jaccard_estimate(signature, np.frombuffer(stored, dtype=np.uint64))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (file_path, similarity, result)
+
+        if best is None:
+            return None
+        return best[0], best[1], json.loads(zlib.decompress(best[2]))
+
+    def add(self, signature, params_key, file_path, result):
+        """
+        Index a processed document and its result, evicting the oldest documents if
+        the index is over its cap.
+
+        Args:
+            signature (numpy.ndarray): MinHash signature of the document
+            params_key (str): Key of the pipeline parameters the result was computed with
+            file_path (str): Document path, or the text digest for raw text
+            result (dict): JSON-serializable pipeline result
+        """
+        blob = zlib.compress(json.dumps(result).encode('utf-8'))
+        if len(blob) > self.max_bytes:
+            return
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            document_id = connection.execute(
+                "INSERT INTO documents (file_path, signature, result, created_at) VALUES (?, ?, ?, ?)",
+                (file_path, signature.tobytes(), blob, time.time())
+            ).lastrowid
+            connection.executemany("INSERT INTO buckets (bucket, document_id) VALUES (?, ?)",
+                                   [(bucket, document_id) for bucket in self._buckets(signature, params_key)])
+            self._evict()
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _evict(self):
+        """Delete the oldest documents and their buckets until the index fits its cap."""
+        connection = self._connection
+        while True:
+            total_bytes = connection.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+            if total_bytes <= self.max_bytes:
+                return
+            oldest = "SELECT id FROM documents ORDER BY id LIMIT ?"
+            connection.execute(f"DELETE FROM buckets WHERE document_id IN ({oldest})", (_EVICTION_BATCH,))
+            connection.execute(f"DELETE FROM documents WHERE id IN ({oldest})", (_EVICTION_BATCH,))
+
+    def __len__(self):
+        """Return the number of indexed documents."""
+        return self._connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def clear(self):
+        """Remove every indexed document."""
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute("DELETE FROM buckets")
+        connection.execute("DELETE FROM documents")
+        connection.execute("COMMIT")
+
+    def close(self):
+        """Close the database connection."""
+        self._connection.close()
@@ -0,0 +1,125 @@
+"""
+Parallel Counter Module
+This module counts the keyword candidates of one large text across several
+worker processes (map-reduce within a single document).
+
+The text is encoded once into a shared-memory block and cut into shards at
+whitespace bytes, so no word is split between two shards and normalization of
+each shard gives exactly the words of normalizing the whole text. Workers
+receive only the block name and their shard's byte range, decode the shard
+straight from shared memory, and normalize, tokenize, filter and count it. The
+per-shard counts are merged in shard order, which keeps every word at its
+first occurrence in the document, so the selected keywords (ties included) are
+identical to the serial path.
+"""
+
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing.shared_memory import SharedMemory
+from utils.resources import load_stopwords
+from utils.text_normalizer import normalize_text
+from utils.tokenizers import get_tokenizer
+
+# Shards per worker, so workers that finish early pick up more work
+SHARDS_PER_WORKER = 4
+
+# Bytes scanned per step when looking for a shard boundary
+_BOUNDARY_SCAN_BYTES = 1 << 16
+
+# ASCII whitespace; in UTF-8 these bytes never occur inside a multi-byte character
+_WHITESPACE_BYTE = re.compile(rb'\s')
+
+# Stopwords and tokenizer of each worker process, set once by _init_worker
+_worker_stop_words = None
+_worker_tokenizer = None
+
+
+def split_shards(buffer, size, num_shards):
+    """
+    Cut a UTF-8 buffer into byte ranges of about equal size at whitespace bytes.
+
+    Args:
+        buffer (memoryview): Encoded text
+        size (int): Number of bytes of text in the buffer
+        num_shards (int): Target number of shards
+
+    Returns:
+        list: (start, stop) byte ranges that together cover the text; fewer than
+            num_shards if the text has long runs without whitespace
+    """
+    shards = []
+    start = 0
+    target_size = max(size // max(num_shards, 1), 1)
+    while start < size:
+        position = start + target_size
+        stop = size
+        while position < size:
+            window = bytes(buffer[position:min(position + _BOUNDARY_SCAN_BYTES, size)])
+            match = _WHITESPACE_BYTE.search(window)
+            if match is not None:
+                stop = position + match.start()
+                break
+            position += len(window)
+        shards.append((start, stop))
+        start = stop
+    return shards
+
+
+def _init_worker(tokenizer):
+    """Load the stopwords and tokenizer once per worker process."""
+    global _worker_stop_words, _worker_tokenizer
+    _worker_stop_words = load_stopwords('english')
+    _worker_tokenizer = get_tokenizer(tokenizer)
+
+
+def _count_shard(shm_name, start, stop, min_length):
+    """Normalize, tokenize and count one shard of the shared text (runs in a worker process)."""
+    shm = SharedMemory(name=shm_name)
+    try:
+        text = str(shm.buf[start:stop], 'utf-8')
+    finally:
+        shm.close()
+
+    stop_words = _worker_stop_words
+    return Counter(word for word in _worker_tokenizer.tokenize_words(normalize_text(text))
+                   if len(word) >= min_length and word not in stop_words)
+
+
+def count_in_parallel(text, workers, tokenizer='regex', min_length=4):
+    """
+    Count the keyword candidates of a text across a pool of worker processes.
+
+    Args:
+        text (str): Raw text content
+        workers (int): Number of worker processes
+        tokenizer (str): Tokenizer backend of the workers, 'regex' or 'nltk'
+        min_length (int): Minimum word length to count as a keyword
+            (4 matches DocumentProcessor.extract_keywords)
+
+    Returns:
+        collections.Counter: Frequency of each candidate, in order of first
+            occurrence, identical to counting the whole text in one process
+    """
+    data = text.encode('utf-8')
+    size = len(data)
+    shm = SharedMemory(create=True, size=max(size, 1))
+    try:
+        shm.buf[:size] = data
+        del data
+
+        shards = split_shards(shm.buf, size, workers * SHARDS_PER_WORKER)
+        starts = [start for start, stop in shards]
+        stops = [stop for start, stop in shards]
+
+        word_freq = Counter()
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards)) or 1, initializer=_init_worker,
+                                 initargs=(tokenizer,)) as executor:
+            # map() returns the counts in shard order, so first occurrences are kept
+            for counts in executor.map(_count_shard, repeat(shm.name), starts, stops, repeat(min_length)):
+                word_freq.update(counts)
+        return word_freq
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,107 @@
+"""
+Phrase Matcher Module
+This module finds many (multi-word) phrases in a token stream with an
+Aho-Corasick automaton over tokens.
+
+The automaton is compiled once; scanning is a single linear pass whose cost
+depends on the number of tokens and matches, not on the number of phrases.
+"""
+
+from collections import Counter, deque
+
+
+class PhraseMatcher:
+    """Class for matching a fixed set of phrases against token streams."""
+
+    def __init__(self):
+        """Initialize an empty matcher."""
+        # Trie of token transitions; node 0 is the root
+        self._transitions = [{}]
+        self._outputs = [[]]
+        self._fail = [0]
+        self._compiled = False
+
+    def add(self, phrase, canonical=None, label=None):
+        """
+        Add a phrase to the matcher.
+
+        Args:
+            phrase (str): Space-separated phrase to match, e.g. 'break down'
+            canonical (str): Name reported for a match (defaults to the phrase itself),
+                so inflected forms can map back to one entry
+            label: Arbitrary label reported with each match
+        """
+        tokens = phrase.split()
+        if not tokens:
+            return
+
+        node = 0
+        for token in tokens:
+            next_node = self._transitions[node].get(token)
+            if next_node is None:
+                next_node = len(self._transitions)
+                self._transitions[node][token] = next_node
+                self._transitions.append({})
+                self._outputs.append([])
+                self._fail.append(0)
+            node = next_node
+
+        self._outputs[node].append((len(tokens), canonical or phrase, label))
+        self._compiled = False
+
+    def compile(self):
+        """Compute the failure links, breadth first, and merge outputs along them."""
+        transitions, outputs, fail = self._transitions, self._outputs, self._fail
+        queue = deque()
+
+        for node in transitions[0].values():
+            fail[node] = 0
+            queue.append(node)
+
+        while queue:
+            node = queue.popleft()
+            for token, child in transitions[node].items():
+                # Longest proper suffix of the child's phrase that is also a trie path
+                state = fail[node]
+                while state and token not in transitions[state]:
+                    state = fail[state]
+                fail[child] = transitions[state].get(token, 0)
+                outputs[child] = outputs[child] + outputs[fail[child]]
+                queue.append(child)
+
+        self._compiled = True
+
+    def iter_matches(self, tokens):
+        """
+        Scan a token stream in one pass.
+
+        Args:
+            tokens (iterable): Tokens, e.g. preprocessed text split on whitespace
+
+        Yields:
+            tuple: (start index, end index, canonical phrase, label) for every match
+        """
+        if not self._compiled:
+            self.compile()
+
+        transitions, outputs, fail = self._transitions, self._outputs, self._fail
+        state = 0
+        for position, token in enumerate(tokens):
+            while state and token not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(token, 0)
+            for length, canonical, label in outputs[state]:
+                yield position - length + 1, position + 1, canonical, label
+
+    def count(self, tokens):
+        """
+        Count matches per canonical phrase.
+
+        Args:
+            tokens (iterable): Tokens to scan
+
+        Returns:
+            collections.Counter: Number of matches per (canonical phrase, label), in
+                order of first match
+        """
+        return Counter((canonical, label) for _, _, canonical, label in self.iter_matches(tokens))
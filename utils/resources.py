@@ -0,0 +1,137 @@
+"""
+Resources Module
+This module checks for, and optionally downloads, the NLTK data the pipeline needs.
+
+Nothing is downloaded implicitly: a missing resource raises a LookupError that
+explains how to install it, so air-gapped hosts fail fast instead of hanging
+on a network call. Installed data is located by scanning NLTK's standard data
+directories first, because importing nltk itself takes seconds.
+"""
+
+import os
+import sys
+import functools
+
+# NLTK resources by package name, with the data paths that satisfy each one
+# (newer NLTK releases ship the Punkt tokenizer as 'punkt_tab')
+NLTK_RESOURCES = {
+    'stopwords': ('corpora/stopwords',),
+    'punkt': ('tokenizers/punkt_tab', 'tokenizers/punkt')
+}
+
+# Download packages for each resource, tried in order
+_DOWNLOAD_PACKAGES = {
+    'stopwords': ('stopwords',),
+    'punkt': ('punkt_tab', 'punkt')
+}
+
+
+def _nltk_data_dirs():
+    """Return NLTK's default data directories, in its search order."""
+    dirs = [path for path in os.environ.get('NLTK_DATA', '').split(os.pathsep) if path]
+    dirs.append(os.path.expanduser(os.path.join('~', 'nltk_data')))
+    dirs.extend(os.path.join(sys.prefix, *parts)
+                for parts in (('nltk_data',), ('share', 'nltk_data'), ('lib', 'nltk_data')))
+    if sys.platform.startswith('win'):
+        dirs.append(os.path.join(os.environ.get('APPDATA', ''), 'nltk_data'))
+        dirs.extend(os.path.join(os.environ.get('SystemDrive', 'C:'), os.sep, *parts)
+                    for parts in (('nltk_data',), ('share', 'nltk_data'), ('lib', 'nltk_data')))
+    else:
+        dirs.extend(['/usr/share/nltk_data', '/usr/local/share/nltk_data',
+                     '/usr/lib/nltk_data', '/usr/local/lib/nltk_data'])
+    return dirs
+
+
+def _locate_nltk_data(path):
+    """Return the installed location of an NLTK data path, without importing nltk."""
+    for data_dir in _nltk_data_dirs():
+        candidate = os.path.join(data_dir, *path.split('/'))
+        if os.path.exists(candidate):
+            return candidate
+        if os.path.exists(candidate + '.zip'):
+            return candidate + '.zip'
+    return None
+
+
+def _find_nltk_resource(name):
+    """Return True if any data path for the resource is installed."""
+    paths = NLTK_RESOURCES[name]
+    if any(_locate_nltk_data(path) for path in paths):
+        return True
+
+    # Fall back to NLTK's own lookup, which also honours nltk.data.path changes
+    import nltk
+
+    for path in paths:
+        try:
+            nltk.data.find(path)
+            return True
+        except LookupError:
+            continue
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def ensure_nltk_resource(name, download=False):
+    """
+    Make sure an NLTK resource is installed, checking at most once per process.
+
+    Args:
+        name (str): Resource name, a key of NLTK_RESOURCES
+        download (bool): Try to download the resource if it is missing
+
+    Raises:
+        LookupError: If the resource is missing and could not be downloaded
+    """
+    if _find_nltk_resource(name):
+        return
+
+    if download:
+        import nltk
+
+        for package in _DOWNLOAD_PACKAGES[name]:
+            nltk.download(package, quiet=True)
+        if _find_nltk_resource(name):
+            return
+
+    raise LookupError(
+        f"NLTK resource '{name}' is not installed. Run 'python main.py --download-resources' "
+        f"on a machine with network access, or copy the NLTK data directory to this host "
+        f"and point the NLTK_DATA environment variable at it."
+    )
+
+
+def ensure_nltk_resources(names=tuple(NLTK_RESOURCES), download=False):
+    """
+    Preflight several NLTK resources at once.
+
+    Args:
+        names (tuple): Resource names to check
+        download (bool): Try to download missing resources
+    """
+    for name in names:
+        ensure_nltk_resource(name, download=download)
+
+
+@functools.lru_cache(maxsize=None)
+def load_stopwords(language='english'):
+    """
+    Load the NLTK stopword list once per process.
+
+    Args:
+        language (str): Stopword list to load
+
+    Returns:
+        frozenset: Stopwords for the language
+    """
+    ensure_nltk_resource('stopwords')
+
+    # Read the plain word list directly when it is unpacked on disk
+    word_list = _locate_nltk_data(f'corpora/stopwords/{language}')
+    if word_list and os.path.isfile(word_list):
+        with open(word_list, 'r', encoding='utf-8') as file:
+            return frozenset(line.strip() for line in file if line.strip())
+
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.words(language))
@@ -0,0 +1,287 @@
+"""
+Result Cache Module
+This module provides a persistent, content-addressed cache for pipeline results.
+
+Entries are keyed by a hash of the document bytes, the pipeline parameters and
+a pipeline version, so unchanged syllabi are never reprocessed. The cache is a
+single SQLite database, which makes it safe to share between worker processes.
+
+Lookups only read the database. The access times and hit/miss counters they
+update are queued in memory and written in one transaction every
+FLUSH_LOOKUPS lookups, before each store (so eviction sees recent accesses),
+and when the cache is closed, its statistics are read or the process exits.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+from multiprocessing import util as multiprocessing_util
+
+# Default size cap for the cache, in bytes
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Lookups whose access times and counters are queued before they are written
+FLUSH_LOOKUPS = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    stage TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS counters (
+    stage TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, bytes) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET bytes = bytes - OLD.size WHERE id = 0;
+END;
+"""
+
+
+def file_digest(file_path):
+    """
+    Compute the SHA-256 digest of a file's contents.
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        str: Hex digest of the file bytes
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def text_digest(text):
+    """
+    Compute the SHA-256 digest of a text, as file_digest would for its UTF-8 file.
+
+    Args:
+        text (str): Text content
+
+    Returns:
+        str: Hex digest of the UTF-8 encoded text
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _write_queued(connection, accessed, counts):
+    """Write queued access times and hit/miss counters, inside the caller's transaction."""
+    connection.executemany("UPDATE entries SET last_access = MAX(last_access, ?) WHERE key = ?",
+                           [(access_time, key) for key, access_time in accessed.items()])
+    connection.executemany(
+        "INSERT INTO counters (stage, hits, misses) VALUES (?, ?, ?) "
+        "ON CONFLICT (stage) DO UPDATE SET hits = hits + excluded.hits, misses = misses + excluded.misses",
+        [(stage, hits, misses) for stage, (hits, misses) in counts.items()]
+    )
+
+
+def _flush_queued(connection, accessed, counts):
+    """Write queued access times and hit/miss counters in one transaction, then forget them."""
+    if not counts:
+        return
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        _write_queued(connection, accessed, counts)
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    accessed.clear()
+    counts.clear()
+
+
+def _flush_and_close(connection, accessed, counts):
+    """Write the queued writes of a cache and close its connection."""
+    try:
+        _flush_queued(connection, accessed, counts)
+    finally:
+        connection.close()
+
+
+class ResultCache:
+    """Class for caching intermediate and final pipeline results on disk."""
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES, version=1):
+        """
+        Initialize the cache, creating the database if needed.
+
+        Args:
+            cache_dir (str): Directory holding the cache database
+            max_bytes (int): Size cap; least recently used entries are evicted above it
+            version: Pipeline version, part of every key so stale entries are ignored
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "results.sqlite3")
+        self.max_bytes = max_bytes
+        self.version = version
+        self.hits = {}
+        self.misses = {}
+        # Queued writes: key -> last access time, and stage -> [hits, misses]
+        self._accessed = {}
+        self._queued_counts = {}
+        self._queued_lookups = 0
+
+        # Autocommit mode; writes that must be atomic use explicit transactions
+        self._connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        # Flushes and closes when the cache is closed or collected, or at exit (also in
+        # pool worker processes, which skip atexit handlers)
+        self._finalizer = multiprocessing_util.Finalize(
+            self, _flush_and_close, args=(self._connection, self._accessed, self._queued_counts), exitpriority=0
+        )
+
+    def make_key(self, digest, stage, **params):
+        """
+        Build the cache key for one stage of one document.
+
+        Args:
+            digest (str): Content digest of the document
+            stage (str): Pipeline stage name
+            **params: Parameters that affect the stage's output
+
+        Returns:
+            str: Cache key
+        """
+        material = json.dumps([self.version, digest, stage, params], sort_keys=True)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key, stage):
+        """
+        Look up a cached value, marking it as recently used.
+
+        The access time and hit/miss counter are queued, not written straight away.
+
+        Args:
+            key (str): Cache key from make_key
+            stage (str): Pipeline stage name, used for the hit/miss counters
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        row = self._connection.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._count(stage, hit=False)
+            return None
+
+        self._accessed[key] = time.time()
+        self._count(stage, hit=True)
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key, stage, value):
+        """
+        Store a value, evicting least recently used entries if the cache is over its cap.
+
+        Args:
+            key (str): Cache key from make_key
+            stage (str): Pipeline stage name
+            value: JSON-serializable value
+        """
+        blob = zlib.compress(json.dumps(value).encode('utf-8'))
+        if len(blob) > self.max_bytes:
+            return
+
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            _write_queued(connection, self._accessed, self._queued_counts)
+            connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            connection.execute(
+                "INSERT INTO entries (key, stage, value, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, stage, blob, len(blob), time.time())
+            )
+            self._evict()
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        self._clear_queued()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits its cap."""
+        connection = self._connection
+        excess = connection.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+
+        # Only as many of the oldest entries as it takes; the cursor stops reading there
+        evicted = []
+        for key, size in connection.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM entries WHERE key = ?", evicted)
+
+    def _count(self, stage, hit):
+        """Update the in-process hit/miss counters and queue the persistent ones."""
+        counters = self.hits if hit else self.misses
+        counters[stage] = counters.get(stage, 0) + 1
+        self._queued_counts.setdefault(stage, [0, 0])[0 if hit else 1] += 1
+        self._queued_lookups += 1
+        if self._queued_lookups >= FLUSH_LOOKUPS:
+            self.flush()
+
+    def _clear_queued(self):
+        """Forget the queued writes once they are committed or obsolete."""
+        self._accessed.clear()
+        self._queued_counts.clear()
+        self._queued_lookups = 0
+
+    def flush(self):
+        """Write the queued access times and hit/miss counters in one transaction."""
+        _flush_queued(self._connection, self._accessed, self._queued_counts)
+        self._queued_lookups = 0
+
+    def stats(self):
+        """
+        Report cumulative statistics for the cache, across all processes that used it.
+
+        Lookups other processes have not flushed yet are not counted.
+
+        Returns:
+            dict: Entry count, total bytes and per-stage hit/miss counts
+        """
+        self.flush()
+        connection = self._connection
+        entries = connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        total_bytes = connection.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+        stages = {
+            stage: {'hits': hits, 'misses': misses}
+            for stage, hits, misses in connection.execute("SELECT stage, hits, misses FROM counters")
+        }
+        return {'entries': entries, 'bytes': total_bytes, 'stages': stages}
+
+    def clear(self):
+        """Remove every cached entry and reset the counters."""
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute("DELETE FROM entries")
+        connection.execute("DELETE FROM counters")
+        connection.execute("COMMIT")
+        self._clear_queued()
+
+    def close(self):
+        """Write the queued access times and counters, and close the database connection."""
+        self._finalizer()
@@ -0,0 +1,189 @@
+"""
+Result Sink Module
+This module writes pipeline results as structured records, one per document, to
+JSON Lines or Parquet files.
+
+Records are written as results arrive, so a batch run never holds more than a
+bounded number of them in memory: JSONL records are appended line by line, and
+Parquet records are buffered only until a row group is full. Either file can be
+queried directly (e.g. with pandas, DuckDB or jq) without parsing text reports.
+"""
+
+import os
+import json
+
+# Records per Parquet row group
+DEFAULT_ROW_GROUP_SIZE = 1000
+
+SINK_FORMATS = ('jsonl', 'parquet')
+
+
+def result_record(result):
+    """
+    Flatten a pipeline result into a sink record.
+
+    Args:
+        result (dict): Result from CLOPipeline.process_file or process_batch
+
+    Returns:
+        dict: File path, error, keywords, CLOs (statement, action verb, domain and
+            keywords), skills, total seconds and per-stage seconds
+    """
+    timings = {}
+    for event in result.get('trace', ()):
+        if event['event'] == 'stage':
+            timings[event['stage']] = timings.get(event['stage'], 0.0) + event['seconds']
+
+    return {
+        'file_path': result.get('file_path'),
+        'error': result.get('error'),
+        'keywords': list(result.get('keywords', ())),
+        'clos': [{
+            'clo': clo['clo'],
+            'action_verb': clo['action_verb'],
+            'domain': clo['domain'],
+            'keywords': list(clo['keywords'])
+        } for clo in result.get('clos', ())],
+        'skills': list(result.get('skills', ())),
+        'seconds': result.get('seconds'),
+        'timings': timings
+    }
+
+
+class JSONLSink:
+    """Class for appending result records to a JSON Lines file."""
+
+    def __init__(self, path):
+        """
+        Open the sink, appending to the file if it already exists.
+
+        Args:
+            path (str): Output file path
+        """
+        self.path = path
+        self.records = 0
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, result):
+        """
+        Append one document's result.
+
+        Args:
+            result (dict): Pipeline result
+        """
+        self._file.write(json.dumps(result_record(result), ensure_ascii=False) + "\n")
+        self.records += 1
+
+    def close(self):
+        """Flush and close the file."""
+        self._file.close()
+
+    def __enter__(self):
+        """Use the sink as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the sink."""
+        self.close()
+
+
+class ParquetSink:
+    """Class for writing result records to a Parquet file in row groups."""
+
+    def __init__(self, path, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        """
+        Open the sink, replacing any existing file (Parquet files cannot be appended to).
+
+        Args:
+            path (str): Output file path
+            row_group_size (int): Records buffered before a row group is written
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output needs pyarrow (pip install pyarrow)") from e
+
+        self._pa = pa
+        self.path = path
+        self.row_group_size = row_group_size
+        self.records = 0
+        self._buffer = []
+        self.schema = pa.schema([
+            ('file_path', pa.string()),
+            ('error', pa.string()),
+            ('keywords', pa.list_(pa.string())),
+            ('clos', pa.list_(pa.struct([
+                ('clo', pa.string()),
+                ('action_verb', pa.string()),
+                ('domain', pa.string()),
+                ('keywords', pa.list_(pa.string()))
+            ]))),
+            ('skills', pa.list_(pa.string())),
+            ('seconds', pa.float64()),
+            ('timings', pa.map_(pa.string(), pa.float64()))
+        ])
+        self._writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, result):
+        """
+        Add one document's result, writing a row group when the buffer is full.
+
+        Args:
+            result (dict): Pipeline result
+        """
+        record = result_record(result)
+        # Maps are built from (key, value) pairs
+        record['timings'] = list(record['timings'].items())
+        self._buffer.append(record)
+        self.records += 1
+        if len(self._buffer) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered records as one row group."""
+        if self._buffer:
+            table = self._pa.Table.from_pylist(self._buffer, schema=self.schema)
+            self._writer.write_table(table, row_group_size=len(self._buffer))
+            self._buffer = []
+
+    def close(self):
+        """Write the remaining records and the file footer."""
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self):
+        """Use the sink as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the sink."""
+        self.close()
+
+
+def open_sink(path, sink_format=None, **options):
+    """
+    Open a result sink, choosing the format from the file extension.
+
+    Args:
+        path (str): Output file path (.jsonl or .parquet)
+        sink_format (str): 'jsonl' or 'parquet', overriding the extension
+        **options: Keyword arguments for the sink, e.g. row_group_size
+
+    Returns:
+        JSONLSink or ParquetSink: The open sink
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if sink_format is None:
+        sink_format = os.path.splitext(path)[1].lower().lstrip('.')
+        sink_format = {'json': 'jsonl', 'ndjson': 'jsonl', 'pq': 'parquet'}.get(sink_format, sink_format)
+    if sink_format == 'jsonl':
+        return JSONLSink(path)
+    if sink_format == 'parquet':
+        return ParquetSink(path, **options)
+    raise ValueError(f"Unsupported sink format: {sink_format} (use one of {', '.join(SINK_FORMATS)})")
@@ -0,0 +1,136 @@
+"""
+Text Normalizer Module
+This module provides a precompiled, single-pass replacement for the multi-pass
+regex preprocessing of course content.
+
+The output is identical to lowercasing the text, replacing punctuation and
+digits with spaces, and collapsing whitespace. Only runs of word characters that
+are not digits survive, joined by single spaces.
+"""
+
+import re
+
+# Text is normalized in chunks of roughly this many characters
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Runs of word characters that are not digits (the only characters that survive)
+_TOKEN_PATTERN = re.compile(r'[^\W\d]+')
+
+# Chunks are only cut at whitespace, so no token is split across two chunks
+_WHITESPACE_PATTERN = re.compile(r'\s')
+# Byte translation table for ASCII text: letters are lowercased, underscores kept,
+# and everything else (punctuation, digits, whitespace) becomes a space
+_ASCII_TABLE = bytes(
+    (c if chr(c).isalpha() or c == ord('_') else ord(' ')) for c in range(128)
+).lower() + b' ' * 128
+
+# Typographic punctuation common in syllabi exported from word processors; these
+# are all separators, so replacing them with spaces keeps such chunks on the
+# ASCII fast path. Skipped when a chunk contains a capital sigma, whose lowercase
+# form depends on neighbouring characters such as the curly apostrophe.
+_COMMON_NON_ASCII_SEPARATORS = (
+    '\u2018', '\u2019', '\u201c', '\u201d',  # curly quotes
+    '\u2013', '\u2014',                      # en and em dashes
+    '\u2022', '\u2026', '\u00a0'             # bullet, ellipsis, no-break space
+)
+
+
+def _normalize_ascii(text):
+    """Normalize a chunk of pure-ASCII text with one byte translation."""
+    return b' '.join(text.encode('ascii').translate(_ASCII_TABLE).split()).decode('ascii')
+
+
+def normalize_chunk(text):
+    """
+    Normalize a chunk of text that starts and ends on a whitespace boundary.
+
+    Args:
+        text (str): Raw text content
+
+    Returns:
+        str: Normalized text
+    """
+    if not text.isascii() and '\u03a3' not in text:
+        for separator in _COMMON_NON_ASCII_SEPARATORS:
+            if separator in text:
+                text = text.replace(separator, ' ')
+    if text.isascii():
+        return _normalize_ascii(text)
+    return ' '.join(_TOKEN_PATTERN.findall(text.lower()))
+
+
+def iter_whitespace_chunks(text, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Split text into chunks of about chunk_size characters, cutting only at whitespace.
+
+    Args:
+        text (str): Raw text content
+        chunk_size (int): Target chunk size in characters
+
+    Yields:
+        str: Consecutive chunks that together make up the text
+    """
+    start, length = 0, len(text)
+    while start < length:
+        end = start + chunk_size
+        if end >= length:
+            yield text[start:]
+            return
+        match = _WHITESPACE_PATTERN.search(text, end)
+        if match is None:
+            yield text[start:]
+            return
+        yield text[start:match.start()]
+        start = match.start()
+
+
+def normalize_text(text, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Lowercase text and strip punctuation, digits and extra whitespace in one pass.
+
+    Args:
+        text (str): Raw text content
+        chunk_size (int): Chunk size in characters, which bounds temporary copies
+
+    Returns:
+        str: Normalized text, identical to the original multi-pass preprocessing
+    """
+    if len(text) <= chunk_size:
+        return normalize_chunk(text)
+    return ' '.join(filter(None, map(normalize_chunk, iter_whitespace_chunks(text, chunk_size))))
+
+
+def normalize_stream(chunks):
+    """
+    Normalize a stream of raw text chunks that may split words anywhere.
+
+    The partial word at the end of each chunk is carried over to the next one,
+    so joining the yielded pieces with spaces gives exactly
+    normalize_text(''.join(chunks)), while only one chunk is held at a time.
+
+    Args:
+        chunks (iterable): Raw text chunks, in document order
+
+    Yields:
+        str: Normalized, non-empty pieces of the text
+    """
+    carry = ''
+    for chunk in chunks:
+        text = carry + chunk if carry else chunk
+
+        # Scan back over the trailing partial word, which is usually short
+        cut = len(text) - 1
+        while cut >= 0 and not text[cut].isspace():
+            cut -= 1
+        if cut < 0:
+            carry = text
+            continue
+        carry = text[cut:]
+        normalized = normalize_chunk(text[:cut])
+        if normalized:
+            yield normalized
+
+    if carry:
+        normalized = normalize_chunk(carry)
+        if normalized:
+            yield normalized
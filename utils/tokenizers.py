@@ -0,0 +1,94 @@
+"""
+Tokenizers Module
+This module provides the tokenizer backends used by the DocumentProcessor.
+
+The regex backend is the default: preprocessed text contains only words
+separated by single spaces, so str.split() yields exactly the same words as a
+full tokenizer at a fraction of the cost. The NLTK backend (Punkt sentence
+splitting and Treebank word tokenization) is kept as an option.
+"""
+
+import re
+from utils.resources import ensure_nltk_resource
+
+# A sentence ends at '.', '!' or '?' (optionally followed by closing quotes or
+# brackets) before whitespace, or at a blank line
+_SENTENCE_BOUNDARY = re.compile(r'(?:(?<=[.!?])|(?<=[.!?][\'")\]]))\s+|\n\s*\n')
+
+
+class RegexTokenizer:
+    """Fast tokenizer backend based on str.split and one compiled regex."""
+
+    name = 'regex'
+
+    def tokenize_words(self, text):
+        """
+        Split preprocessed text into words.
+
+        Args:
+            text (str): Preprocessed text
+
+        Returns:
+            list: Words in order
+        """
+        return text.split()
+
+    def tokenize_sentences(self, text):
+        """
+        Split raw text into sentences.
+
+        Args:
+            text (str): Raw (not preprocessed) text, so sentence punctuation is intact
+
+        Returns:
+            list: Sentences in order
+        """
+        return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+
+class NLTKTokenizer:
+    """Tokenizer backend using NLTK's Punkt and Treebank tokenizers."""
+
+    name = 'nltk'
+
+    def __init__(self):
+        """
+        Initialize the tokenizer.
+
+        Raises:
+            LookupError: If the NLTK Punkt data is not installed
+        """
+        ensure_nltk_resource('punkt')
+
+    def tokenize_words(self, text):
+        """Split text into words with NLTK's word_tokenize."""
+        from nltk.tokenize import word_tokenize
+
+        return word_tokenize(text)
+
+    def tokenize_sentences(self, text):
+        """Split text into sentences with NLTK's sent_tokenize."""
+        from nltk.tokenize import sent_tokenize
+
+        return sent_tokenize(text)
+
+
+TOKENIZERS = {
+    RegexTokenizer.name: RegexTokenizer,
+    NLTKTokenizer.name: NLTKTokenizer
+}
+
+
+def get_tokenizer(name):
+    """
+    Create a tokenizer backend by name.
+
+    Args:
+        name (str): Backend name, a key of TOKENIZERS
+
+    Returns:
+        Tokenizer backend instance
+    """
+    if name not in TOKENIZERS:
+        raise ValueError(f"Unsupported tokenizer: {name} (choose from {', '.join(TOKENIZERS)})")
+    return TOKENIZERS[name]()
@@ -0,0 +1,248 @@
+"""
+Vocabulary Module
+This module interns tokens as integer IDs, so token streams can be stored in
+compact arrays and counted with vectorized NumPy operations.
+
+Whether a token is a stopword, and whether it is long enough to be a keyword, is
+decided once per vocabulary entry and kept as boolean masks over the IDs, so the
+per-token filtering of a document becomes a single mask lookup. One vocabulary
+can be shared by every document in a batch, which keeps the IDs consistent for
+corpus-level features such as the TF-IDF keyword engine.
+"""
+
+from array import array
+
+# Initial capacity of the per-entry masks; they double as the vocabulary grows
+_INITIAL_CAPACITY = 1024
+
+# Tokens scanned per step when looking up first occurrences
+_FIRST_OCCURRENCE_BLOCK = 1 << 16
+
+
+def as_id_array(token_ids):
+    """
+    View a token-ID sequence as a NumPy array without copying it.
+
+    Args:
+        token_ids (array.array or numpy.ndarray): Token IDs
+
+    Returns:
+        numpy.ndarray: The same IDs as an unsigned integer array
+    """
+    import numpy as np
+
+    if isinstance(token_ids, array):
+        return np.frombuffer(token_ids, dtype=np.uint32) if len(token_ids) else np.zeros(0, dtype=np.uint32)
+    return np.asarray(token_ids)
+
+
+class _TokenIds(dict):
+    """Token -> ID mapping that assigns the next ID to unseen tokens on lookup."""
+
+    def __init__(self, tokens):
+        """Initialize the mapping, appending new tokens to the given list."""
+        super().__init__()
+        self.tokens = tokens
+
+    def __missing__(self, token):
+        """Assign an ID to an unseen token."""
+        token_id = self[token] = len(self.tokens)
+        self.tokens.append(token)
+        return token_id
+
+
+class Vocabulary:
+    """Class for mapping tokens to integer IDs with precomputed filter masks."""
+
+    def __init__(self, stop_words=(), min_length=4):
+        """
+        Initialize an empty vocabulary.
+
+        Args:
+            stop_words (set): Tokens that are never content words
+            min_length (int): Minimum token length to count as a keyword
+                (4 matches DocumentProcessor.extract_keywords)
+        """
+        self.stop_words = stop_words
+        self.min_length = min_length
+        self.tokens = []
+        # Looking up an unseen token in ids assigns it the next ID
+        self.ids = _TokenIds(self.tokens)
+        # Per-ID masks, over-allocated so adding tokens is amortized O(1); allocated
+        # on first use, so building a processor does not import NumPy
+        self._content = None
+        self._keyword = None
+
+    def clear(self):
+        """
+        Forget every token, so a long-lived vocabulary can start afresh.
+
+        IDs handed out before are no longer valid.
+        """
+        # Cleared in place, since the ID mapping appends to the same list
+        self.tokens.clear()
+        self.ids.clear()
+        self._content = None
+        self._keyword = None
+
+    def __len__(self):
+        """Return the number of distinct tokens."""
+        return len(self.tokens)
+
+    def __contains__(self, token):
+        """Return True if the token has an ID."""
+        return token in self.ids
+
+    @property
+    def content_mask(self):
+        """numpy.ndarray: True for every ID that is not a stopword."""
+        self._allocate_masks()
+        return self._content[:len(self.tokens)]
+
+    @property
+    def keyword_mask(self):
+        """numpy.ndarray: True for every ID that is a keyword candidate."""
+        self._allocate_masks()
+        return self._keyword[:len(self.tokens)]
+
+    def _allocate_masks(self):
+        """Allocate the per-ID masks if they do not exist yet."""
+        if self._content is None:
+            import numpy as np
+
+            self._content = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+            self._keyword = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+
+    def _update_masks(self, start):
+        """Compute the masks of the tokens added since ID start."""
+        import numpy as np
+
+        self._allocate_masks()
+        end = len(self.tokens)
+        if end > len(self._content):
+            capacity = max(end, 2 * len(self._content))
+            self._content = np.resize(self._content, capacity)
+            self._keyword = np.resize(self._keyword, capacity)
+
+        stop_words = self.stop_words
+        min_length = self.min_length
+        new_tokens = self.tokens[start:end]
+        content = [token not in stop_words for token in new_tokens]
+        self._content[start:end] = content
+        self._keyword[start:end] = [keep and len(token) >= min_length
+                                    for keep, token in zip(content, new_tokens)]
+
+    def encode(self, tokens):
+        """
+        Convert tokens to IDs, adding unseen tokens to the vocabulary.
+
+        New tokens get IDs in order of first occurrence. The lookup runs in one
+        C-level pass; only the new tokens are visited in Python.
+
+        Args:
+            tokens (iterable): Tokens in document order
+
+        Returns:
+            array.array: Token IDs ('I' typecode), one per token
+        """
+        start = len(self.tokens)
+        token_ids = array('I', map(self.ids.__getitem__, tokens))
+        if len(self.tokens) > start:
+            self._update_masks(start)
+        return token_ids
+
+    def decode(self, token_ids):
+        """
+        Convert IDs back to tokens.
+
+        Args:
+            token_ids (iterable): Token IDs
+
+        Returns:
+            list: Tokens, one per ID
+        """
+        tokens = self.tokens
+        return [tokens[token_id] for token_id in as_id_array(token_ids).tolist()]
+
+    def content_ids(self, token_ids):
+        """
+        Drop the stopwords from a token-ID stream.
+
+        Args:
+            token_ids (array.array or numpy.ndarray): Token IDs in document order
+
+        Returns:
+            numpy.ndarray: IDs of the content tokens, in document order
+        """
+        token_ids = as_id_array(token_ids)
+        return token_ids[self.content_mask[token_ids]]
+
+    def count(self, token_ids):
+        """
+        Count every ID in a token-ID stream.
+
+        Args:
+            token_ids (array.array or numpy.ndarray): Token IDs
+
+        Returns:
+            numpy.ndarray: Frequency of each ID in the vocabulary
+        """
+        import numpy as np
+
+        return np.bincount(as_id_array(token_ids), minlength=len(self.tokens))
+
+    def top_keywords(self, token_ids, top_n=30):
+        """
+        Select the most frequent keyword candidates of a token-ID stream.
+
+        Ties are ordered by first occurrence, exactly as
+        DocumentProcessor.extract_keywords orders them; first occurrences are
+        only looked up for the IDs that can make the top_n.
+
+        Args:
+            token_ids (array.array or numpy.ndarray): Token IDs in document order,
+                with or without the stopwords
+            top_n (int): Number of top keywords to return
+
+        Returns:
+            list: Top keywords
+        """
+        import numpy as np
+
+        token_ids = as_id_array(token_ids)
+        counts = self.count(token_ids)
+        counts[~self.keyword_mask] = 0
+
+        candidates = np.flatnonzero(counts)
+        if top_n <= 0 or not len(candidates):
+            return []
+        if len(candidates) > top_n:
+            # Every ID at least as frequent as the top_n-th one may be selected
+            threshold = np.partition(counts[candidates], len(candidates) - top_n)[len(candidates) - top_n]
+            candidates = candidates[counts[candidates] >= threshold]
+
+        order = np.lexsort((self._first_occurrences(token_ids, candidates), -counts[candidates]))
+        return self.decode(candidates[order[:top_n]])
+
+    def _first_occurrences(self, token_ids, candidates):
+        """Return the first position of each candidate ID, scanning from the start."""
+        import numpy as np
+
+        first = np.zeros(len(self.tokens), dtype=np.int64)
+        pending = np.zeros(len(self.tokens), dtype=bool)
+        pending[candidates] = True
+        remaining = len(candidates)
+
+        # Frequent tokens usually occur early, so the scan stops long before the end
+        for start in range(0, len(token_ids), _FIRST_OCCURRENCE_BLOCK):
+            block = token_ids[start:start + _FIRST_OCCURRENCE_BLOCK]
+            positions = np.flatnonzero(pending[block])
+            if not len(positions):
+                continue
+            found, first_index = np.unique(block[positions], return_index=True)
+            first[found] = start + positions[first_index]
+            pending[found] = False
+            remaining -= len(found)
+            if not remaining:
+                break
+        return first[candidates]